@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Serve through this entry point (e.g. `uvicorn config.asgi:application`) for the
+/api/events/ Server-Sent Events stream; under WSGI a stream would pin a worker.
 """
 
 import os
@@ -0,0 +1,32 @@
+"""
+Builds the CACHES['default'] entry from a cache URL (see settings.py).
+
+The default cache holds state that every worker process has to agree on:
+replica stickiness and login throttle windows. A per-process cache is only
+right for a single worker, so deployments with more than one point
+REFLECTRA_CACHE_URL at Redis or memcached. (The auth user cache is not in
+here: it is an in-process dict, see REFLECTRA_AUTH_CACHE_TTL.)
+"""
+
+from urllib.parse import urlsplit
+
+def cache_config(url=None, timeout=300):
+    """
+    redis[s]://host:port/db  -> RedisCache (redis-py)
+    memcached://host:port    -> PyMemcacheCache (pymemcache)
+    file:///absolute/dir     -> FileBasedCache (shared by processes on one host)
+    empty or locmem://       -> LocMemCache (one process only)
+    """
+    parts = urlsplit(url or 'locmem://')
+    if parts.scheme in ('redis', 'rediss'):
+        config = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': url}
+    elif parts.scheme == 'memcached':
+        config = {'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache', 'LOCATION': parts.netloc}
+    elif parts.scheme == 'file':
+        config = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': parts.path}
+    elif parts.scheme == 'locmem':
+        config = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': parts.netloc}
+    else:
+        raise ValueError(f"Unsupported cache URL scheme {parts.scheme!r}; use redis://, memcached://, file:// or locmem://")
+    config['TIMEOUT'] = timeout
+    return config
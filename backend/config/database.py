@@ -0,0 +1,61 @@
+"""
+Builds the DATABASES['default'] entry from a database URL (see settings.py).
+
+Kept apart from settings.py so the rules can be tested: relative SQLite paths
+are anchored at the backend directory, connections persist for
+`conn_max_age` seconds with optional health checks, a Postgres URL can
+use psycopg's connection pool instead, and SQLite can take the tuned
+profile from `sqlite_tuning`.
+"""
+
+from pathlib import Path
+
+import dj_database_url
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def sqlite_tuning(busy_timeout=20, mmap_size=256 * 1024 * 1024, cache_size_kb=64 * 1024):
+    """
+    OPTIONS for single-node SQLite under concurrent writers, applied to every new connection:
+      - WAL journal: readers no longer block the writer, nor the writer readers
+      - synchronous=NORMAL: fsync at checkpoints instead of every commit; safe against
+        process crashes, though a power loss can drop the last commits
+      - busy timeout (seconds): a writer waits for the lock instead of failing "database is locked"
+      - IMMEDIATE transactions: a transaction takes the write lock when it begins, so it waits
+        on the timeout; a deferred one that upgrades mid-way can only fail
+      - mmap_size (bytes) and cache_size (KiB): reads served from mapped pages and a larger cache
+    """
+    return {
+        'timeout': busy_timeout,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': ';'.join([
+            'PRAGMA journal_mode=WAL',
+            'PRAGMA synchronous=NORMAL',
+            f'PRAGMA mmap_size={int(mmap_size)}',
+            f'PRAGMA cache_size=-{int(cache_size_kb)}',
+        ]),
+    }
+
+
+def database_config(url, conn_max_age=0, health_checks=False, pool_max_size=0, pool_min_size=1, pool_timeout=10,
+                    sqlite_options=None):
+    config = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=health_checks)
+
+    if config['ENGINE'] == 'django.db.backends.sqlite3':
+        name = config.get('NAME') or 'db.sqlite3'
+        if name != ':memory:' and not Path(name).is_absolute():
+            config['NAME'] = BASE_DIR / name
+        if sqlite_options:
+            config.setdefault('OPTIONS', {}).update(sqlite_options)
+
+    elif config['ENGINE'] == 'django.db.backends.postgresql' and pool_max_size:
+        # A pool hands each request a warm connection and takes it back at the end of the
+        # request; Django refuses to combine it with persistent connections.
+        config['CONN_MAX_AGE'] = 0
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': min(pool_min_size, pool_max_size),
+            'max_size': pool_max_size,
+            'timeout': pool_timeout,
+        }
+    return config
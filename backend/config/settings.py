@@ -13,7 +13,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
-import dj_database_url
+
+from .cache import cache_config
+from .database import database_config, sqlite_tuning
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -46,12 +48,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'reflectra.middleware.RequestTimingMiddleware',  # sampled SQL/timing, Server-Timing header
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # handles static files in prod
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'reflectra.middleware.ReplicaStickinessMiddleware',  # read-your-writes for replica routing
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -98,15 +102,61 @@ db_url_value = os.getenv(db_url_key)
 if not db_url_value:
     raise RuntimeError(
         f"Missing {db_url_key} in .env for ACTIVE_ENV='{ACTIVE_ENV}'. "
-        f"Please set {db_url_key}=postgresql://..."
+        f"Please set {db_url_key}=postgresql://... (or sqlite:///db.sqlite3 for a local file)"
     )
 
+# REFLECTRA_DB_CONN_MAX_AGE > 0 keeps connections open that many seconds for reuse by
+# later requests on the same worker, with a liveness check before reuse. It defaults to
+# 0 (a new connection per request) because the app is also served under ASGI
+# (config/asgi.py, the event stream), where connections opened off the request thread
+# are never closed by request_finished and leak; only raise it for WSGI-only deployments.
+# For Postgres, REFLECTRA_DB_POOL_MAX_SIZE > 0 switches to a psycopg pool per process
+# (needs psycopg[pool]), which is safe under ASGI and the way to reuse connections there;
+# size it so workers × processes × max size stays under the server's max_connections.
+# REFLECTRA_SQLITE_TUNED=True opts a SQLite database into the high-concurrency profile
+# (WAL, synchronous=NORMAL, busy timeout, mmap, larger cache; see config/database.py).
+REFLECTRA_SQLITE_TUNED = os.getenv('REFLECTRA_SQLITE_TUNED', 'False') == 'True'
+
+DB_CONNECTION_OPTIONS = dict(
+    conn_max_age=int(os.getenv('REFLECTRA_DB_CONN_MAX_AGE', '0')),
+    health_checks=os.getenv('REFLECTRA_DB_HEALTH_CHECKS', 'True') == 'True',
+    pool_max_size=int(os.getenv('REFLECTRA_DB_POOL_MAX_SIZE', '0')),
+    pool_min_size=int(os.getenv('REFLECTRA_DB_POOL_MIN_SIZE', '2')),
+    pool_timeout=float(os.getenv('REFLECTRA_DB_POOL_TIMEOUT', '10')),
+    sqlite_options=sqlite_tuning(
+        busy_timeout=float(os.getenv('REFLECTRA_SQLITE_BUSY_TIMEOUT', '20')),
+        mmap_size=int(os.getenv('REFLECTRA_SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        cache_size_kb=int(os.getenv('REFLECTRA_SQLITE_CACHE_KB', str(64 * 1024))),
+    ) if REFLECTRA_SQLITE_TUNED else None,
+)
 
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+    "default": database_config(db_url_value, **DB_CONNECTION_OPTIONS),
+}
+
+# Read replicas (reflectra/routers.py): comma-separated URLs, added as replica1, replica2, ...
+# Views marked @replica_reads read from one of them; writes always go to "default". After
+# a write, that user reads from "default" for REFLECTRA_REPLICA_STICKY_SECONDS, tracked in
+# the default cache: with replicas set, a per-process cache fails the reflectra.E001 check,
+# so set REFLECTRA_CACHE_URL below. Locally, two SQLite files can stand in:
+# sqlite:///db.sqlite3 as primary, a copy of it as the replica.
+REFLECTRA_READ_REPLICAS = []
+for index, replica_url in enumerate(filter(None, os.getenv('REFLECTRA_REPLICA_URLS', '').split(',')), start=1):
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **database_config(replica_url.strip(), **DB_CONNECTION_OPTIONS),
+        "TEST": {"MIRROR": "default"},
     }
+    REFLECTRA_READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['reflectra.routers.ReplicaRouter']
+REFLECTRA_REPLICA_STICKY_SECONDS = int(os.getenv('REFLECTRA_REPLICA_STICKY_SECONDS', '10'))
+
+# Shared cache (config/cache.py): replica stickiness and login throttles must agree across
+# worker processes, e.g. REFLECTRA_CACHE_URL=redis://localhost:6379/0.
+# Unset, each process keeps its own in-memory cache, which is only right for one worker.
+CACHES = {
+    "default": cache_config(os.getenv('REFLECTRA_CACHE_URL')),
 }
 
 # Password validation
@@ -131,17 +181,83 @@ AUTH_PASSWORD_VALIDATORS = [
 # Django REST Framework configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "reflectra.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    # Reverse proxies in front of the app. Throttles key on REMOTE_ADDR while this is 0;
+    # set it to the real proxy count only behind proxies that overwrite X-Forwarded-For,
+    # since leaving it unset would trust whatever address the client puts in that header.
+    "NUM_PROXIES": int(os.getenv('REFLECTRA_NUM_PROXIES', '0')),
+    # Login sliding windows (reflectra/throttling.py). Counters live in the default
+    # cache, which is per-process unless REFLECTRA_CACHE_URL points at a shared backend.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.getenv('REFLECTRA_LOGIN_RATE_IP', '20/min'),
+        "login_account": os.getenv('REFLECTRA_LOGIN_RATE_ACCOUNT', '10/hour'),
+    },
+}
+
+# Password hashing budget for login (reflectra/passwords.py): hashes run on at most
+# WORKERS threads, and logins beyond MAX_PENDING in flight get a 503 before hashing.
+REFLECTRA_LOGIN_HASH_WORKERS = int(os.getenv('REFLECTRA_LOGIN_HASH_WORKERS', '4'))
+REFLECTRA_LOGIN_HASH_MAX_PENDING = int(os.getenv('REFLECTRA_LOGIN_HASH_MAX_PENDING', '16'))
+# Separate pool for bulk provisioning with passwords, kept off the login budget
+REFLECTRA_BULK_HASH_WORKERS = int(os.getenv('REFLECTRA_BULK_HASH_WORKERS', '1'))
+
+
+# Seconds a worker may reuse an authenticated user (and profile) without a query. The cache
+# is an in-process dict per worker (reflectra/authentication.py), not the shared cache above:
+# a write invalidates it only in the worker that made it. After a deactivation or password
+# change, other workers keep accepting the user's existing tokens for up to this many
+# seconds; lower it if that window is too long.
+REFLECTRA_AUTH_CACHE_TTL = int(os.getenv('REFLECTRA_AUTH_CACHE_TTL', '60'))
+
+
+# Request instrumentation (reflectra/middleware.py): share of requests timed (0–1) and
+# how many of each timed request's slowest SQL statements go into its log line.
+REFLECTRA_REQUEST_TIMING_SAMPLE_RATE = float(os.getenv('REFLECTRA_REQUEST_TIMING_SAMPLE_RATE', '0.05'))
+REFLECTRA_REQUEST_TIMING_SLOWEST = int(os.getenv('REFLECTRA_REQUEST_TIMING_SLOWEST', '3'))
+
+
+# Logging (reflectra/logs.py): app loggers enqueue records and a listener thread writes
+# them to stdout as JSON lines, so request threads never wait on log I/O. High-volume
+# info events (extra={'sampled': True}) are kept at REFLECTRA_LOG_SAMPLE_RATE.
+REFLECTRA_LOG_LEVEL = os.getenv('REFLECTRA_LOG_LEVEL', 'INFO')
+REFLECTRA_LOG_SAMPLE_RATE = float(os.getenv('REFLECTRA_LOG_SAMPLE_RATE', '0.1'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'sample': {'()': 'reflectra.logs.SamplingFilter', 'rate': REFLECTRA_LOG_SAMPLE_RATE},
+    },
+    'handlers': {
+        'queue': {
+            '()': 'reflectra.logs.queue_handler',
+            'maxsize': int(os.getenv('REFLECTRA_LOG_QUEUE_SIZE', '10000')),
+            'filters': ['sample'],
+        },
+    },
+    'loggers': {
+        'reflectra': {'handlers': ['queue'], 'level': REFLECTRA_LOG_LEVEL, 'propagate': False},
+    },
 }
 
 
+# Real-time push backend (reflectra/realtime.py). The in-process default only
+# reaches clients connected to the same server process.
+REFLECTRA_BROADCAST_BACKEND = os.getenv(
+    'REFLECTRA_BROADCAST_BACKEND', 'reflectra.realtime.InMemoryBroadcastBackend'
+)
+
+
 # CORS configuration
 CORS_ALLOW_ALL_ORIGINS = True  # dev-only convenience; tighten in prod
 
+# Let the frontend read the keyset pagination cursor (see reflectra/pagination.py)
+CORS_EXPOSE_HEADERS = ['Link', 'X-Next-Cursor']
+
 # If you know your React dev ports, replace the line above with:
 # CORS_ALLOW_ALL_ORIGINS = False
 # CORS_ALLOWED_ORIGINS = [
@@ -0,0 +1,153 @@
+# ===========================================
+# File: reflectra/accounts.py
+# Description: User + profile provisioning — one transactional write path for sign-up,
+#              change-only profile updates, and bulk onboarding with bulk_create
+# ===========================================
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Lower
+from .models import UserProfile
+from . import autocomplete, passwords, search
+
+# Profile fields a caller may set at sign-up or in bulk
+PROFILE_FIELDS = ('bio', 'mood_preference')
+
+# Rows per INSERT, and the most accounts one bulk call accepts
+BATCH_SIZE = 1000
+MAX_BULK_ACCOUNTS = 10000
+
+# Rows per call that may carry a password: each costs a full PBKDF2 hash (~0.5 s) inside the
+# request, so this keeps a call to seconds. Larger batches omit passwords and use a reset flow.
+MAX_BULK_PASSWORDS = 20
+
+
+class ProvisioningError(Exception):
+    """Raised when a bulk request cannot be provisioned; `errors` lists the offending rows."""
+
+    def __init__(self, errors):
+        super().__init__('Provisioning failed.')
+        self.errors = errors
+
+
+# -------------------------------
+# Single account
+# -------------------------------
+def create_account(username, email, password, **profile_fields):
+    """Create a user and its profile together: two INSERTs in one transaction."""
+    with transaction.atomic():
+        user = User.objects.create_user(username=username, email=email, password=password)
+        profile = UserProfile.objects.create(user=user, **profile_fields)
+    return user, profile
+
+
+def update_profile(user, **changes):
+    """
+    Apply `changes` to the user's profile, writing only the fields whose value
+    actually changed (and creating the profile if the user has none).
+    Returns the list of fields written.
+    """
+    profile = getattr(user, 'profile', None)
+    if profile is None:
+        UserProfile.objects.create(user=user, **changes)
+        return list(changes)
+
+    # The text fields are nullable; treat None and '' as the same blank value
+    changed = [field for field, value in changes.items() if (getattr(profile, field) or '') != (value or '')]
+    if changed:
+        for field in changed:
+            setattr(profile, field, changes[field])
+        profile.save(update_fields=changed)
+    return changed
+
+
+# -------------------------------
+# Bulk onboarding
+# -------------------------------
+def _field_error(model, name, value):
+    """Type, length, validator and choices checks for one field; None when the value is fine."""
+    if value is not None and not isinstance(value, str):
+        return f'{name} must be a string'
+    try:
+        model._meta.get_field(name).clean(value, None)
+    except ValidationError as exc:
+        return f"{name}: {' '.join(exc.messages)}"
+    return None
+
+
+def _row_error(row):
+    if not row.get('username') or not row.get('email'):
+        return 'username and email are required'
+    if row.get('password') is not None and not isinstance(row['password'], str):
+        return 'password must be a string'
+    checks = [(User, 'username'), (User, 'email')] + [(UserProfile, field) for field in PROFILE_FIELDS if field in row]
+    for model, name in checks:
+        error = _field_error(model, name, row[name])
+        if error:
+            return error
+    return None
+
+
+def _validate(rows):
+    errors, seen_usernames, seen_emails = [], set(), set()
+    for position, row in enumerate(rows):
+        error = _row_error(row)
+        if error:
+            errors.append({'row': position, 'error': error})
+            continue
+        if row['username'] in seen_usernames or row['email'].lower() in seen_emails:
+            errors.append({'row': position, 'error': 'duplicate username or email in request'})
+        seen_usernames.add(row['username'])
+        seen_emails.add(row['email'].lower())
+
+    # Emails are compared case-insensitively, here and against existing accounts
+    taken = set(User.objects.filter(username__in=seen_usernames).values_list('username', flat=True))
+    taken_emails = set(
+        User.objects.annotate(email_lower=Lower('email')).filter(email_lower__in=seen_emails).values_list('email_lower', flat=True)
+    )
+    invalid = {error['row'] for error in errors}
+    for position, row in enumerate(rows):
+        if position not in invalid and (row['username'] in taken or row['email'].lower() in taken_emails):
+            errors.append({'row': position, 'error': 'username or email already registered'})
+    return sorted(errors, key=lambda error: error['row'])
+
+
+def provision_accounts(rows, batch_size=BATCH_SIZE):
+    """
+    Create users and profiles for `rows` (dicts with username, email, optional
+    password and profile fields) with bulk_create, all or nothing. Rows without
+    a password get an unusable one, to be set through a reset flow; rows with
+    one cost a full hash each, on the bulk hashing pool (not the login one),
+    so at most MAX_BULK_PASSWORDS rows per call may carry one.
+    Raises ProvisioningError when any row is invalid. Returns the created users.
+    """
+    if len(rows) > MAX_BULK_ACCOUNTS:
+        raise ProvisioningError([{'row': None, 'error': f'at most {MAX_BULK_ACCOUNTS} accounts per request'}])
+    if sum(1 for row in rows if row.get('password')) > MAX_BULK_PASSWORDS:
+        raise ProvisioningError([{
+            'row': None,
+            'error': f'at most {MAX_BULK_PASSWORDS} rows per request may set a password; omit it and send a reset link instead',
+        }])
+    errors = _validate(rows)
+    if errors:
+        raise ProvisioningError(errors)
+
+    hashes = passwords.make_passwords(row.get('password') or None for row in rows)
+    users = [
+        User(username=row['username'], email=row['email'], password=password_hash)
+        for row, password_hash in zip(rows, hashes)
+    ]
+    with transaction.atomic():
+        users = User.objects.bulk_create(users, batch_size=batch_size)
+        UserProfile.objects.bulk_create(
+            [
+                UserProfile(user=user, **{field: row[field] for field in PROFILE_FIELDS if field in row})
+                for user, row in zip(users, rows)
+            ],
+            batch_size=batch_size,
+        )
+        # bulk_create sends no post_save, so feed the search and typeahead indexes directly
+        search.index_users(users)
+        transaction.on_commit(autocomplete.index.invalidate)
+    return users
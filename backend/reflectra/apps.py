@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReflectraConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reflectra'
+
+    def ready(self):
+        # Connect signal receivers (and system checks) that live outside models.py
+        from . import authentication, autocomplete, conversations, follow_counts, routers, search, suggestions, timeline  # noqa: F401
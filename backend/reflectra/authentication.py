@@ -0,0 +1,134 @@
+# ===========================================
+# File: reflectra/authentication.py
+# Description: JWT authentication that resolves the user (and profile) from a short-lived
+#              in-process cache, invalidated from User/UserProfile signals
+# ===========================================
+
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .models import Follow, UserProfile
+
+# Upper bound on cached users per process; the oldest entry is dropped beyond it
+MAX_ENTRIES = 10000
+
+
+# -------------------------------
+# User cache
+# -------------------------------
+class UserCache:
+    """
+    user id → User (with `profile` already joined), each entry valid for `ttl`
+    seconds. Ids are keyed as strings, the form simplejwt puts in the token.
+    The cache is per process: writes in this process invalidate entries through
+    the receivers below, but another worker's write (a deactivation, a password
+    change) goes unseen here until the entry's TTL runs out.
+    """
+
+    def __init__(self, ttl, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, user_id):
+        """A private copy of the cached user, so a request may modify it freely; None on a miss."""
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+        return copy.deepcopy(user)
+
+    def set(self, user):
+        key = str(user.pk)
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (copy.deepcopy(user), time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(ttl=settings.REFLECTRA_AUTH_CACHE_TTL)
+
+
+# -------------------------------
+# Authentication class
+# -------------------------------
+class CachedJWTAuthentication(JWTAuthentication):
+    """Drop-in replacement for simplejwt's JWTAuthentication: no queries for a warm user."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = User.objects.select_related('profile').get(**{api_settings.USER_ID_FIELD: user_id})
+            except User.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            user_cache.set(user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+# -------------------------------
+# Signal wiring (connected from ReflectraConfig.ready)
+# -------------------------------
+def _invalidate(user_id):
+    # Drop now, and again after commit so a concurrent request cannot re-cache the pre-commit row
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    _invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    _invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_cached_follow_counts(sender, instance, **kwargs):
+    # follow_counts.py moves both profiles' counters with queryset updates, which send no signals
+    _invalidate(instance.follower_id)
+    _invalidate(instance.following_id)
@@ -0,0 +1,124 @@
+# ===========================================
+# File: reflectra/autocomplete.py
+# Description: In-process username typeahead (sorted array + bisect), updated from User signals
+# ===========================================
+
+import bisect
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+# Signals only reach the process that handled the write, so each process
+# also reloads from the database at most this often to pick up other workers' changes.
+MAX_AGE_SECONDS = 300
+
+
+# -------------------------------
+# Username Index
+# -------------------------------
+class UsernameIndex:
+    """
+    Usernames kept as a sorted list of (lowercased, id, username) tuples.
+    A prefix lookup is one bisect plus a short forward scan: no database access.
+    """
+
+    def __init__(self, max_age=MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # one reload at a time; lookups keep using _lock
+        self._entries = []
+        self._by_id = {}
+        self._loaded_at = None
+
+    def load(self, rows):
+        """Replace the index with (id, username) rows."""
+        by_id = {user_id: username for user_id, username in rows}
+        entries = sorted((username.lower(), user_id, username) for user_id, username in by_id.items())
+        with self._lock:
+            self._entries, self._by_id = entries, by_id
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Force the next lookup to reload from the database."""
+        with self._lock:
+            self._loaded_at = None
+
+    def _is_fresh(self):
+        loaded_at = self._loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at <= self.max_age
+
+    def ensure_loaded(self):
+        if self._is_fresh():
+            return
+        with self._load_lock:
+            if self._is_fresh():
+                return  # another thread reloaded while this one waited
+            self.load(User.objects.filter(is_active=True).values_list('id', 'username').iterator(chunk_size=5000))
+
+    def add(self, user_id, username):
+        with self._lock:
+            if self._loaded_at is None:
+                return  # not loaded yet; the first lookup will read it from the database
+            self._discard(user_id)
+            bisect.insort(self._entries, (username.lower(), user_id, username))
+            self._by_id[user_id] = username
+
+    def remove(self, user_id):
+        with self._lock:
+            self._discard(user_id)
+
+    def _discard(self, user_id):
+        username = self._by_id.pop(user_id, None)
+        if username is None:
+            return
+        entry = (username.lower(), user_id, username)
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+        """Up to `limit` (id, username) pairs whose username starts with `prefix`, case-insensitively."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        self.ensure_loaded()
+
+        with self._lock:
+            entries = self._entries
+            position = bisect.bisect_left(entries, (prefix,))
+            matches = []
+            while position < len(entries) and len(matches) < limit:
+                lowered, user_id, username = entries[position]
+                if not lowered.startswith(prefix):
+                    break
+                matches.append((user_id, username))
+                position += 1
+        return matches
+
+
+index = UsernameIndex()
+
+
+# -------------------------------
+# Signal wiring (connected from ReflectraConfig.ready)
+# -------------------------------
+@receiver(post_save, sender=User)
+def index_saved_username(sender, instance, **kwargs):
+    user_id, username, active = instance.id, instance.username, instance.is_active
+    if active:
+        transaction.on_commit(lambda: index.add(user_id, username))
+    else:
+        transaction.on_commit(lambda: index.remove(user_id))
+
+
+@receiver(post_delete, sender=User)
+def unindex_deleted_username(sender, instance, **kwargs):
+    user_id = instance.id
+    transaction.on_commit(lambda: index.remove(user_id))
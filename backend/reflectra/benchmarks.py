@@ -0,0 +1,518 @@
+# ===========================================
+# File: reflectra/benchmarks.py
+# Description: Endpoint benchmark suite — every route in urls.py timed against synthetic
+#              datasets of several sizes, checked against declared per-endpoint budgets —
+#              and a concurrent read/write load run for connection handling
+# ===========================================
+
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from itertools import count
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from django.test.utils import (
+    CaptureQueriesContext, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from django.urls import get_resolver, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import user_cache
+from .models import AccountabilityPosts, Conversation, Follow
+from .synthetic import DatasetGenerator, delete_dataset
+
+# Dataset sizes (users) run when none are given, and timed requests per endpoint and size
+DEFAULT_SIZES = (200, 1000, 5000)
+DEFAULT_REPEAT = 5
+
+# Generated accounts, and anything the suite registers itself, share this prefix so
+# delete_dataset clears them between sizes
+PREFIX = 'bench'
+
+# Routes the suite does not time, with the reason written into the results
+SKIPPED = {
+    'event_stream': 'long-lived SSE stream; covered by the realtime tests',
+}
+
+
+class Budget:
+    """
+    Upper bounds one endpoint must stay within at every dataset size: SQL
+    statements per request (the N+1 guard, so it does not grow with the data),
+    median wall time in milliseconds, and response body in bytes.
+    """
+
+    def __init__(self, queries, ms, size):
+        self.queries = queries
+        self.ms = ms
+        self.size = size
+
+    def violations(self, result):
+        checks = (
+            ('queries', result['queries'], self.queries),
+            ('ms', result['ms_median'], self.ms),
+            ('bytes', result['bytes'], self.size),
+        )
+        return [f"{metric} {value} > {limit}" for metric, value, limit in checks if value > limit]
+
+    def as_dict(self):
+        return {'queries': self.queries, 'ms': self.ms, 'bytes': self.size}
+
+
+class Endpoint:
+    """
+    One benchmarked request. `prepare(run)` is called before every timed request,
+    outside the measurement, and returns the request's parts: any of `kwargs`
+    (URL arguments), `query`, `data`, `content_type` and `token` (to act as
+    someone other than the run's main user). Write endpoints use it to put the
+    data back in the state the request expects.
+    """
+
+    def __init__(self, url_name, method, budget, prepare=None, label=None):
+        self.url_name = url_name
+        self.method = method
+        self.budget = budget
+        self.prepare = prepare or (lambda run: {})
+        self.label = label or f"{method} {url_name}"
+
+
+# -------------------------------
+# Request builders
+# -------------------------------
+def _unique_account(run):
+    n = next(run.serial)
+    return {'username': f"{PREFIX}-r{n:06d}", 'email': f"{PREFIX}-r{n:06d}@example.com", 'password': 'Bench-Pass-123'}
+
+
+def _login(run):
+    cache.clear()  # the login throttles would otherwise refuse the later repetitions
+    return {'data': {'username': run.actor.username, 'password': run.password}}
+
+
+def _provision(run):
+    # Without passwords: hashing cost is what register_user and login_user already measure
+    rows = [_unique_account(run) for _ in range(10)]
+    return {'data': {'users': [{'username': row['username'], 'email': row['email']} for row in rows]}}
+
+
+def _update_info(run):
+    return {'data': {'name': run.actor.username, 'email': run.actor.email, 'bio': f"benchmark bio {next(run.serial)}"}}
+
+
+def _delete_account(run):
+    user = User.objects.create_user(**_unique_account(run))
+    return {'token': run.token_for(user)}
+
+
+def _delete_post(run):
+    post = AccountabilityPosts.objects.create(user=run.actor, content_text='benchmark post')
+    return {'kwargs': {'post_id': post.id}}
+
+
+def _follow(run):
+    Follow.objects.filter(follower=run.actor, following=run.stranger).delete()
+    return {'kwargs': {'user_id': run.stranger.id}}
+
+
+def _unfollow(run):
+    Follow.objects.get_or_create(follower=run.actor, following=run.stranger)
+    return {'kwargs': {'user_id': run.stranger.id}}
+
+
+def _mood_import(run):
+    rows = '\n'.join(
+        json.dumps({'mood': 1 + i % 10, 'stress': 10 - i % 10, 'sleep': '7', 'timestamp': f"2020-01-{1 + i % 28:02d}T08:00:00Z"})
+        for i in range(50)
+    )
+    return {'data': rows, 'content_type': 'application/x-ndjson'}
+
+
+ENDPOINTS = [
+    Endpoint('register_user', 'post', Budget(queries=8, ms=1500, size=1024), lambda run: {'data': _unique_account(run)}),
+    Endpoint('login_user', 'post', Budget(queries=4, ms=1500, size=2048), _login),
+    Endpoint('provision_users', 'post', Budget(queries=10, ms=500, size=4096),
+             lambda run: {**_provision(run), 'token': run.staff_token}),
+    Endpoint('userinfo', 'get', Budget(queries=2, ms=100, size=1024)),
+    Endpoint('update_user_info', 'put', Budget(queries=6, ms=150, size=1024), _update_info),
+    Endpoint('delete_user_account', 'delete', Budget(queries=25, ms=500, size=1024), _delete_account),
+    Endpoint('delete_post', 'delete', Budget(queries=8, ms=200, size=1024), _delete_post),
+    Endpoint('find_users', 'get', Budget(queries=3, ms=200, size=16384), lambda run: {'query': {'q': PREFIX}}),
+    Endpoint('autocomplete_users', 'get', Budget(queries=2, ms=200, size=4096),
+             lambda run: {'query': {'q': f"{PREFIX}00"}}),
+    # Suggestion upkeep: a fixed number of set-based statements per edge (scores, exact counts
+    # for new rows, one trimming DELETE), independent of how many users the edge touches
+    Endpoint('follow_user', 'post', Budget(queries=28, ms=300, size=1024), _follow),
+    Endpoint('unfollow_user', 'delete', Budget(queries=28, ms=300, size=1024), _unfollow),
+    Endpoint('get_followers', 'get', Budget(queries=3, ms=150, size=32768),
+             lambda run: {'kwargs': {'user_id': run.hub.id}}),
+    Endpoint('get_suggestions', 'get', Budget(queries=2, ms=100, size=8192)),
+    Endpoint('get_me', 'get', Budget(queries=2, ms=100, size=1024)),
+    Endpoint('get_following', 'get', Budget(queries=2, ms=150, size=32768)),
+    Endpoint('list_create_posts', 'get', Budget(queries=2, ms=150, size=32768)),
+    Endpoint('list_create_posts', 'post', Budget(queries=8, ms=300, size=1024),
+             lambda run: {'data': {'content_text': 'benchmark post'}}),
+    Endpoint('moodlogs', 'get', Budget(queries=3, ms=150, size=32768)),
+    Endpoint('moodlogs', 'post', Budget(queries=12, ms=200, size=1024),
+             lambda run: {'data': {'mood': 6, 'stress': 4, 'sleep': '7.5'}}),
+    Endpoint('mood_analytics', 'get', Budget(queries=4, ms=200, size=16384)),
+    Endpoint('mood_streak', 'get', Budget(queries=2, ms=100, size=1024)),
+    Endpoint('mood_import', 'post', Budget(queries=20, ms=500, size=1024), _mood_import),
+    Endpoint('mood_export', 'get', Budget(queries=3, ms=300, size=65536), lambda run: {'query': {'type': 'ndjson'}}),
+    Endpoint('send_message', 'post', Budget(queries=10, ms=200, size=1024),
+             lambda run: {'data': {'receiver': run.partner.username, 'content': 'benchmark message'}}),
+    Endpoint('get_conversation', 'get', Budget(queries=5, ms=150, size=32768),  # + locked read of the watermark
+             lambda run: {'kwargs': {'username': run.partner.username}}),
+    Endpoint('inbox', 'get', Budget(queries=2, ms=150, size=16384)),
+]
+
+
+def uncovered_routes(endpoints=ENDPOINTS):
+    """Named routes in urls.py with neither a benchmark nor a reason to skip one."""
+    covered = {endpoint.url_name for endpoint in endpoints} | set(SKIPPED)
+    names = {pattern.name for pattern in get_resolver('reflectra.urls').url_patterns if pattern.name}
+    return sorted(names - covered)
+
+
+# -------------------------------
+# Runner
+# -------------------------------
+class BenchmarkRun:
+    """
+    One dataset size: generates the data, picks the accounts the requests act
+    as, and times every endpoint. The main user is the account following the
+    most people (largest timeline and suggestion set); `hub` is the most
+    followed account, `partner` the main user's busiest conversation.
+    """
+
+    def __init__(self, users, seed, repeat, generator_options=None, log=None):
+        self.users = users
+        self.seed = seed
+        self.repeat = repeat
+        self.generator_options = generator_options or {}
+        self.log = log or (lambda message: None)
+        self.serial = count()
+        self.client = APIClient()
+
+    def token_for(self, user):
+        return str(RefreshToken.for_user(user).access_token)
+
+    def setup(self):
+        generator = DatasetGenerator(users=self.users, seed=self.seed, prefix=PREFIX, **self.generator_options)
+        self.password = generator.password
+        self.rows = generator.run()
+
+        generated = User.objects.filter(username__startswith=PREFIX)
+        self.actor = generated.order_by('-profile__following_count', 'id').first()
+        self.hub = generated.order_by('-profile__follower_count', 'id').first()
+        self.stranger = generated.exclude(pk=self.actor.pk).exclude(
+            pk__in=Follow.objects.filter(follower=self.actor).values('following_id')
+        ).order_by('id').first()
+
+        busiest = Conversation.objects.filter(user_low=self.actor).union(
+            Conversation.objects.filter(user_high=self.actor)
+        ).order_by('-last_activity').first()
+        partner_id = None
+        if busiest:
+            partner_id = busiest.user_high_id if busiest.user_low_id == self.actor.id else busiest.user_low_id
+        self.partner = User.objects.get(pk=partner_id) if partner_id else self.hub
+
+        staff = User.objects.create_user(**_unique_account(self), is_staff=True)
+        self.token = self.token_for(self.actor)
+        self.staff_token = self.token_for(staff)
+
+    def _request(self, endpoint, parts):
+        url = reverse(endpoint.url_name, kwargs=parts.get('kwargs'))
+        headers = {'HTTP_AUTHORIZATION': f"Bearer {parts.get('token', self.token)}"}
+        data = parts.get('data')
+        if parts.get('content_type'):
+            return self.client.generic(endpoint.method.upper(), url, data, parts['content_type'], **headers)
+        method = getattr(self.client, endpoint.method)
+        if endpoint.method == 'get':
+            return method(url, parts.get('query'), **headers)
+        return method(url, data, format='json', **headers)
+
+    def measure(self, endpoint):
+        """Warm once (caches, indexes), then time `repeat` requests; queries and size are the worst seen."""
+        self._request(endpoint, endpoint.prepare(self))
+        timings, queries, size, status = [], 0, 0, None
+        for _ in range(self.repeat):
+            parts = endpoint.prepare(self)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = self._request(endpoint, parts)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                timings.append((time.perf_counter() - started) * 1000)
+            queries, size, status = max(queries, len(captured)), max(size, len(body)), response.status_code
+
+        result = {
+            'endpoint': endpoint.label,
+            'status': status,
+            'queries': queries,
+            'ms_median': round(statistics.median(timings), 2),
+            'ms_min': round(min(timings), 2),
+            'ms_max': round(max(timings), 2),
+            'bytes': size,
+            'budget': endpoint.budget.as_dict(),
+        }
+        result['violations'] = endpoint.budget.violations(result)
+        if status >= 400:
+            result['violations'].append(f"status {status}")
+        return result
+
+    def run(self, endpoints=ENDPOINTS):
+        self.log(f"generating {self.users} users")
+        self.setup()
+        results = []
+        for endpoint in endpoints:
+            result = self.measure(endpoint)
+            self.log(
+                f"{result['endpoint']:<28} {result['ms_median']:>9.2f} ms {result['queries']:>3} q "
+                f"{result['bytes']:>8} B{'  ' + '; '.join(result['violations']) if result['violations'] else ''}"
+            )
+            results.append(result)
+        return {'users': self.users, 'rows': self.rows, 'endpoints': results}
+
+    def teardown(self):
+        delete_dataset(PREFIX)
+        user_cache.clear()
+        cache.clear()
+
+
+@contextmanager
+def scratch_database(on_disk=False):
+    """
+    A throwaway test database, created and destroyed like the test runner's, so
+    the suites can write freely. With `on_disk`, SQLite gets a temporary file
+    instead of shared memory, so concurrent workers meet real file locking.
+    """
+    setup_test_environment()
+    scratch_dir = None
+    if on_disk and connection.vendor == 'sqlite':
+        scratch_dir = tempfile.mkdtemp(prefix='reflectra-bench-')
+        connection.settings_dict['TEST']['NAME'] = os.path.join(scratch_dir, 'benchmark.sqlite3')
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+        if scratch_dir:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(sizes=DEFAULT_SIZES, seed=42, repeat=DEFAULT_REPEAT, endpoints=ENDPOINTS, generator_options=None, log=None):
+    """
+    Benchmark `endpoints` at each dataset size, against whatever database is
+    current (the command points it at a throwaway test database). Returns the
+    report the command writes as JSON; `violations` counts budget breaches.
+    """
+    report = {
+        'revision': _git_revision(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'seed': seed,
+        'repeat': repeat,
+        'skipped': SKIPPED,
+        'uncovered': uncovered_routes(endpoints),
+        'sizes': [],
+    }
+    for users in sizes:
+        run = BenchmarkRun(users, seed, repeat, generator_options=generator_options, log=log)
+        try:
+            report['sizes'].append(run.run(endpoints))
+        finally:
+            run.teardown()
+
+    report['violations'] = sum(len(result['violations']) for size in report['sizes'] for result in size['endpoints'])
+    return report
+
+
+def compare(previous, current):
+    """Lines describing how each endpoint's median time and query count moved between two reports."""
+    before = {
+        (size['users'], result['endpoint']): result
+        for size in previous.get('sizes', []) for result in size['endpoints']
+    }
+    lines = []
+    for size in current['sizes']:
+        for result in size['endpoints']:
+            old = before.get((size['users'], result['endpoint']))
+            if old is None:
+                continue
+            ratio = result['ms_median'] / old['ms_median'] if old['ms_median'] else 1
+            lines.append(
+                f"{size['users']:>7} users  {result['endpoint']:<28} "
+                f"{old['ms_median']:>9.2f} → {result['ms_median']:>9.2f} ms ({ratio:.2f}x)  "
+                f"{old['queries']} → {result['queries']} q"
+            )
+    return lines
+
+
+# -------------------------------
+# Concurrency
+# -------------------------------
+def _percentile(values, share):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(share * len(ordered)))], 2) if ordered else None
+
+
+class ConcurrencyRun:
+    """
+    N worker threads, each signed in as its own user, send a read/write mix for
+    `duration` seconds. Requests go through Django's WSGI handler exactly as a
+    threaded server would call it, request_started/finished signals included,
+    so connection reuse (CONN_MAX_AGE), health checks and pooling behave as in
+    production; the test Client suspends all three.
+    """
+
+    READS = ('timeline', 'inbox', 'conversation', 'moodlogs')
+    WRITES = ('message', 'post', 'moodlog')
+
+    def __init__(self, actors, duration, write_share, seed=42):
+        self.actors = actors
+        self.duration = duration
+        self.write_share = write_share
+        self.seed = seed
+        self.factory = RequestFactory()
+        self.handler = WSGIHandler()
+        self.tokens = {actor.id: str(RefreshToken.for_user(actor).access_token) for actor in actors}
+
+    def _request(self, kind, actor, partner):
+        token = {'HTTP_AUTHORIZATION': f"Bearer {self.tokens[actor.id]}"}
+        body = {
+            'message': ('send_message', {'receiver': partner.username, 'content': 'concurrency benchmark'}),
+            'post': ('list_create_posts', {'content_text': 'concurrency benchmark'}),
+            'moodlog': ('moodlogs', {'mood': 6, 'stress': 4, 'sleep': '7'}),
+        }
+        if kind in body:
+            url_name, data = body[kind]
+            return self.factory.post(reverse(url_name), json.dumps(data), content_type='application/json', **token)
+        if kind == 'conversation':
+            return self.factory.get(reverse('get_conversation', kwargs={'username': partner.username}), **token)
+        url_name = {'timeline': 'list_create_posts', 'inbox': 'inbox', 'moodlogs': 'moodlogs'}[kind]
+        return self.factory.get(reverse(url_name), **token)
+
+    def _call(self, request):
+        status = []
+        body = self.handler(request.environ, lambda line, headers, exc_info=None: status.append(int(line[:3])))
+        try:
+            b''.join(body)
+        finally:
+            body.close()  # fires request_finished, where Django closes or keeps the connection
+        return status[0]
+
+    def _worker(self, index, deadline, samples):
+        rng = random.Random(self.seed + index)
+        actor = self.actors[index]
+        partner = self.actors[(index + 1) % len(self.actors)]
+        try:
+            while time.perf_counter() < deadline:
+                write = rng.random() < self.write_share
+                request = self._request(rng.choice(self.WRITES if write else self.READS), actor, partner)
+                started = time.perf_counter()
+                try:
+                    status = self._call(request)
+                except Exception:
+                    status = 'exception'
+                samples.append(('write' if write else 'read', (time.perf_counter() - started) * 1000, status))
+        finally:
+            connections.close_all()
+
+    def run(self):
+        opened = count()
+
+        def on_connection(sender, **kwargs):
+            next(opened)
+
+        samples = []
+        connection_created.connect(on_connection, weak=False)
+        try:
+            deadline = time.perf_counter() + self.duration
+            threads = [
+                threading.Thread(target=self._worker, args=(index, deadline, samples))
+                for index in range(len(self.actors))
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            connection_created.disconnect(on_connection)
+
+        result = {'workers': len(self.actors), 'seconds': self.duration, 'connections_opened': next(opened)}
+        for kind in ('read', 'write'):
+            latencies = [ms for sample_kind, ms, status in samples if sample_kind == kind]
+            result[kind] = {
+                'requests': len(latencies),
+                'per_second': round(len(latencies) / self.duration, 1),
+                'ms_p50': _percentile(latencies, 0.50),
+                'ms_p95': _percentile(latencies, 0.95),
+                'ms_p99': _percentile(latencies, 0.99),
+            }
+        errors = {}
+        for _, _, status in samples:
+            if status == 'exception' or status >= 500:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+        result['errors'] = errors
+        return result
+
+
+def run_concurrency(workers=(1, 4, 16), duration=10, write_share=0.2, users=500, seed=42, log=None):
+    """
+    Generate one dataset, then run ConcurrencyRun at each worker count against the
+    current database (the command points it at a scratch database). Returns the report.
+    """
+    log = log or (lambda message: None)
+    database = connection.settings_dict
+    report = {
+        'revision': _git_revision(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'database': connection.vendor,
+        'conn_max_age': database['CONN_MAX_AGE'],
+        'health_checks': database['CONN_HEALTH_CHECKS'],
+        'pool': database.get('OPTIONS', {}).get('pool'),
+        'users': users,
+        'write_share': write_share,
+        'runs': [],
+    }
+
+    log(f"generating {users} users")
+    DatasetGenerator(users=users, seed=seed, prefix=PREFIX).run()
+    generated = User.objects.filter(username__startswith=PREFIX).order_by('-profile__following_count', 'id')
+    actors = list(generated[:max(workers)])
+    connections.close_all()  # workers open their own; nothing should be left on this thread
+
+    for worker_count in workers:
+        result = ConcurrencyRun(actors[:worker_count], duration, write_share, seed).run()
+        log(
+            f"{worker_count:>4} workers  reads {result['read']['per_second']:>8}/s p95 {result['read']['ms_p95']} ms  "
+            f"writes {result['write']['per_second']:>8}/s p95 {result['write']['ms_p95']} ms  "
+            f"connections {result['connections_opened']}  errors {result['errors'] or 0}"
+        )
+        report['runs'].append(result)
+    return report
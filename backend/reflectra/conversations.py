@@ -0,0 +1,88 @@
+# ===========================================
+# File: reflectra/conversations.py
+# Description: Keeps the denormalized Conversation rows (inbox) in step with Message writes
+# ===========================================
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import Conversation, Message, participant_pair
+from .realtime import publish_event
+
+PREVIEW_LENGTH = 120
+
+
+def unread_field(conversation, user_id):
+    return 'unread_low' if user_id == conversation.user_low_id else 'unread_high'
+
+
+# -------------------------------
+# New message → bump the pair's summary
+# -------------------------------
+def record_message(message):
+    """Point the pair's conversation at `message` and count it as unread for the receiver."""
+    low_id, high_id = participant_pair(message.sender_id, message.receiver_id)
+
+    with transaction.atomic():
+        # Row lock serializes concurrent sends within the same pair only
+        conversation, _ = Conversation.objects.select_for_update().get_or_create(
+            user_low_id=low_id,
+            user_high_id=high_id,
+            defaults={'last_activity': message.timestamp},
+        )
+        update_fields = [unread_field(conversation, message.receiver_id)]
+        setattr(conversation, update_fields[0], getattr(conversation, update_fields[0]) + 1)
+
+        if conversation.last_message_id is None or message.timestamp >= conversation.last_activity:
+            conversation.last_message = message
+            conversation.last_message_preview = message.content[:PREVIEW_LENGTH]
+            conversation.last_activity = message.timestamp
+            update_fields += ['last_message', 'last_message_preview', 'last_activity']
+
+        conversation.save(update_fields=update_fields)
+    return conversation
+
+
+# -------------------------------
+# Read → advance the reader's watermark
+# -------------------------------
+def mark_read(reader_id, partner_id):
+    """
+    Move the reader's watermark up to the thread's last message and zero their
+    unread count: one single-row UPDATE, however many messages were unread.
+    The row is read locked, inside a transaction, so always from the primary:
+    record_message takes the same lock, so last_message_id is current and no
+    newer message can be counted as read. Returns the Conversation as it
+    stands after the read, or None if the pair never talked.
+    """
+    low_id, high_id = participant_pair(reader_id, partner_id)
+    with transaction.atomic():
+        conversation = Conversation.objects.select_for_update().filter(user_low_id=low_id, user_high_id=high_id).first()
+        if conversation is None or conversation.last_message_id is None:
+            return conversation
+
+        side = 'low' if reader_id == low_id else 'high'
+        watermark_field, unread = f'last_read_{side}', f'unread_{side}'
+        if getattr(conversation, watermark_field) < conversation.last_message_id:
+            Conversation.objects.filter(pk=conversation.pk).update(
+                **{watermark_field: conversation.last_message_id, unread: 0}
+            )
+            setattr(conversation, watermark_field, conversation.last_message_id)
+            setattr(conversation, unread, 0)
+    return conversation
+
+
+# -------------------------------
+# Signal wiring (connected from ReflectraConfig.ready)
+# -------------------------------
+@receiver(post_save, sender=Message)
+def record_new_message(sender, instance, created, **kwargs):
+    if created:
+        record_message(instance)
+        publish_event([instance.sender_id, instance.receiver_id], 'message.created', {
+            'id': instance.id,
+            'sender_username': instance.sender.username,
+            'receiver_username': instance.receiver.username,
+            'content': instance.content,
+            'timestamp': instance.timestamp,
+        })
@@ -0,0 +1,95 @@
+# ===========================================
+# File: reflectra/follow_counts.py
+# Description: Maintains the denormalized follower/following counts on UserProfile
+# ===========================================
+
+from django.contrib.auth.models import User
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Follow, UserProfile
+
+
+# -------------------------------
+# Edge added / removed → adjust both ends
+# -------------------------------
+def adjust_counts(follower_id, following_id, delta):
+    """Atomically shift both users' counters by `delta` (+1 follow, -1 unfollow)."""
+    followed = UserProfile.objects.filter(user_id=following_id)
+    following = UserProfile.objects.filter(user_id=follower_id)
+    if delta < 0:
+        # Never drive a counter negative if it had already drifted low
+        followed = followed.filter(follower_count__gte=-delta)
+        following = following.filter(following_count__gte=-delta)
+    if not followed.update(follower_count=F('follower_count') + delta):
+        ensure_profile(following_id)
+    if not following.update(following_count=F('following_count') + delta):
+        ensure_profile(follower_id)
+
+
+def ensure_profile(user_id):
+    """
+    Create a missing profile with its true counts. accounts.py creates profiles, but
+    users made elsewhere (createsuperuser, the admin, scripts) have none until here.
+    """
+    if not UserProfile.objects.filter(user_id=user_id).exists():
+        UserProfile.objects.get_or_create(user_id=user_id, defaults={
+            'follower_count': Follow.objects.filter(following_id=user_id).count(),
+            'following_count': Follow.objects.filter(follower_id=user_id).count(),
+        })
+
+
+@receiver(post_save, sender=Follow)
+def count_follow(sender, instance, created, **kwargs):
+    # Runs inside the caller's transaction (follow_user wraps get_or_create in one)
+    if created:
+        adjust_counts(instance.follower_id, instance.following_id, 1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_unfollow(sender, instance, **kwargs):
+    adjust_counts(instance.follower_id, instance.following_id, -1)
+
+
+# -------------------------------
+# Drift repair
+# -------------------------------
+def _count_of(field):
+    edges = (
+        Follow.objects.filter(**{field: OuterRef('user_id')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return Coalesce(Subquery(edges), Value(0))
+
+
+def create_missing_profiles(dry_run=False, batch_size=1000):
+    """Give every user without a profile an empty one (reconcile_counts then sets its counts). Returns how many."""
+    missing = list(User.objects.filter(profile__isnull=True).values_list('id', flat=True))
+    if not dry_run:
+        UserProfile.objects.bulk_create([UserProfile(user_id=user_id) for user_id in missing], batch_size=batch_size)
+    return len(missing)
+
+
+def reconcile_counts(dry_run=False, batch_size=1000):
+    """Recount Follow rows and fix every profile whose stored counters disagree. Returns the profiles fixed."""
+    drifted = (
+        UserProfile.objects.annotate(
+            actual_followers=_count_of('following_id'),
+            actual_following=_count_of('follower_id'),
+        )
+        .exclude(follower_count=F('actual_followers'), following_count=F('actual_following'))
+        .only('id', 'follower_count', 'following_count')
+    )
+
+    fixed = []
+    for profile in drifted.iterator(chunk_size=batch_size):
+        profile.follower_count = profile.actual_followers
+        profile.following_count = profile.actual_following
+        fixed.append(profile)
+    if not dry_run:
+        UserProfile.objects.bulk_update(fixed, ['follower_count', 'following_count'], batch_size=batch_size)
+    return fixed
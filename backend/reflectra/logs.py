@@ -0,0 +1,128 @@
+# ===========================================
+# File: reflectra/logs.py
+# Description: Non-blocking structured logging — request threads only enqueue records;
+#              a QueueListener thread renders them as JSON lines and does the I/O
+# ===========================================
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Records waiting for the listener; beyond this new records are dropped, never waited on
+DEFAULT_QUEUE_SIZE = 10000
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'sampled'}
+
+
+# -------------------------------
+# Formatting (listener thread)
+# -------------------------------
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, then every `extra=`
+    field. %-style arguments are only merged into the message here, on the
+    listener thread, so callers pay nothing for formatting.
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# -------------------------------
+# Sampling (request thread, before enqueueing)
+# -------------------------------
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a `rate` share of records logged with extra={'sampled': True} (the
+    high-volume info events: logins, profile fetches, list views) and every
+    other record. Kept sampled records carry `sample_rate`, so counts can be scaled back up.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, 'sampled', False) or self.rate >= 1:
+            return True
+        if random.random() < self.rate:
+            record.sample_rate = self.rate
+            return True
+        return False
+
+
+# -------------------------------
+# Queue handler (request thread)
+# -------------------------------
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks and defers formatting. The stock handler
+    renders the message before enqueueing; this one copies the record and
+    only captures the traceback (it cannot wait). A full queue drops the record;
+    the next record that gets through reports how many were lost as `dropped`.
+    Arguments are rendered later, so pass plain values, not objects that may change.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.dropped:
+            record.dropped = self.dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.dropped = 0
+
+
+def queue_handler(maxsize=DEFAULT_QUEUE_SIZE, stream=None):
+    """
+    Handler factory for settings.LOGGING ('()': 'reflectra.logs.queue_handler'):
+    builds the queue, starts the listener thread that writes JSON lines to
+    `stream` (stdout by default), and stops it at exit after draining.
+    """
+    log_queue = queue.Queue(maxsize)
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.listener = QueueListener(log_queue, output)
+    handler.listener.start()
+    atexit.register(_stop, handler.listener)
+    return handler
+
+
+def _stop(listener):
+    # QueueListener.stop() drains the queue but fails on a listener that was already stopped
+    if listener._thread is not None:
+        listener.stop()
@@ -0,0 +1,86 @@
+# ===========================================
+# File: reflectra/management/commands/benchmark_concurrency.py
+# Description: Concurrent read/write load against a scratch copy of the configured
+#              database, for comparing connection reuse, pooling and database settings
+# ===========================================
+
+import json
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from config.database import sqlite_tuning
+from reflectra import benchmarks
+
+# --sqlite-profile choices: connection OPTIONS to run with (None = as configured)
+SQLITE_PROFILES = {
+    'configured': None,
+    'default': {},
+    'tuned': sqlite_tuning(),
+}
+
+
+@contextmanager
+def _sqlite_options(options):
+    """Run with these SQLite connection OPTIONS instead of the configured ones."""
+    if options is None:
+        yield
+        return
+    settings_dict = connection.settings_dict
+    configured = settings_dict.get('OPTIONS', {})
+    connection.close()
+    settings_dict['OPTIONS'] = dict(options)
+    try:
+        yield
+    finally:
+        connection.close()
+        settings_dict['OPTIONS'] = configured
+
+
+class Command(BaseCommand):
+    help = "Measure read/write throughput and latency with N concurrent workers against the configured database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16], help="Worker counts to run.")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds per worker count.")
+        parser.add_argument('--write-share', type=float, default=0.2, help="Share of requests that write (0–1).")
+        parser.add_argument('--users', type=int, default=500, help="Synthetic dataset size.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--sqlite-profile', choices=[*SQLITE_PROFILES, 'both'], default='configured',
+                            help="SQLite only: run with stock or tuned connection settings; 'both' runs "
+                                 "stock then tuned on identical data for a before/after comparison.")
+        parser.add_argument('--output', default='concurrency-results.json', help="Where to write the JSON report.")
+
+    def handle(self, *args, **options):
+        if not 0 <= options['write_share'] <= 1:
+            raise CommandError("--write-share must be between 0 and 1.")
+        if min(options['workers']) < 1:
+            raise CommandError("--workers must be positive.")
+        profile = options['sqlite_profile']
+        if profile != 'configured' and connection.vendor != 'sqlite':
+            raise CommandError("--sqlite-profile only applies to a SQLite database.")
+
+        names = ['default', 'tuned'] if profile == 'both' else [profile]
+        reports = {}
+        for name in names:
+            self.stdout.write(f"{name} profile")
+            with _sqlite_options(SQLITE_PROFILES[name]), benchmarks.scratch_database(on_disk=True):
+                reports[name] = benchmarks.run_concurrency(
+                    workers=options['workers'], duration=options['duration'], write_share=options['write_share'],
+                    users=options['users'], seed=options['seed'],
+                    log=lambda message: self.stdout.write(f"  {message}"),
+                )
+                reports[name]['options'] = connection.settings_dict.get('OPTIONS', {})
+
+        if profile == 'both':
+            for before, after in zip(reports['default']['runs'], reports['tuned']['runs']):
+                self.stdout.write(
+                    f"{before['workers']:>4} workers  "
+                    f"reads {before['read']['per_second']} → {after['read']['per_second']}/s  "
+                    f"writes {before['write']['per_second']} → {after['write']['per_second']}/s  "
+                    f"errors {sum(before['errors'].values())} → {sum(after['errors'].values())}"
+                )
+
+        with open(options['output'], 'w') as handle:
+            json.dump(reports if profile == 'both' else reports[profile], handle, indent=2, default=str)
+        self.stdout.write(self.style.SUCCESS(f"wrote {options['output']}"))
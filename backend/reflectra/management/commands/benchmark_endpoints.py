@@ -0,0 +1,54 @@
+# ===========================================
+# File: reflectra/management/commands/benchmark_endpoints.py
+# Description: Runs the endpoint benchmark suite on a throwaway test database and
+#              writes the results as JSON; exits non-zero when a budget is exceeded
+# ===========================================
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from reflectra import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Time every API endpoint against synthetic datasets of several sizes and check the declared budgets."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=list(benchmarks.DEFAULT_SIZES),
+                            help="Dataset sizes, in users.")
+        parser.add_argument('--repeat', type=int, default=benchmarks.DEFAULT_REPEAT,
+                            help="Timed requests per endpoint and size (after one warm-up).")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default='benchmark-results.json', help="Where to write the JSON report.")
+        parser.add_argument('--compare', help="A previous JSON report to print timing and query changes against.")
+        parser.add_argument('--no-fail', action='store_true', help="Report budget breaches without failing.")
+
+    def handle(self, *args, **options):
+        if benchmarks.uncovered_routes():
+            raise CommandError(
+                f"Routes without a benchmark: {', '.join(benchmarks.uncovered_routes())}. "
+                "Declare an Endpoint (or a SKIPPED reason) in reflectra/benchmarks.py."
+            )
+        previous = None
+        if options['compare']:
+            with open(options['compare']) as handle:
+                previous = json.load(handle)
+
+        # Same isolation as the test runner: the suite creates and deletes data freely
+        with benchmarks.scratch_database():
+            report = benchmarks.run_suite(
+                sizes=options['sizes'], seed=options['seed'], repeat=options['repeat'],
+                log=lambda message: self.stdout.write(f"  {message}"),
+            )
+
+        with open(options['output'], 'w') as handle:
+            json.dump(report, handle, indent=2, default=str)
+        self.stdout.write(f"wrote {options['output']}")
+
+        if previous is not None:
+            for line in benchmarks.compare(previous, report):
+                self.stdout.write(line)
+
+        if report['violations'] and not options['no_fail']:
+            raise CommandError(f"{report['violations']} budget violation(s); see {options['output']}")
+        self.stdout.write(self.style.SUCCESS("all endpoints within budget"))
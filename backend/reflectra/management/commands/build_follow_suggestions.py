@@ -0,0 +1,22 @@
+# ===========================================
+# File: reflectra/management/commands/build_follow_suggestions.py
+# Description: Batch job that recomputes every user's friends-of-friends follow suggestions
+# ===========================================
+
+import time
+
+from django.core.management.base import BaseCommand
+from reflectra.suggestions import TOP_N, rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = "Recompute FollowSuggestion rows from the whole Follow graph (mutual-follow counts)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-n', type=int, default=TOP_N, help="Suggestions kept per user.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = rebuild_suggestions(top_n=options['top_n'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"wrote {written} suggestion(s) in {elapsed:.1f}s"))
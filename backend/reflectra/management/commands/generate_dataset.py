@@ -0,0 +1,68 @@
+# ===========================================
+# File: reflectra/management/commands/generate_dataset.py
+# Description: Builds a seeded, reproducible synthetic dataset for local scaling work
+# ===========================================
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
+from reflectra.synthetic import DatasetGenerator, delete_dataset
+
+
+class Command(BaseCommand):
+    help = "Generate N synthetic users with profiles, a power-law follow graph, posts, mood logs and messages."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='synth', help="Username prefix for generated accounts.")
+        parser.add_argument('--password', default='synthetic-pass', help="Password shared by every generated account.")
+        parser.add_argument('--follows-mean', type=float, default=20)
+        parser.add_argument('--popularity-exponent', type=float, default=1.1,
+                            help="Zipf exponent for whom users follow; higher = more concentrated.")
+        parser.add_argument('--posts-mean', type=float, default=5)
+        parser.add_argument('--history-days', type=int, default=90)
+        parser.add_argument('--mood-days', type=int, default=60)
+        parser.add_argument('--mood-log-rate', type=float, default=0.6, help="Chance a user logs on any given day.")
+        parser.add_argument('--conversations-mean', type=float, default=2)
+        parser.add_argument('--messages-mean', type=float, default=12)
+        parser.add_argument('--end', help="ISO datetime the history ends at (default: now). Fix it for identical reruns.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--clear', action='store_true', help="Delete the accounts a previous run generated with this prefix first.")
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if options['clear']:
+            self.stdout.write(f"deleted {delete_dataset(prefix)} row(s) from a previous run")
+        elif User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f"Users prefixed '{prefix}' already exist; pass --clear or another --prefix.")
+
+        end = None
+        if options['end']:
+            end = parse_datetime(options['end'])
+            if end is None:
+                raise CommandError("--end must be an ISO datetime, e.g. 2025-01-01T00:00:00")
+            if timezone.is_naive(end):
+                end = timezone.make_aware(end)
+
+        generator = DatasetGenerator(
+            users=options['users'],
+            seed=options['seed'],
+            prefix=prefix,
+            password=options['password'],
+            follows_mean=options['follows_mean'],
+            popularity_exponent=options['popularity_exponent'],
+            posts_mean=options['posts_mean'],
+            history_days=options['history_days'],
+            mood_days=options['mood_days'],
+            mood_log_rate=options['mood_log_rate'],
+            conversations_mean=options['conversations_mean'],
+            messages_mean=options['messages_mean'],
+            end=end,
+            batch_size=options['batch_size'],
+            log=lambda message: self.stdout.write(f"  {message}"),
+        )
+        counts = generator.run()
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(f"generated {total} row(s) with seed {options['seed']}"))
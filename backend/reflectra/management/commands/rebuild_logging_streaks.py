@@ -0,0 +1,18 @@
+# ===========================================
+# File: reflectra/management/commands/rebuild_logging_streaks.py
+# Description: Recomputes LoggingStreak rows from raw MoodLog history
+# ===========================================
+
+from django.core.management.base import BaseCommand
+from reflectra.streaks import rebuild_streaks
+
+
+class Command(BaseCommand):
+    help = "Rebuild mood logging streaks and weekly goal progress from MoodLog (all users, or --user ID ...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="Only this user id (repeatable).")
+
+    def handle(self, *args, **options):
+        written = rebuild_streaks(user_ids=options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f"rebuilt {written} logging streak(s)"))
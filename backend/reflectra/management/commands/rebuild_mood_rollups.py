@@ -0,0 +1,18 @@
+# ===========================================
+# File: reflectra/management/commands/rebuild_mood_rollups.py
+# Description: Recomputes MoodDailyRollup rows from raw MoodLog history
+# ===========================================
+
+from django.core.management.base import BaseCommand
+from reflectra.mood_rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild daily mood/stress rollups from MoodLog (all users, or --user ID ...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="Only this user id (repeatable).")
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(user_ids=options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f"wrote {written} daily rollup(s)"))
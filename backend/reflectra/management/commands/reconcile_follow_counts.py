@@ -0,0 +1,26 @@
+# ===========================================
+# File: reflectra/management/commands/reconcile_follow_counts.py
+# Description: Creates missing UserProfiles and recomputes follower/following counts from the Follow table
+# ===========================================
+
+from django.core.management.base import BaseCommand
+from reflectra.follow_counts import create_missing_profiles, reconcile_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Create missing UserProfiles and fix follower_count / following_count values "
+        "that drifted from the Follow table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Report drift without writing.")
+
+    def handle(self, *args, **options):
+        created = create_missing_profiles(dry_run=options['dry_run'])
+        fixed = reconcile_counts(dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"would create {created} and fix {len(fixed)} profile(s)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"created {created} missing profile(s)"))
+            self.stdout.write(self.style.SUCCESS(f"fixed {len(fixed)} profile(s)"))
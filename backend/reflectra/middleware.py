@@ -0,0 +1,180 @@
+# ===========================================
+# File: reflectra/middleware.py
+# Description: Per-request SQL and timing instrumentation — query count, SQL time and the
+#              slowest statements for a sampled share of requests, as a Server-Timing
+#              header and one structured log event — and read-your-writes stickiness
+#              for replica routing
+# ===========================================
+
+import heapq
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from . import routers
+
+logger = logging.getLogger('reflectra.requests')
+
+# Statements longer than this are cut in the log line; parameters are never logged
+MAX_SQL_LENGTH = 300
+
+
+class QueryRecorder:
+    """
+    execute_wrapper callable: times every statement on the connections it is
+    installed on, keeping the count, the total and the `keep` slowest.
+    """
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.count = 0
+        self.total = 0.0
+        self.slowest = []  # min-heap of (seconds, sequence, alias, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.total += elapsed
+            if self.keep:
+                entry = (elapsed, self.count, context['connection'].alias, sql)
+                if len(self.slowest) < self.keep:
+                    heapq.heappush(self.slowest, entry)
+                elif elapsed > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, entry)
+
+    def slowest_statements(self):
+        return [
+            {'ms': round(elapsed * 1000, 2), 'db': alias, 'sql': sql[:MAX_SQL_LENGTH]}
+            for elapsed, _, alias, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+class RequestTimingMiddleware:
+    """
+    Times a random REFLECTRA_REQUEST_TIMING_SAMPLE_RATE share of requests (0 turns
+    it off, 1 times all). A sampled response carries
+        Server-Timing: db;dur=<ms>;desc="<n> queries", app;dur=<ms>
+    and one `request.timing` event is logged to the `reflectra.requests` logger.
+    Unsampled requests cost one random() call.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        recorder, started = QueryRecorder(settings.REFLECTRA_REQUEST_TIMING_SLOWEST), time.perf_counter()
+        with self._recording(recorder):
+            response = self.get_response(request)
+        self._report(request, response, recorder, started)
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        recorder, started = QueryRecorder(settings.REFLECTRA_REQUEST_TIMING_SLOWEST), time.perf_counter()
+        with self._recording(recorder):
+            response = await self.get_response(request)
+        self._report(request, response, recorder, started)
+        return response
+
+    @staticmethod
+    def _sampled():
+        rate = settings.REFLECTRA_REQUEST_TIMING_SAMPLE_RATE
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    @staticmethod
+    def _recording(recorder):
+        # Every alias, so reads routed to another database are counted too
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def _report(self, request, response, recorder, started):
+        # For a streamed response this covers the view up to its first byte, not the stream
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.total * 1000
+        response['Server-Timing'] = (
+            f'db;dur={db_ms:.2f};desc="{recorder.count} queries", app;dur={total_ms - db_ms:.2f}'
+        )
+
+        if logger.isEnabledFor(logging.INFO):
+            match = request.resolver_match
+            logger.info('request timed', extra={
+                'event': 'request.timing',
+                'method': request.method,
+                'route': match.route if match else None,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'ms': round(total_ms, 2),
+                'db_ms': round(db_ms, 2),
+                'queries': recorder.count,
+                'slowest': recorder.slowest_statements(),
+            })
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes for replica routing (reflectra/routers.py): tracks whether
+    the request wrote to the primary and, if it did, pins the signed-in user's
+    reads to the primary for REFLECTRA_REPLICA_STICKY_SECONDS, longer than
+    replicas should lag. The user is the one DRF authenticated in the view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        writes, token = self._begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            routers._writes.reset(token)
+        self._finish(request, writes)
+        return response
+
+    async def __acall__(self, request):
+        writes, token = self._begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers._writes.reset(token)
+        self._finish(request, writes)
+        return response
+
+    @staticmethod
+    def _begin():
+        writes = [False]
+        return writes, routers._writes.set(writes)
+
+    @staticmethod
+    def _finish(request, writes):
+        user = getattr(request, 'user', None)
+        if writes[0] and user is not None and user.is_authenticated:
+            routers.mark_sticky(user.pk)
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_timelines(apps, schema_editor):
+    """Fan every existing post out to its author and the author's current followers."""
+    AccountabilityPosts = apps.get_model('reflectra', 'AccountabilityPosts')
+    Follow = apps.get_model('reflectra', 'Follow')
+    TimelineEntry = apps.get_model('reflectra', 'TimelineEntry')
+
+    followers = {}
+    for follower_id, following_id in Follow.objects.values_list('follower_id', 'following_id').iterator():
+        followers.setdefault(following_id, []).append(follower_id)
+
+    batch = []
+    posts = AccountabilityPosts.objects.values_list('id', 'user_id', 'timestamp').iterator(chunk_size=2000)
+    for post_id, author_id, timestamp in posts:
+        for owner_id in [author_id, *followers.get(author_id, [])]:
+            batch.append(TimelineEntry(owner_id=owner_id, post_id=post_id, author_id=author_id, timestamp=timestamp))
+        if len(batch) >= 1000:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0004_message'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='reflectra.accountabilityposts')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', '-timestamp', '-post'], name='timeline_owner_recent_idx'), models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx')],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'post'), name='unique_timeline_entry')],
+            },
+        ),
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0005_timelineentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['following', '-created_at', '-id'], name='follow_followers_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender', 'receiver', '-timestamp', '-id'], name='message_pair_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moodlog',
+            index=models.Index(fields=['user', '-timestamp', '-id'], name='moodlog_user_page_idx'),
+        ),
+    ]
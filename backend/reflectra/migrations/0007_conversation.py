@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_conversations(apps, schema_editor):
+    """Build one Conversation per user pair from the existing message history."""
+    Message = apps.get_model('reflectra', 'Message')
+    Conversation = apps.get_model('reflectra', 'Conversation')
+
+    summaries = {}
+    messages = Message.objects.order_by('timestamp', 'id').values_list(
+        'id', 'sender_id', 'receiver_id', 'content', 'timestamp', 'is_read'
+    ).iterator(chunk_size=2000)
+    for message_id, sender_id, receiver_id, content, timestamp, is_read in messages:
+        low_id, high_id = min(sender_id, receiver_id), max(sender_id, receiver_id)
+        summary = summaries.get((low_id, high_id))
+        if summary is None:
+            summary = summaries[(low_id, high_id)] = Conversation(user_low_id=low_id, user_high_id=high_id)
+        summary.last_message_id = message_id
+        summary.last_message_preview = content[:120]
+        summary.last_activity = timestamp
+        if not is_read:
+            if receiver_id == low_id:
+                summary.unread_low += 1
+            else:
+                summary.unread_high += 1
+
+    Conversation.objects.bulk_create(summaries.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0006_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_preview', models.CharField(blank=True, default='', max_length=120)),
+                ('last_activity', models.DateTimeField()),
+                ('unread_low', models.PositiveIntegerField(default=0)),
+                ('unread_high', models.PositiveIntegerField(default=0)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reflectra.message')),
+                ('user_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user_low', '-last_activity', '-id'], name='conversation_low_recent_idx'), models.Index(fields=['user_high', '-last_activity', '-id'], name='conversation_high_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user_low', 'user_high'), name='unique_conversation_pair')],
+            },
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+def backfill_conversation_keys(apps, schema_editor):
+    """Stamp existing messages with their pair key, one UPDATE per (sender, receiver) direction."""
+    Message = apps.get_model('reflectra', 'Message')
+
+    pairs = Message.objects.filter(conversation_key='').values_list('sender_id', 'receiver_id').distinct()
+    for sender_id, receiver_id in pairs.iterator():
+        low_id, high_id = sorted((sender_id, receiver_id))
+        Message.objects.filter(sender_id=sender_id, receiver_id=receiver_id).update(
+            conversation_key=f"{low_id}:{high_id}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0007_conversation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='conversation_key',
+            field=models.CharField(default='', editable=False, max_length=41),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_conversation_keys, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='message',
+            name='message_pair_page_idx',
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation_key', '-timestamp', '-id'], name='message_thread_page_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def seed_watermarks(apps, schema_editor):
+    """Start each side's watermark at the newest message it had already marked read."""
+    Conversation = apps.get_model('reflectra', 'Conversation')
+    Message = apps.get_model('reflectra', 'Message')
+
+    read_upto = {
+        (row['conversation_key'], row['receiver_id']): row['last_read']
+        for row in Message.objects.filter(is_read=True)
+        .values('conversation_key', 'receiver_id')
+        .annotate(last_read=Max('id'))
+    }
+    if not read_upto:
+        return
+
+    batch = []
+    for conversation in Conversation.objects.iterator(chunk_size=2000):
+        key = f"{conversation.user_low_id}:{conversation.user_high_id}"
+        conversation.last_read_low = read_upto.get((key, conversation.user_low_id), 0)
+        conversation.last_read_high = read_upto.get((key, conversation.user_high_id), 0)
+        batch.append(conversation)
+        if len(batch) >= 1000:
+            Conversation.objects.bulk_update(batch, ['last_read_low', 'last_read_high'])
+            batch = []
+    Conversation.objects.bulk_update(batch, ['last_read_low', 'last_read_high'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0008_message_conversation_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_read_high',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_read_low',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(seed_watermarks, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='message',
+            name='is_read',
+        ),
+    ]
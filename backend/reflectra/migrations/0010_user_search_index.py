@@ -0,0 +1,50 @@
+from django.db import migrations
+
+# Frozen copy of the index DDL from reflectra/search.py at the time of this
+# migration: migrations must not depend on app code that can change later.
+SQLITE_INDEX_TABLE = 'reflectra_user_search'
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    users = apps.get_model('auth', 'User')._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_INDEX_TABLE} "
+                "USING fts5(username, email, tokenize='trigram')"
+            )
+            cursor.execute(
+                f"INSERT OR REPLACE INTO {SQLITE_INDEX_TABLE} (rowid, username, email) "
+                f"SELECT id, username, email FROM {users}"
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS user_username_trgm_idx ON {users} USING gin (username gin_trgm_ops)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS user_email_trgm_idx ON {users} USING gin (email gin_trgm_ops)"
+            )
+
+
+def drop_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"DROP TABLE IF EXISTS {SQLITE_INDEX_TABLE}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS user_username_trgm_idx")
+            cursor.execute("DROP INDEX IF EXISTS user_email_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0009_read_watermarks'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
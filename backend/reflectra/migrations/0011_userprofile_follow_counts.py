@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:30
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counts(apps, schema_editor):
+    Follow = apps.get_model('reflectra', 'Follow')
+    UserProfile = apps.get_model('reflectra', 'UserProfile')
+
+    for row in Follow.objects.values('following_id').annotate(total=Count('id')).order_by():
+        UserProfile.objects.filter(user_id=row['following_id']).update(follower_count=row['total'])
+    for row in Follow.objects.values('follower_id').annotate(total=Count('id')).order_by():
+        UserProfile.objects.filter(user_id=row['follower_id']).update(following_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0010_user_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0011_userprofile_follow_counts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['follower', '-created_at', '-id'], name='follow_following_page_idx'),
+        ),
+    ]
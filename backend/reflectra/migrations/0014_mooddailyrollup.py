@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    MoodLog = apps.get_model('reflectra', 'MoodLog')
+    MoodDailyRollup = apps.get_model('reflectra', 'MoodDailyRollup')
+
+    grouped = (
+        MoodLog.objects.annotate(day=TruncDate('timestamp'))
+        .values('user_id', 'day')
+        .annotate(
+            count=Count('id'),
+            mood_sum=Sum('mood'), mood_min=Min('mood'), mood_max=Max('mood'),
+            stress_sum=Sum('stress'), stress_min=Min('stress'), stress_max=Max('stress'),
+        )
+        .order_by()
+    )
+    MoodDailyRollup.objects.bulk_create((MoodDailyRollup(**row) for row in grouped.iterator()), batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0013_followsuggestion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MoodDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('mood_sum', models.IntegerField(default=0)),
+                ('mood_min', models.IntegerField()),
+                ('mood_max', models.IntegerField()),
+                ('stress_sum', models.IntegerField(default=0)),
+                ('stress_min', models.IntegerField()),
+                ('stress_max', models.IntegerField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mood_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='unique_mood_rollup_day')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
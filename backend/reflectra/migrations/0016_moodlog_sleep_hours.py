@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:44
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# Frozen copy of reflectra/sleep.py at the time of this migration: migrations
+# must not depend on app code that can change later.
+_HOURS = re.compile(r'^(\d+(?:\.\d+)?)\s*(?:h|hr|hrs|hour|hours)?$')
+_HOURS_MINUTES = re.compile(r'^(\d+)\s*(?:h|hr|hrs|hours?|:)\s*(\d{1,2})\s*(?:m|min|mins|minutes?)?$')
+_MINUTES = re.compile(r'^(\d+)\s*(?:m|min|mins|minutes?)$')
+
+
+def parse_sleep_hours(value):
+    """Hours in a free-text sleep entry, None when it holds no duration; ValueError when malformed."""
+    text = str(value).strip().lower()
+    if not any(char.isdigit() for char in text):
+        return None
+    if match := _HOURS.match(text):
+        hours = float(match.group(1))
+    elif match := _HOURS_MINUTES.match(text):
+        minutes = int(match.group(2))
+        if minutes >= 60:
+            raise ValueError(value)
+        hours = int(match.group(1)) + minutes / 60
+    elif match := _MINUTES.match(text):
+        hours = int(match.group(1)) / 60
+    else:
+        raise ValueError(value)
+    if not 0 <= hours <= 24:
+        raise ValueError(value)
+    return round(hours, 2)
+
+
+def parse_existing_sleep(apps, schema_editor):
+    """Fill sleep_hours from the free-text column, one primary-key range at a time."""
+    MoodLog = apps.get_model('reflectra', 'MoodLog')
+    logs = MoodLog.objects.exclude(sleep__isnull=True).exclude(sleep='').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(logs.filter(pk__gt=last_pk).only('pk', 'sleep')[:BATCH_SIZE])
+        if not batch:
+            break
+        for log in batch:
+            try:
+                log.sleep_hours = parse_sleep_hours(log.sleep)
+            except ValueError:
+                log.sleep_hours = None
+        MoodLog.objects.bulk_update(batch, ['sleep_hours'])
+        last_pk = batch[-1].pk
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0015_moodlog_timestamp_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moodlog',
+            name='sleep_hours',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='moodlog',
+            index=models.Index(fields=['user', 'sleep_hours'], name='moodlog_user_sleep_idx'),
+        ),
+        migrations.RunPython(parse_existing_sleep, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:47
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def advance(streak, day):
+    """Frozen copy of reflectra.streaks.advance at the time of this migration."""
+    last = streak.last_log_day
+    if last is not None and day <= last:
+        return
+    streak.current_streak = streak.current_streak + 1 if last is not None and day - last == timedelta(days=1) else 1
+    streak.longest_streak = max(streak.longest_streak, streak.current_streak)
+    streak.last_log_day = day
+
+    week = day - timedelta(days=day.weekday())
+    if streak.week_start == week:
+        streak.days_this_week += 1
+    else:
+        streak.week_start, streak.days_this_week = week, 1
+
+
+def backfill_streaks(apps, schema_editor):
+    MoodLog = apps.get_model('reflectra', 'MoodLog')
+    LoggingStreak = apps.get_model('reflectra', 'LoggingStreak')
+
+    days = (
+        MoodLog.objects.annotate(day=TruncDate('timestamp'))
+        .values_list('user_id', 'day')
+        .distinct()
+        .order_by('user_id', 'day')
+    )
+    streaks = {}
+    for user_id, day in days.iterator():
+        advance(streaks.setdefault(user_id, LoggingStreak(user_id=user_id)), day)
+    LoggingStreak.objects.bulk_create(streaks.values(), batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reflectra', '0016_moodlog_sleep_hours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoggingStreak',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='logging_streak', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('current_streak', models.PositiveIntegerField(default=0)),
+                ('longest_streak', models.PositiveIntegerField(default=0)),
+                ('last_log_day', models.DateField(blank=True, null=True)),
+                ('weekly_goal', models.PositiveSmallIntegerField(default=5)),
+                ('week_start', models.DateField(blank=True, null=True)),
+                ('days_this_week', models.PositiveSmallIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_streaks, migrations.RunPython.noop),
+    ]
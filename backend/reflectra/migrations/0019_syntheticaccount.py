@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 20:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reflectra', '0018_settable_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyntheticAccount',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='synthetic_account', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('prefix', models.CharField(db_index=True, max_length=150)),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+# Expression indexes for the short-query path in reflectra/search.py, which
+# range-scans lower(username) and lower(email). Plain SQL so the migration
+# keeps working whatever search.py later becomes.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reflectra', '0019_syntheticaccount'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS user_username_lower_idx ON auth_user (lower(username))",
+            "DROP INDEX IF EXISTS user_username_lower_idx",
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS user_email_lower_idx ON auth_user (lower(email))",
+            "DROP INDEX IF EXISTS user_email_lower_idx",
+        ),
+    ]
@@ -5,8 +5,7 @@
 
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.utils import timezone
 
 # -------------------------------
 # Mood Options for User Profiles
@@ -36,37 +35,33 @@ MOOD_CHOICES = [
 # UserProfile Model
 # -------------------------------
 class UserProfile(models.Model):
+    # Created by accounts.py (no post_save signal); users made elsewhere get one from
+    # follow_counts.ensure_profile on their first follow, or `manage.py reconcile_follow_counts`
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     bio = models.TextField(blank=True, null=True)
     mood_preference = models.CharField(max_length=50, choices=MOOD_CHOICES, blank=True, null=True)
+    # Denormalized from Follow; maintained by follow_counts.py, repaired by `manage.py reconcile_follow_counts`
+    follower_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
 
-# ✅ Automatically create or update profile when a user is created
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    if created:
-        UserProfile.objects.get_or_create(user=instance)
-
-
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, "profile"):
-        instance.profile.save()
-
-
 # -------------------------------
 # Follow Relationship Model
 # -------------------------------
 class Follow(models.Model):
     follower = models.ForeignKey(User, on_delete=models.CASCADE, related_name="following_set")
     following = models.ForeignKey(User, on_delete=models.CASCADE, related_name="followers_set")
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         unique_together = ('follower', 'following')
+        indexes = [
+            models.Index(fields=['following', '-created_at', '-id'], name='follow_followers_page_idx'),
+            models.Index(fields=['follower', '-created_at', '-id'], name='follow_following_page_idx'),
+        ]
 
     def __str__(self):
         return f"{self.follower.username} follows {self.following.username}"
@@ -78,7 +73,7 @@ class Follow(models.Model):
 class AccountabilityPosts(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     content_text = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)
     visibility = models.CharField(
         max_length=10,
         choices=[('public', 'Public'), ('private', 'Private')],
@@ -89,6 +84,29 @@ class AccountabilityPosts(models.Model):
         return f"Post by {self.user.username} at {self.timestamp}"
 
 
+# -------------------------------
+# Materialized Activity Feed
+# -------------------------------
+class TimelineEntry(models.Model):
+    """One post as seen in one user's feed, written when the post is created (fan-out on write)."""
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="timeline_entries")
+    post = models.ForeignKey(AccountabilityPosts, on_delete=models.CASCADE, related_name="timeline_entries")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    timestamp = models.DateTimeField()  # copy of post.timestamp so the feed sorts without a join
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='unique_timeline_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-timestamp', '-post'], name='timeline_owner_recent_idx'),
+            models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"Post {self.post_id} in {self.owner_id}'s timeline"
+
+
 # -------------------------------
 # Wellness / Mood Tracking
 # -------------------------------
@@ -96,23 +114,161 @@ class MoodLog(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="mood_logs")
     mood = models.IntegerField()  # 1–10 scale
     stress = models.IntegerField()  # 1–10 scale
-    sleep = models.CharField(max_length=20, blank=True, null=True)
+    sleep = models.CharField(max_length=20, blank=True, null=True)  # as entered, e.g. "7h30m" or "great"
+    sleep_hours = models.FloatField(blank=True, null=True)  # parsed from `sleep`; None when it holds no duration
     notes = models.TextField(blank=True, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)  # settable so bulk imports keep their history
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-timestamp', '-id'], name='moodlog_user_page_idx'),
+            models.Index(fields=['user', 'sleep_hours'], name='moodlog_user_sleep_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - Mood {self.mood}, Stress {self.stress}"
 
 
+class MoodDailyRollup(models.Model):
+    """Per-user, per-day aggregates of MoodLog, so analytics never scan raw logs."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="mood_rollups")
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    mood_sum = models.IntegerField(default=0)
+    mood_min = models.IntegerField()
+    mood_max = models.IntegerField()
+    stress_sum = models.IntegerField(default=0)
+    stress_min = models.IntegerField()
+    stress_max = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='unique_mood_rollup_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day}: {self.count} log(s)"
+
+
+class LoggingStreak(models.Model):
+    """Per-user mood logging streak and weekly goal progress, advanced one log at a time."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="logging_streak")
+    current_streak = models.PositiveIntegerField(default=0)  # consecutive days ending on last_log_day
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_log_day = models.DateField(null=True, blank=True)
+    weekly_goal = models.PositiveSmallIntegerField(default=5)  # days per week
+    week_start = models.DateField(null=True, blank=True)  # Monday of the week counted in days_this_week
+    days_this_week = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.current_streak} day streak"
+
+
 # -------------------------------
 # Direct Messaging
 # -------------------------------
+def participant_pair(user_a_id, user_b_id):
+    """Order a pair of user ids so (a, b) and (b, a) map to the same conversation."""
+    return (user_a_id, user_b_id) if user_a_id <= user_b_id else (user_b_id, user_a_id)
+
+
+def conversation_key(user_a_id, user_b_id):
+    """Stable key for the pair of participants, independent of who sent the message."""
+    low_id, high_id = participant_pair(user_a_id, user_b_id)
+    return f"{low_id}:{high_id}"
+
+
 class Message(models.Model):
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sent_messages")
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name="received_messages")
+    conversation_key = models.CharField(max_length=41, editable=False)
     content = models.TextField()
-    timestamp = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['conversation_key', '-timestamp', '-id'], name='message_thread_page_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.conversation_key:
+            self.conversation_key = conversation_key(self.sender_id, self.receiver_id)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.sender.username} → {self.receiver.username}: {self.content[:20]}"
+
+
+# -------------------------------
+# Conversation Summary (Inbox)
+# -------------------------------
+class Conversation(models.Model):
+    """
+    One row per pair of users who have exchanged messages, kept current on every send.
+    The pair is stored canonically: user_low has the smaller id.
+    """
+    user_low = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    user_high = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    last_message = models.ForeignKey(Message, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    last_message_preview = models.CharField(max_length=120, blank=True, default='')
+    last_activity = models.DateTimeField()
+    unread_low = models.PositiveIntegerField(default=0)   # unread by user_low
+    unread_high = models.PositiveIntegerField(default=0)  # unread by user_high
+    # Read watermarks: every message up to and including this id has been read by that side
+    last_read_low = models.BigIntegerField(default=0)
+    last_read_high = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_low', 'user_high'], name='unique_conversation_pair'),
+        ]
+        indexes = [
+            models.Index(fields=['user_low', '-last_activity', '-id'], name='conversation_low_recent_idx'),
+            models.Index(fields=['user_high', '-last_activity', '-id'], name='conversation_high_recent_idx'),
+        ]
+
+    def partner_id(self, user_id):
+        return self.user_high_id if user_id == self.user_low_id else self.user_low_id
+
+    def unread_for(self, user_id):
+        return self.unread_low if user_id == self.user_low_id else self.unread_high
+
+    def read_watermarks(self):
+        """Map each participant id to the highest message id they have read."""
+        return {self.user_low_id: self.last_read_low, self.user_high_id: self.last_read_high}
+
+    def __str__(self):
+        return f"Conversation {self.user_low_id} ↔ {self.user_high_id}"
+
+
+# -------------------------------
+# "People You May Know" (precomputed)
+# -------------------------------
+class FollowSuggestion(models.Model):
+    """A candidate for `user` to follow, scored by how many of user's followees already follow them."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="follow_suggestions")
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    score = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'candidate'], name='unique_follow_suggestion'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-score', 'candidate'], name='suggestion_user_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"Suggest {self.candidate_id} to {self.user_id} (score {self.score})"
+
+
+# -------------------------------
+# Synthetic dataset marker
+# -------------------------------
+class SyntheticAccount(models.Model):
+    """Marks a user created by the synthetic dataset generator; only these are ever deleted by `--clear`."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="synthetic_account")
+    prefix = models.CharField(max_length=150, db_index=True)
 
     def __str__(self):
-        return f"{self.sender.username} → {self.receiver.username}: {self.content[:20]}"
\ No newline at end of file
+        return f"{self.user_id} ({self.prefix})"
@@ -0,0 +1,150 @@
+# ===========================================
+# File: reflectra/mood_io.py
+# Description: Streaming mood log import/export — NDJSON and CSV, read and written row by row
+# ===========================================
+
+import codecs
+import csv
+import json
+
+from django.db import transaction
+from .models import MoodLog
+from .serializers import MoodLogImportSerializer
+
+FORMATS = ('ndjson', 'csv')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Columns written on export and accepted on import
+FIELDS = ['mood', 'stress', 'sleep', 'notes', 'timestamp']
+
+# Rows validated and inserted per bulk_create
+CHUNK_SIZE = 500
+
+# Upper bound on one upload, and on the errors reported back for it
+MAX_ROWS = 50000
+MAX_ERRORS = 20
+
+# Rows fetched per database round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+
+class MoodImportError(Exception):
+    """Raised when an upload cannot be imported; `errors` lists the offending lines."""
+
+    def __init__(self, errors):
+        super().__init__('Import failed.')
+        self.errors = errors
+
+
+# -------------------------------
+# Parsing (one line at a time)
+# -------------------------------
+def _ndjson_rows(text):
+    for line_number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def _csv_rows(text):
+    reader = csv.DictReader(text)
+    for row in reader:
+        # Empty CSV cells mean "not provided" rather than an empty string
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ('', None)}
+
+
+def read_rows(stream, fmt):
+    """Yield (line_number, dict-or-None) pairs from a binary upload without reading it all into memory."""
+    text = codecs.iterdecode(stream, 'utf-8-sig')
+    return _ndjson_rows(text) if fmt == 'ndjson' else _csv_rows(text)
+
+
+# -------------------------------
+# Import
+# -------------------------------
+def _validate_chunk(user, chunk, errors):
+    """Validate one chunk of (line_number, row) pairs in a single serializer pass."""
+    serializer = MoodLogImportSerializer(data=[row for _, row in chunk], many=True)
+    if serializer.is_valid():
+        return [MoodLog(user=user, **data) for data in serializer.validated_data]
+    row_errors = serializer.errors
+    if isinstance(row_errors, list):
+        row_errors = dict(enumerate(row_errors))
+    for position, detail in row_errors.items():
+        if detail:
+            errors.append({'line': chunk[position][0], 'errors': detail})
+    return []
+
+
+def import_logs(user, rows, chunk_size=CHUNK_SIZE, max_rows=MAX_ROWS):
+    """
+    Validate `rows` chunk by chunk and bulk insert each valid chunk. The import
+    is all-or-nothing: any invalid line rolls the whole upload back and raises
+    MoodImportError. Returns the number of logs created.
+    """
+    created, errors, chunk = 0, [], []
+
+    def flush():
+        nonlocal created
+        logs = _validate_chunk(user, chunk, errors) if chunk else []
+        if logs and not errors:
+            MoodLog.objects.bulk_create(logs)
+            created += len(logs)
+        chunk.clear()
+
+    with transaction.atomic():
+        for count, (line_number, row) in enumerate(rows, start=1):
+            if count > max_rows:
+                errors.append({'line': line_number, 'errors': f'Uploads are limited to {max_rows} rows.'})
+                break
+            if row is None:
+                errors.append({'line': line_number, 'errors': 'Not a JSON object.'})
+            else:
+                chunk.append((line_number, row))
+            if len(chunk) >= chunk_size:
+                flush()
+            if len(errors) >= MAX_ERRORS:
+                break
+        flush()
+
+        if errors:
+            errors.sort(key=lambda error: error['line'])
+            raise MoodImportError(errors[:MAX_ERRORS])
+    return created
+
+
+# -------------------------------
+# Export (generators for StreamingHttpResponse)
+# -------------------------------
+class _Echo:
+    """File-like object whose write() hands the line straight back, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _export_rows(user):
+    logs = MoodLog.objects.filter(user=user).order_by('timestamp', 'id').values_list(*FIELDS)
+    return logs.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def export_ndjson(user):
+    for values in _export_rows(user):
+        row = dict(zip(FIELDS, values))
+        row['timestamp'] = row['timestamp'].isoformat()
+        yield json.dumps(row) + '\n'
+
+
+def export_csv(user):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FIELDS)
+    for mood, stress, sleep, notes, timestamp in _export_rows(user):
+        yield writer.writerow([mood, stress, sleep or '', notes or '', timestamp.isoformat()])
@@ -0,0 +1,185 @@
+# ===========================================
+# File: reflectra/mood_rollups.py
+# Description: Daily mood/stress rollups — O(1) upkeep per new log, grouped rebuilds, range analytics
+# ===========================================
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from django.db.models.functions import Greatest, Least, TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+from .models import MoodDailyRollup, MoodLog
+
+BUCKETS = {
+    'day': None,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def log_day(timestamp):
+    return timezone.localtime(timestamp).date()
+
+
+def day_range(start, end):
+    """Aware [start of `start`, start of the day after `end`) in local time, for index-friendly timestamp filters."""
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)),
+    )
+
+
+# -------------------------------
+# New log → fold into its day
+# -------------------------------
+def record_log(log):
+    """Add one MoodLog to its day's rollup with a single upsert-style write."""
+    day = log_day(log.timestamp)
+    with transaction.atomic():
+        rollup, created = MoodDailyRollup.objects.select_for_update().get_or_create(
+            user_id=log.user_id,
+            day=day,
+            defaults={
+                'count': 1,
+                'mood_sum': log.mood, 'mood_min': log.mood, 'mood_max': log.mood,
+                'stress_sum': log.stress, 'stress_min': log.stress, 'stress_max': log.stress,
+            },
+        )
+        if not created:
+            MoodDailyRollup.objects.filter(pk=rollup.pk).update(
+                count=F('count') + 1,
+                mood_sum=F('mood_sum') + log.mood,
+                mood_min=Least(F('mood_min'), log.mood),
+                mood_max=Greatest(F('mood_max'), log.mood),
+                stress_sum=F('stress_sum') + log.stress,
+                stress_min=Least(F('stress_min'), log.stress),
+                stress_max=Greatest(F('stress_max'), log.stress),
+            )
+
+
+# -------------------------------
+# Rebuild from raw logs (backfills, bulk imports, repair)
+# -------------------------------
+def rebuild_rollups(user_ids=None, batch_size=2000):
+    """
+    Recompute rollups with one GROUP BY (user, day) in the database, for the
+    given users or everyone. Returns the number of day rows written.
+    """
+    logs = MoodLog.objects.all()
+    rollups = MoodDailyRollup.objects.all()
+    if user_ids is not None:
+        logs = logs.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    grouped = (
+        logs.annotate(day=TruncDate('timestamp'))
+        .values('user_id', 'day')
+        .annotate(
+            count=Count('id'),
+            mood_sum=Sum('mood'), mood_min=Min('mood'), mood_max=Max('mood'),
+            stress_sum=Sum('stress'), stress_min=Min('stress'), stress_max=Max('stress'),
+        )
+        .order_by()
+    )
+
+    written = 0
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for row in grouped.iterator(chunk_size=batch_size):
+            batch.append(MoodDailyRollup(**row))
+            if len(batch) >= batch_size:
+                MoodDailyRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        MoodDailyRollup.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+# -------------------------------
+# Analytics
+# -------------------------------
+def summarize(user, start, end, bucket='day'):
+    """Mean/min/max/count of mood and stress per day, week or month between two dates (inclusive)."""
+    rollups = MoodDailyRollup.objects.filter(user=user, day__gte=start, day__lte=end)
+    trunc = BUCKETS[bucket]
+    period = trunc('day') if trunc else F('day')
+
+    rows = (
+        rollups.annotate(period=period)
+        .values('period')
+        .annotate(
+            total=Sum('count'),
+            mood_total=Sum('mood_sum'), mood_low=Min('mood_min'), mood_high=Max('mood_max'),
+            stress_total=Sum('stress_sum'), stress_low=Min('stress_min'), stress_high=Max('stress_max'),
+        )
+        .order_by('period')
+    )
+
+    return [
+        {
+            'period': row['period'],
+            'count': row['total'],
+            'mood_avg': round(row['mood_total'] / row['total'], 2),
+            'mood_min': row['mood_low'],
+            'mood_max': row['mood_high'],
+            'stress_avg': round(row['stress_total'] / row['total'], 2),
+            'stress_min': row['stress_low'],
+            'stress_max': row['stress_high'],
+        }
+        for row in rows
+    ]
+
+
+def _pearson(n, sum_x, sum_y, sum_xx, sum_yy, sum_xy):
+    if n < 2:
+        return None
+    spread = (n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2)
+    if spread <= 0:
+        return None
+    return round((n * sum_xy - sum_x * sum_y) / spread ** 0.5, 3)
+
+
+def sleep_stats(user, start, end):
+    """
+    Average sleep and its Pearson correlation with mood and stress between two
+    dates (inclusive), from one aggregate query over the numeric sleep column.
+    Logs without a parsed duration are left out.
+    """
+    # A plain range on timestamp (not timestamp__date, which wraps the column in a cast) lets
+    # the (user, -timestamp) index bound the scan
+    since, until = day_range(start, end)
+    totals = MoodLog.objects.filter(
+        user=user, sleep_hours__isnull=False, timestamp__gte=since, timestamp__lt=until
+    ).aggregate(
+        n=Count('id'),
+        sleep_avg=Avg('sleep_hours'),
+        sleep_min=Min('sleep_hours'),
+        sleep_max=Max('sleep_hours'),
+        sleep_sum=Sum('sleep_hours'),
+        sleep_sq=Sum(F('sleep_hours') * F('sleep_hours')),
+        mood_sum=Sum('mood'),
+        mood_sq=Sum(F('mood') * F('mood')),
+        stress_sum=Sum('stress'),
+        stress_sq=Sum(F('stress') * F('stress')),
+        sleep_mood=Sum(F('sleep_hours') * F('mood')),
+        sleep_stress=Sum(F('sleep_hours') * F('stress')),
+    )
+    n = totals['n']
+    if not n:
+        return {'count': 0, 'sleep_avg': None, 'sleep_min': None, 'sleep_max': None,
+                'sleep_mood_corr': None, 'sleep_stress_corr': None}
+    return {
+        'count': n,
+        'sleep_avg': round(totals['sleep_avg'], 2),
+        'sleep_min': totals['sleep_min'],
+        'sleep_max': totals['sleep_max'],
+        'sleep_mood_corr': _pearson(
+            n, totals['sleep_sum'], totals['mood_sum'], totals['sleep_sq'], totals['mood_sq'], totals['sleep_mood']
+        ),
+        'sleep_stress_corr': _pearson(
+            n, totals['sleep_sum'], totals['stress_sum'], totals['sleep_sq'], totals['stress_sq'], totals['sleep_stress']
+        ),
+    }
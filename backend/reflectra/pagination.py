@@ -0,0 +1,121 @@
+# ===========================================
+# File: reflectra/pagination.py
+# Description: Opaque keyset (cursor) pagination shared by list endpoints
+# ===========================================
+
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# -------------------------------
+# Keyset Pagination
+# -------------------------------
+class KeysetPagination(BasePagination):
+    """
+    Seek-based pagination: `?cursor=` encodes the sort key of the last row
+    served, so page N costs the same index range scan as page 1.
+
+    The response body stays a plain list (what the frontend already expects);
+    the next page is advertised in the `X-Next-Cursor` and `Link` headers.
+    The last field of `ordering` must be unique (normally the primary key).
+    """
+    ordering = ('-timestamp', '-id')
+    default_limit = 50
+    max_limit = 200
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if view is not None and getattr(view, 'ordering', None):
+            self.ordering = tuple(view.ordering)
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(position))
+            except (DjangoValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # Fetch one extra row to learn whether another page exists
+        rows = list(queryset[:self.limit + 1])
+        page = rows[:self.limit]
+        self.next_cursor = self.encode_cursor(page[-1]) if len(rows) > self.limit else None
+        return page
+
+    def get_paginated_response(self, data):
+        response = Response(data)
+        if self.next_cursor:
+            response['X-Next-Cursor'] = self.next_cursor
+            response['Link'] = f'<{self.get_next_link()}>; rel="next"'
+        return response
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    # -------------------------------
+    # Request parsing
+    # -------------------------------
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get(self.limit_query_param, self.default_limit))
+        except (TypeError, ValueError):
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, row):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            position.append(value.isoformat() if isinstance(value, datetime) else value)
+        raw = json.dumps(position, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    # -------------------------------
+    # Seek predicate
+    # -------------------------------
+    def _after(self, position):
+        """
+        Rows strictly after `position` in `ordering`, e.g. for ('-timestamp', '-id'):
+        timestamp < t OR (timestamp = t AND id < i).
+        """
+        condition = Q()
+        equal_prefix = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal_prefix & Q(**{f'{name}__{lookup}': value})
+            equal_prefix &= Q(**{name: value})
+        return condition
@@ -0,0 +1,64 @@
+# ===========================================
+# File: reflectra/passwords.py
+# Description: Password verification on a bounded worker pool, so a login storm has a
+#              fixed hashing budget instead of pinning every request worker's CPU
+# ===========================================
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+# Hashes running at once (hashlib releases the GIL, so these use real cores)
+_executor = ThreadPoolExecutor(
+    max_workers=settings.REFLECTRA_LOGIN_HASH_WORKERS, thread_name_prefix='password-hash'
+)
+
+# Bulk onboarding hashes on its own pool, so a large batch never queues ahead of logins
+_bulk_executor = ThreadPoolExecutor(
+    max_workers=settings.REFLECTRA_BULK_HASH_WORKERS, thread_name_prefix='password-hash-bulk'
+)
+
+# Verifications running or queued; beyond this a login is turned away before any hashing
+_slots = threading.BoundedSemaphore(settings.REFLECTRA_LOGIN_HASH_MAX_PENDING)
+
+
+class HashingBusy(Exception):
+    """Every hashing slot is taken; the caller should answer 503 and let the client retry."""
+
+
+def _run(function, *args):
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        return _executor.submit(function, *args).result()
+    finally:
+        _slots.release()
+
+
+def check_password(user, password):
+    """
+    Verify `password` against `user` (which may be None) off the request thread.
+    An unknown user still pays for one hash, like Django's ModelBackend, so
+    response time does not reveal which accounts exist. Outdated hashes are
+    upgraded here, on the request thread, where the database connection lives.
+    """
+    if user is None:
+        _run(make_password, password)
+        return False
+
+    is_correct, must_update = _run(verify_password, password, user.password)
+    if is_correct and must_update:
+        user.set_password(password)
+        user.save(update_fields=['password'])
+    return is_correct
+
+
+def make_passwords(raw_passwords):
+    """
+    Hash many passwords for bulk onboarding; None yields an unusable password.
+    Runs on the bulk pool, never the login pool: a batch of thousands takes
+    minutes of PBKDF2 and would otherwise stall every login behind it.
+    """
+    return list(_bulk_executor.map(make_password, raw_passwords))
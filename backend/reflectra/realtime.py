@@ -0,0 +1,117 @@
+# ===========================================
+# File: reflectra/realtime.py
+# Description: Push delivery of new messages and posts to connected clients (Server-Sent Events)
+# ===========================================
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKEND = 'reflectra.realtime.InMemoryBroadcastBackend'
+
+# Events buffered per connection before the oldest are dropped (slow client)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+# -------------------------------
+# Broadcast Backends
+# -------------------------------
+class BaseBroadcastBackend:
+    """
+    Routes events to the connections subscribed for a user id.
+
+    Swap implementations with the REFLECTRA_BROADCAST_BACKEND setting; a
+    multi-process deployment needs one backed by a shared bus (e.g. Redis pub/sub)
+    with the same publish/subscribe/unsubscribe methods.
+    """
+
+    def publish(self, user_id, event):
+        raise NotImplementedError
+
+    def subscribe(self, user_id):
+        """Register the calling event loop for `user_id`; returns a Subscription."""
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class Subscription:
+    """One open stream: an asyncio queue owned by the event loop that created it."""
+
+    def __init__(self, user_id, loop, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, event):
+        # Runs on self.loop; drop the oldest event rather than block the publisher
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InMemoryBroadcastBackend(BaseBroadcastBackend):
+    """Single-process fan-out; publishers may run on any thread (e.g. sync views)."""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.loop.call_soon_threadsafe(subscription.push, event)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    backend_path = getattr(settings, 'REFLECTRA_BROADCAST_BACKEND', DEFAULT_BACKEND)
+    return import_string(backend_path)()
+
+
+# -------------------------------
+# Publishing helpers
+# -------------------------------
+def publish_event(user_ids, event_type, payload):
+    """Deliver an event to each user once the current transaction commits."""
+    event = {'type': event_type, 'data': payload}
+    recipients = set(user_ids)
+
+    def deliver():
+        backend = get_backend()
+        for user_id in recipients:
+            backend.publish(user_id, event)
+
+    transaction.on_commit(deliver)
+
+
+def format_sse(event):
+    """Encode an event as a Server-Sent Events frame."""
+    data = json.dumps(event['data'], cls=DjangoJSONEncoder)
+    return f"event: {event['type']}\ndata: {data}\n\n"
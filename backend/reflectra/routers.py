@@ -0,0 +1,121 @@
+# ===========================================
+# File: reflectra/routers.py
+# Description: Read-replica routing — reads inside views marked @replica_reads go to a
+#              replica alias, every write goes to the primary, and a user who just wrote
+#              reads from the primary for a short stickiness window
+# ===========================================
+
+import functools
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+# Replica alias the current view's reads go to (None = primary)
+_replica = ContextVar('reflectra_replica', default=None)
+
+# Per-request record of whether anything was written, set up by ReplicaStickinessMiddleware
+_writes = ContextVar('reflectra_writes', default=None)
+
+# Cache backends whose entries are private to one process (or not kept at all)
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def _sticky_key(user_id):
+    return f'replica-sticky:{user_id}'
+
+
+def is_sticky(user_id):
+    return cache.get(_sticky_key(user_id)) is not None
+
+
+def mark_sticky(user_id):
+    """Pin the user's reads to the primary for the stickiness window (needs a cache shared by all processes)."""
+    cache.set(_sticky_key(user_id), True, settings.REFLECTRA_REPLICA_STICKY_SECONDS)
+
+
+@checks.register(checks.Tags.caches)
+def check_sticky_cache(app_configs=None, **kwargs):
+    """With replicas, a per-process cache breaks read-your-writes once a second worker serves the user."""
+    if settings.REFLECTRA_READ_REPLICAS and settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+        return [checks.Error(
+            "REFLECTRA_REPLICA_URLS is set but the default cache is per-process, so replica "
+            "stickiness is not shared between workers.",
+            hint="Set REFLECTRA_CACHE_URL to a shared cache (redis://, memcached:// or file://).",
+            id='reflectra.E001',
+        )]
+    return []
+
+
+def _wrote():
+    writes = _writes.get()
+    return writes is not None and writes[0]
+
+
+# -------------------------------
+# Router
+# -------------------------------
+class ReplicaRouter:
+    """
+    Sends reads to the replica chosen by @replica_reads, unless this request
+    already wrote or the primary is inside a transaction (both need the
+    primary's view of the data). Everything else, and every write, uses the
+    primary, even for instances that were loaded from a replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _replica.get()
+        if alias is None or _wrote() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None:
+            writes[0] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows, so objects from any of them may be related
+        databases = {DEFAULT_DB_ALIAS, *settings.REFLECTRA_READ_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+# -------------------------------
+# View decorator
+# -------------------------------
+def replica_reads(view):
+    """
+    Serve a view's GET/HEAD/OPTIONS requests from a read replica, picked once
+    per request. Requests from a user inside their stickiness window, and all
+    unsafe methods, stay on the primary. Apply it directly to the function
+    (under @api_view) or, for a class-based view, with method_decorator.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        replicas = settings.REFLECTRA_READ_REPLICAS
+        user = getattr(request, 'user', None)
+        if (
+            not replicas
+            or request.method not in SAFE_METHODS
+            or (user is not None and user.is_authenticated and is_sticky(user.pk))
+        ):
+            return view(request, *args, **kwargs)
+
+        token = _replica.set(random.choice(replicas))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _replica.reset(token)
+
+    return wrapper
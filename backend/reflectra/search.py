@@ -0,0 +1,174 @@
+# ===========================================
+# File: reflectra/search.py
+# Description: Indexed, ranked user search (SQLite FTS5 trigram shadow table / Postgres pg_trgm)
+# ===========================================
+
+from django.contrib.auth.models import User
+from django.db import connections, router
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import UserProfile
+
+# SQLite FTS5 shadow table: rowid = auth_user.id, kept in sync by the receivers below
+SQLITE_INDEX_TABLE = 'reflectra_user_search'
+
+# Results returned for one query, and the hard cap a client may ask for
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+# Trigram matching needs at least this many characters; shorter queries use a case-insensitive
+# prefix scan of username and email (lower() expression indexes, migration 0020)
+MIN_TRIGRAM_LENGTH = 3
+
+_sqlite_index_ready = {}
+
+
+# -------------------------------
+# Index maintenance (schema)
+# -------------------------------
+def create_search_index(connection):
+    """Create the vendor-specific index. Called from the migration; safe to re-run."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_INDEX_TABLE} "
+                "USING fts5(username, email, tokenize='trigram')"
+            )
+            cursor.execute(
+                f"INSERT OR REPLACE INTO {SQLITE_INDEX_TABLE} (rowid, username, email) "
+                f"SELECT id, username, email FROM {User._meta.db_table}"
+            )
+        elif connection.vendor == 'postgresql':
+            table = User._meta.db_table
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS user_username_trgm_idx ON {table} USING gin (username gin_trgm_ops)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS user_email_trgm_idx ON {table} USING gin (email gin_trgm_ops)"
+            )
+    _sqlite_index_ready.pop(connection.alias, None)
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"DROP TABLE IF EXISTS {SQLITE_INDEX_TABLE}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS user_username_trgm_idx")
+            cursor.execute("DROP INDEX IF EXISTS user_email_trgm_idx")
+    _sqlite_index_ready.pop(connection.alias, None)
+
+
+def _has_sqlite_index(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    if connection.alias not in _sqlite_index_ready:
+        _sqlite_index_ready[connection.alias] = SQLITE_INDEX_TABLE in connection.introspection.table_names()
+    return _sqlite_index_ready[connection.alias]
+
+
+# -------------------------------
+# Index maintenance (rows)
+# -------------------------------
+def index_users(users, using=None):
+    """Upsert users into the SQLite shadow table (Postgres indexes the table itself)."""
+    connection = connections[using or router.db_for_write(User)]
+    if not _has_sqlite_index(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {SQLITE_INDEX_TABLE} (rowid, username, email) VALUES (%s, %s, %s)",
+            [(user.id, user.username, user.email) for user in users],
+        )
+
+
+@receiver(post_save, sender=User)
+def index_saved_user(sender, instance, using, update_fields=None, **kwargs):
+    if update_fields is not None and not {'username', 'email'} & set(update_fields):
+        return
+    index_users([instance], using=using)
+
+
+@receiver(post_delete, sender=User)
+def unindex_deleted_user(sender, instance, using, **kwargs):
+    connection = connections[using]
+    if _has_sqlite_index(connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SQLITE_INDEX_TABLE} WHERE rowid = %s", [instance.id])
+
+
+# -------------------------------
+# Query
+# -------------------------------
+def _like_escape(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def search_users(query, limit=DEFAULT_LIMIT):
+    """
+    Case-insensitive, ranked user search over username and email: exact
+    username first, then username prefix, then trigram relevance (or, below
+    MIN_TRIGRAM_LENGTH characters, username and email prefixes only). Each row carries the profile bio and
+    follower count, joined in the same statement. Returns at most `limit` dicts.
+    """
+    query = query.strip().lower()
+    limit = max(1, min(limit, MAX_LIMIT))
+    if not query:
+        return []
+
+    connection = connections[router.db_for_read(User)]
+    users, profiles = User._meta.db_table, UserProfile._meta.db_table
+    select = "SELECT u.id, u.username, u.email, p.bio, p.follower_count FROM "
+    join_profile = f"LEFT JOIN {profiles} p ON p.user_id = u.id "
+    rank_exact_prefix = "ORDER BY (lower(u.username) = %s) DESC, (lower(u.username) LIKE %s ESCAPE '\\') DESC, "
+    prefix = _like_escape(query) + '%'
+
+    if len(query) < MIN_TRIGRAM_LENGTH:
+        # Too short for trigrams: ranges on lower(username) / lower(email), each backed by an index
+        sql = (
+            select + f"{users} u " + join_profile
+            + "WHERE (lower(u.username) >= %s AND lower(u.username) < %s) "
+            + "OR (lower(u.email) >= %s AND lower(u.email) < %s) "
+            + "ORDER BY (lower(u.username) = %s) DESC, (lower(u.username) >= %s AND lower(u.username) < %s) DESC, "
+            + "lower(u.username) LIMIT %s"
+        )
+        upper = query + '\uffff'
+        params = [query, upper, query, upper, query, query, upper, limit]
+    elif _has_sqlite_index(connection):
+        phrase = '"' + query.replace('"', '""') + '"'
+        sql = (
+            select + f"{SQLITE_INDEX_TABLE} s JOIN {users} u ON u.id = s.rowid " + join_profile
+            + f"WHERE {SQLITE_INDEX_TABLE} MATCH %s "
+            + rank_exact_prefix + "s.rank LIMIT %s"
+        )
+        params = [phrase, query, prefix, limit]
+    elif connection.vendor == 'postgresql':
+        contains = '%' + _like_escape(query) + '%'
+        sql = (
+            select + f"{users} u " + join_profile
+            + "WHERE u.username ILIKE %s OR u.email ILIKE %s "
+            + rank_exact_prefix
+            + "GREATEST(similarity(u.username, %s), similarity(u.email, %s)) DESC, u.id LIMIT %s"
+        )
+        params = [contains, contains, query, prefix, query, query, limit]
+    else:
+        rows = (
+            User.objects.filter(username__icontains=query) | User.objects.filter(email__icontains=query)
+        ).order_by('username').values_list('id', 'username', 'email', 'profile__bio', 'profile__follower_count')[:limit]
+        return [_as_result(row) for row in rows]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [_as_result(row) for row in cursor.fetchall()]
+
+
+def _as_result(row):
+    user_id, username, email, bio, follower_count = row
+    return {
+        'id': user_id,
+        'username': username,
+        'email': email,
+        'bio': bio or '',
+        'follower_count': follower_count or 0,
+    }
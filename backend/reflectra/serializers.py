@@ -5,6 +5,7 @@
 
 from rest_framework import serializers
 from .models import AccountabilityPosts, UserProfile, MoodLog, Message
+from .sleep import parse_sleep_hours
 
 # -------------------------------
 # User Profile Serializer
@@ -31,10 +32,32 @@ class AccountabilityPostSerializer(serializers.ModelSerializer):
 # Mood Log Serializer
 # -------------------------------
 class MoodLogSerializer(serializers.ModelSerializer):
+    # Hours as a number (7.5) or legacy text ("7h30m", "7:30", "great"); parsed into sleep_hours
+    sleep = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+
     class Meta:
         model = MoodLog
-        fields = ['id', 'user', 'mood', 'stress', 'sleep', 'notes', 'timestamp']
-        read_only_fields = ['user', 'timestamp']
+        fields = ['id', 'user', 'mood', 'stress', 'sleep', 'sleep_hours', 'notes', 'timestamp']
+        read_only_fields = ['user', 'sleep_hours', 'timestamp']
+
+    def validate(self, attrs):
+        if 'sleep' in attrs:
+            try:
+                attrs['sleep_hours'] = parse_sleep_hours(attrs['sleep'])
+            except ValueError:
+                raise serializers.ValidationError(
+                    {'sleep': 'Enter hours slept (e.g. 7.5, 7h30m or 7:30, at most 24) or a short description.'}
+                )
+        return attrs
+
+
+class MoodLogImportSerializer(MoodLogSerializer):
+    """Bulk import rows: same fields, but a historical timestamp may be supplied."""
+    timestamp = serializers.DateTimeField(required=False)
+
+    class Meta(MoodLogSerializer.Meta):
+        fields = ['mood', 'stress', 'sleep', 'notes', 'timestamp']
+        read_only_fields = []
 
 
 # -------------------------------
@@ -43,6 +66,7 @@ class MoodLogSerializer(serializers.ModelSerializer):
 class MessageSerializer(serializers.ModelSerializer):
     sender_username = serializers.CharField(source='sender.username', read_only=True)
     receiver_username = serializers.CharField(source='receiver.username', read_only=True)
+    is_read = serializers.SerializerMethodField()
 
     class Meta:
         model = Message
@@ -53,4 +77,10 @@ class MessageSerializer(serializers.ModelSerializer):
             'content',
             'timestamp',
             'is_read',
-        ]
\ No newline at end of file
+        ]
+        read_only_fields = ['timestamp']
+
+    def get_is_read(self, obj):
+        # Derived from the receiver's read watermark (see Conversation.read_watermarks)
+        watermarks = self.context.get('read_watermarks', {})
+        return obj.id <= watermarks.get(obj.receiver_id, 0)
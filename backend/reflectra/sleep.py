@@ -0,0 +1,43 @@
+# ===========================================
+# File: reflectra/sleep.py
+# Description: Parses sleep entries ("7.5", "7h30m", "7:30", "450 min") into hours
+# ===========================================
+
+import re
+
+MAX_HOURS = 24
+
+_HOURS = re.compile(r'^(\d+(?:\.\d+)?)\s*(?:h|hr|hrs|hour|hours)?$')
+_HOURS_MINUTES = re.compile(r'^(\d+)\s*(?:h|hr|hrs|hours?|:)\s*(\d{1,2})\s*(?:m|min|mins|minutes?)?$')
+_MINUTES = re.compile(r'^(\d+)\s*(?:m|min|mins|minutes?)$')
+
+
+def parse_sleep_hours(value):
+    """
+    Hours of sleep in `value`, or None when it is empty or a description with
+    no duration in it ("great", "poor"). Raises ValueError for something that
+    looks like a duration but is malformed or outside 0–24 hours.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        hours = float(value)
+    else:
+        text = str(value).strip().lower()
+        if not any(char.isdigit() for char in text):
+            return None
+        if match := _HOURS.match(text):
+            hours = float(match.group(1))
+        elif match := _HOURS_MINUTES.match(text):
+            minutes = int(match.group(2))
+            if minutes >= 60:
+                raise ValueError(value)
+            hours = int(match.group(1)) + minutes / 60
+        elif match := _MINUTES.match(text):
+            hours = int(match.group(1)) / 60
+        else:
+            raise ValueError(value)
+
+    if not 0 <= hours <= MAX_HOURS:
+        raise ValueError(value)
+    return round(hours, 2)
@@ -0,0 +1,114 @@
+# ===========================================
+# File: reflectra/streaks.py
+# Description: Mood logging streaks and weekly goals — O(1) upkeep per new log, grouped rebuilds
+# ===========================================
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import LoggingStreak, MoodLog
+from .mood_rollups import log_day
+
+ONE_DAY = timedelta(days=1)
+
+# Accepted range for LoggingStreak.weekly_goal (days per week)
+MIN_WEEKLY_GOAL = 1
+MAX_WEEKLY_GOAL = 7
+
+
+def week_of(day):
+    """Monday of the week containing `day`."""
+    return day - timedelta(days=day.weekday())
+
+
+def advance(streak, day):
+    """
+    Fold a log made on `day` into `streak` using only its last log day.
+    Returns False when nothing changed: a second log on the same day, or a
+    backdated one (bulk imports rebuild instead).
+    """
+    last = streak.last_log_day
+    if last is not None and day <= last:
+        return False
+
+    streak.current_streak = streak.current_streak + 1 if last is not None and day - last == ONE_DAY else 1
+    streak.longest_streak = max(streak.longest_streak, streak.current_streak)
+    streak.last_log_day = day
+
+    week = week_of(day)
+    if streak.week_start == week:
+        streak.days_this_week += 1
+    else:
+        streak.week_start, streak.days_this_week = week, 1
+    return True
+
+
+# -------------------------------
+# New log → advance the streak
+# -------------------------------
+def record_log(log):
+    day = log_day(log.timestamp)
+    with transaction.atomic():
+        streak, _ = LoggingStreak.objects.select_for_update().get_or_create(user_id=log.user_id)
+        if advance(streak, day):
+            streak.save()
+
+
+# -------------------------------
+# Rebuild from raw logs (imports, repair)
+# -------------------------------
+def rebuild_streaks(user_ids=None, batch_size=2000):
+    """
+    Recompute streak state from each user's distinct log days, for the given
+    users or everyone. Weekly goals are kept. Returns the number of rows written.
+    """
+    logs = MoodLog.objects.all()
+    streaks = LoggingStreak.objects.all()
+    if user_ids is not None:
+        logs = logs.filter(user_id__in=user_ids)
+        streaks = streaks.filter(user_id__in=user_ids)
+
+    goals = dict(streaks.values_list('user_id', 'weekly_goal'))
+    days = (
+        logs.annotate(day=TruncDate('timestamp'))
+        .values_list('user_id', 'day')
+        .distinct()
+        .order_by('user_id', 'day')
+    )
+
+    rebuilt = {}
+    for user_id, day in days.iterator(chunk_size=batch_size):
+        streak = rebuilt.get(user_id)
+        if streak is None:
+            streak = rebuilt[user_id] = LoggingStreak(user_id=user_id)
+            if user_id in goals:
+                streak.weekly_goal = goals[user_id]
+        advance(streak, day)
+    for user_id, goal in goals.items():
+        rebuilt.setdefault(user_id, LoggingStreak(user_id=user_id, weekly_goal=goal))
+
+    with transaction.atomic():
+        streaks.delete()
+        LoggingStreak.objects.bulk_create(rebuilt.values(), batch_size=batch_size)
+    return len(rebuilt)
+
+
+# -------------------------------
+# Read (no history scan)
+# -------------------------------
+def summarize(streak, today=None):
+    """What the Dashboard shows, as of `today`; a streak lapses once a whole day passes without a log."""
+    today = today or timezone.localdate()
+    last = streak.last_log_day
+    alive = last is not None and today - last <= ONE_DAY
+    days_this_week = streak.days_this_week if streak.week_start == week_of(today) else 0
+    return {
+        'current_streak': streak.current_streak if alive else 0,
+        'longest_streak': streak.longest_streak,
+        'last_log_day': last,
+        'weekly_goal': streak.weekly_goal,
+        'days_this_week': days_this_week,
+        'goal_met': days_this_week >= streak.weekly_goal,
+    }
@@ -0,0 +1,230 @@
+# ===========================================
+# File: reflectra/suggestions.py
+# Description: Friends-of-friends follow suggestions — batch build over a CSR follow graph
+#              plus incremental maintenance when a follow edge changes
+# ===========================================
+
+import heapq
+from array import array
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Follow, FollowSuggestion
+
+# Suggestions stored per user
+TOP_N = 50
+
+# Rows per INSERT when writing suggestions
+BATCH_SIZE = 2000
+
+# Incremental updates touch at most this many users per edge change (e.g. a celebrity's
+# followers); anything beyond is picked up by the next `build_follow_suggestions` run.
+INCREMENTAL_FAN_LIMIT = 1000
+
+
+# -------------------------------
+# Compact follow graph (CSR)
+# -------------------------------
+class FollowGraph:
+    """
+    Directed follow graph in compressed sparse row form: the followees of the
+    node at dense index i are targets[offsets[i]:offsets[i + 1]].
+    User ids are mapped to dense indices through `user_ids` / `index_of`.
+    """
+
+    def __init__(self, edges):
+        """`edges` is an iterable of (follower_id, following_id) sorted by follower_id."""
+        self.user_ids = array('q')
+        self.index_of = {}
+        follower_index, following_ids = array('q'), array('q')
+
+        def node(user_id):
+            index = self.index_of.get(user_id)
+            if index is None:
+                index = self.index_of[user_id] = len(self.user_ids)
+                self.user_ids.append(user_id)
+            return index
+
+        for follower_id, following_id in edges:
+            follower_index.append(node(follower_id))
+            following_ids.append(following_id)
+
+        # Edges arrive grouped by follower, so each row is one contiguous run of targets
+        self.offsets = array('q', [0]) * (len(self.user_ids) + 1)
+        for index in follower_index:
+            self.offsets[index + 1] += 1
+        for i in range(len(self.user_ids)):
+            self.offsets[i + 1] += self.offsets[i]
+        self.targets = array('q', (node(user_id) for user_id in following_ids))
+
+    @classmethod
+    def from_database(cls):
+        edges = Follow.objects.order_by('follower_id').values_list('follower_id', 'following_id')
+        return cls(edges.iterator(chunk_size=10000))
+
+    def followees(self, index):
+        if index + 1 >= len(self.offsets):
+            return self.targets[0:0]
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def candidates_for(self, index, top_n=TOP_N):
+        """Top (candidate_index, mutual_count) pairs for the node at `index`."""
+        direct = set(self.followees(index))
+        scores = Counter()
+        for followee in direct:
+            for candidate in self.followees(followee):
+                if candidate != index and candidate not in direct:
+                    scores[candidate] += 1
+        # Ties go to the lower user id, the same order incremental trimming keeps
+        return heapq.nlargest(top_n, scores.items(), key=lambda item: (item[1], -self.user_ids[item[0]]))
+
+
+# -------------------------------
+# Batch build
+# -------------------------------
+def rebuild_suggestions(top_n=TOP_N):
+    """Recompute every user's suggestions from scratch. Returns the number of rows written."""
+    graph = FollowGraph.from_database()
+    written = 0
+
+    with transaction.atomic():
+        FollowSuggestion.objects.all().delete()
+        batch = []
+        for index, user_id in enumerate(graph.user_ids):
+            for candidate, score in graph.candidates_for(index, top_n):
+                batch.append(FollowSuggestion(user_id=user_id, candidate_id=graph.user_ids[candidate], score=score))
+            if len(batch) >= BATCH_SIZE:
+                FollowSuggestion.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        FollowSuggestion.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+# -------------------------------
+# Incremental maintenance
+# -------------------------------
+def _trim(user_ids, top_n=None):
+    """
+    Drop each user's rows beyond the top_n (default TOP_N) best by score, then candidate id,
+    the order the batch build keeps: one DELETE over a ranked subquery, however many users.
+    """
+    top_n = TOP_N if top_n is None else top_n
+    ranked = (
+        FollowSuggestion.objects.filter(user_id__in=user_ids)
+        .annotate(rank=Window(RowNumber(), partition_by='user_id', order_by=[F('score').desc(), 'candidate_id']))
+        .filter(rank__gt=top_n)
+        .values('pk')
+    )
+    FollowSuggestion.objects.filter(pk__in=ranked).delete()
+
+
+def _mutual_counts(shared, shared_id, other_ids):
+    """
+    Exact scores for new (user, candidate) rows: how many of user's followees follow candidate.
+    A new row may be a candidate that was trimmed earlier, so `delta` alone would undercount it.
+    """
+    if shared == 'user_id':
+        # user → followee → candidate, for one user and many candidates
+        mutuals = Follow.objects.filter(following_id__in=other_ids, follower__followers_set__follower_id=shared_id)
+        return dict(mutuals.values('following_id').annotate(n=Count('id')).values_list('following_id', 'n'))
+    # user → followee → candidate, for many users and one candidate
+    mutuals = Follow.objects.filter(follower_id__in=other_ids, following__following_set__following_id=shared_id)
+    return dict(mutuals.values('follower_id').annotate(n=Count('id')).values_list('follower_id', 'n'))
+
+
+def _bump(pairs, delta):
+    """
+    Shift the score of each (user_id, candidate_id) pair by delta, creating or dropping rows as needed.
+    Pairs are grouped by whichever side they share (one follower's many candidates, or many
+    followers gaining one candidate), so an edge costs a few queries, not a few per pair.
+    Users who gained rows are then trimmed back to their top TOP_N in one statement.
+    """
+    if not pairs:
+        return
+    by_user, by_candidate = {}, {}
+    for user_id, candidate_id in pairs:
+        by_user.setdefault(user_id, set()).add(candidate_id)
+        by_candidate.setdefault(candidate_id, set()).add(user_id)
+
+    if len(by_candidate) < len(by_user):
+        shared, other, groups = 'candidate_id', 'user_id', by_candidate
+    else:
+        shared, other, groups = 'user_id', 'candidate_id', by_user
+
+    grown = set()
+    for shared_id, other_ids in groups.items():
+        existing = FollowSuggestion.objects.filter(**{shared: shared_id, f'{other}__in': other_ids})
+        if delta > 0:
+            found = set(existing.values_list(other, flat=True))
+            existing.update(score=F('score') + delta)
+            new_ids = other_ids - found
+            if not new_ids:
+                continue
+            scores = _mutual_counts(shared, shared_id, new_ids)
+            FollowSuggestion.objects.bulk_create(
+                [
+                    FollowSuggestion(**{shared: shared_id, other: other_id}, score=scores.get(other_id, delta))
+                    for other_id in new_ids
+                ],
+                ignore_conflicts=True,
+            )
+            grown.update(new_ids if other == 'user_id' else [shared_id])
+        else:
+            existing.filter(score__lte=-delta).delete()
+            existing.update(score=F('score') + delta)
+    if grown:
+        _trim(grown)
+
+
+def _edge_changed(follower_id, following_id, delta):
+    """
+    Adding follower → following creates the paths follower → following → X
+    and Y → follower → following, so those (user, candidate) scores move by delta.
+    """
+    already_followed = set(Follow.objects.filter(follower_id=follower_id).values_list('following_id', flat=True))
+    their_followees = Follow.objects.filter(follower_id=following_id).exclude(following_id=follower_id)
+    _bump([
+        (follower_id, candidate_id)
+        for candidate_id in their_followees.values_list('following_id', flat=True)[:INCREMENTAL_FAN_LIMIT]
+        if candidate_id not in already_followed
+    ], delta)
+
+    our_followers = (
+        Follow.objects.filter(following_id=follower_id)
+        .exclude(follower_id=following_id)
+        .exclude(follower__following_set__following_id=following_id)
+    )
+    _bump([
+        (user_id, following_id)
+        for user_id in our_followers.values_list('follower_id', flat=True)[:INCREMENTAL_FAN_LIMIT]
+    ], delta)
+
+
+@receiver(post_save, sender=Follow)
+def suggest_on_follow(sender, instance, created, **kwargs):
+    if not created:
+        return
+    FollowSuggestion.objects.filter(user_id=instance.follower_id, candidate_id=instance.following_id).delete()
+    _edge_changed(instance.follower_id, instance.following_id, 1)
+
+
+@receiver(post_delete, sender=Follow)
+def suggest_on_unfollow(sender, instance, **kwargs):
+    follower_id, following_id = instance.follower_id, instance.following_id
+    _edge_changed(follower_id, following_id, -1)
+
+    # The account just unfollowed becomes a candidate again if other followees follow it
+    mutuals = Follow.objects.filter(
+        follower__followers_set__follower_id=follower_id, following_id=following_id
+    ).count()
+    if mutuals:
+        FollowSuggestion.objects.update_or_create(
+            user_id=follower_id, candidate_id=following_id, defaults={'score': mutuals}
+        )
+        _trim([follower_id])
@@ -0,0 +1,306 @@
+# ===========================================
+# File: reflectra/synthetic.py
+# Description: Seeded synthetic dataset generator — users, power-law follow graph, posts,
+#              mood histories and message threads, inserted with batched bulk_create
+# ===========================================
+
+import random
+from array import array
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections, router, transaction
+from django.utils import timezone
+from .models import (
+    MOOD_CHOICES, AccountabilityPosts, Conversation, Follow, FollowSuggestion, LoggingStreak, Message,
+    MoodDailyRollup, MoodLog, SyntheticAccount, TimelineEntry, UserProfile, conversation_key,
+    participant_pair,
+)
+from . import autocomplete, follow_counts, mood_rollups, search, streaks, suggestions
+
+_WORDS = (
+    'today', 'week', 'walk', 'sleep', 'focus', 'friends', 'journal', 'coffee', 'gym', 'study',
+    'deadline', 'breathing', 'music', 'family', 'rest', 'goal', 'progress', 'meditation', 'run', 'reading',
+)
+_OPENERS = (
+    'Trying to', 'Finally managed to', 'Planning to', 'Struggled to', 'Going to', 'Proud that I could',
+)
+
+
+class DatasetGenerator:
+    """
+    Builds a reproducible dataset: the same seed and options always produce the
+    same users, edges, posts, logs and messages (row ids depend on the database).
+
+    Distributions:
+      - follows per user: exponential around `follows_mean`; whom they follow is
+        Zipf-distributed over a seeded popularity ranking (exponent `popularity_exponent`),
+        so a few accounts collect most followers
+      - posts per user: exponential around `posts_mean`, spread over `history_days`
+      - mood logs: each of the last `mood_days` days is logged with probability `mood_log_rate`
+      - conversations per user: exponential around `conversations_mean`, partners mostly
+        drawn from followees; each thread has about `messages_mean` messages
+    """
+
+    def __init__(self, users=1000, seed=42, prefix='synth', password='synthetic-pass',
+                 follows_mean=20, popularity_exponent=1.1, posts_mean=5, history_days=90,
+                 mood_days=60, mood_log_rate=0.6, conversations_mean=2, messages_mean=12,
+                 end=None, batch_size=5000, log=None):
+        self.users = users
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        self.password = password
+        self.follows_mean = follows_mean
+        self.popularity_exponent = popularity_exponent
+        self.posts_mean = posts_mean
+        self.history_days = history_days
+        self.mood_days = mood_days
+        self.mood_log_rate = mood_log_rate
+        self.conversations_mean = conversations_mean
+        self.messages_mean = messages_mean
+        self.end = end or timezone.now()
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.counts = {}
+
+    # -------------------------------
+    # Helpers
+    # -------------------------------
+    def _count(self, mean, cap=None):
+        if mean <= 0:
+            return 0
+        value = int(self.rng.expovariate(1 / mean))
+        return min(value, cap) if cap is not None else value
+
+    def _moment(self):
+        """A seeded point in time within the history window."""
+        return self.end - timedelta(seconds=self.rng.randrange(self.history_days * 86400))
+
+    def _sentence(self):
+        return f"{self.rng.choice(_OPENERS)} {' '.join(self.rng.sample(_WORDS, self.rng.randint(3, 7)))}."
+
+    def _insert(self, model, rows, label, keep=False):
+        """bulk_create an iterable of unsaved rows in batches; returns the saved objects when `keep`."""
+        saved, batch, total = [], [], 0
+
+        def flush():
+            nonlocal total
+            created = model.objects.bulk_create(batch)
+            total += len(created)
+            if keep:
+                saved.extend(created)
+            batch.clear()
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                flush()
+        flush()
+        self.counts[label] = total
+        self.log(f"{label}: {total}")
+        return saved
+
+    # -------------------------------
+    # Steps
+    # -------------------------------
+    def create_users(self):
+        # One hash, with a seeded salt, shared by every account: hashing per user would dominate the run
+        salt = ''.join(self.rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(22))
+        password_hash = make_password(self.password, salt=salt)
+        users = self._insert(User, (
+            User(
+                username=f"{self.prefix}{i:07d}",
+                email=f"{self.prefix}{i:07d}@example.com",
+                password=password_hash,
+                date_joined=self._moment(),
+            )
+            for i in range(self.users)
+        ), 'users', keep=True)
+        # The marker, not the username, is what delete_dataset goes by
+        SyntheticAccount.objects.bulk_create(
+            (SyntheticAccount(user_id=user.id, prefix=self.prefix) for user in users), batch_size=self.batch_size
+        )
+        moods = [value for value, _ in MOOD_CHOICES]
+        self._insert(UserProfile, (
+            UserProfile(user_id=user.id, bio=self._sentence(), mood_preference=self.rng.choice(moods))
+            for user in users
+        ), 'profiles')
+        return array('q', (user.id for user in users))
+
+    def create_follows(self, user_ids):
+        """Returns followers per account (author id → array of follower ids) for the timeline fan-out."""
+        popularity = list(user_ids)
+        self.rng.shuffle(popularity)
+        cum_weights = list(accumulate(1 / (rank + 1) ** self.popularity_exponent for rank in range(len(popularity))))
+        followers = {}
+
+        def edges():
+            for follower_id in user_ids:
+                wanted = self._count(self.follows_mean, cap=len(user_ids) - 1)
+                targets = set()
+                for _ in range(10):  # a heavy Zipf tail can keep re-drawing the same few accounts
+                    if len(targets) >= wanted:
+                        break
+                    for following_id in self.rng.choices(popularity, cum_weights=cum_weights, k=wanted - len(targets)):
+                        if following_id != follower_id:
+                            targets.add(following_id)
+                for following_id in sorted(targets):
+                    followers.setdefault(following_id, array('q')).append(follower_id)
+                    yield Follow(follower_id=follower_id, following_id=following_id, created_at=self._moment())
+
+        self._insert(Follow, edges(), 'follows')
+        return followers
+
+    def create_posts(self, user_ids, followers):
+        posts = self._insert(AccountabilityPosts, (
+            AccountabilityPosts(user_id=user_id, content_text=self._sentence(), timestamp=self._moment())
+            for user_id in user_ids
+            for _ in range(self._count(self.posts_mean))
+        ), 'posts', keep=True)
+        # Fan-out on write, as timeline.fan_out_post would have done for each post
+        self._insert(TimelineEntry, (
+            TimelineEntry(owner_id=owner_id, post_id=post.id, author_id=post.user_id, timestamp=post.timestamp)
+            for post in posts
+            for owner_id in [post.user_id, *followers.get(post.user_id, ())]
+        ), 'timeline entries')
+
+    def create_mood_logs(self, user_ids):
+        today = timezone.localdate(self.end)
+
+        def logs():
+            for user_id in user_ids:
+                baseline = self.rng.uniform(3.5, 7.5)
+                for days_ago in range(self.mood_days, -1, -1):
+                    if self.rng.random() >= self.mood_log_rate:
+                        continue
+                    day = today - timedelta(days=days_ago)
+                    sleep_hours = round(min(11.0, max(3.0, self.rng.gauss(7, 1.2))) * 4) / 4
+                    mood = min(10, max(1, round(self.rng.gauss(baseline + (sleep_hours - 7) * 0.6, 1.5))))
+                    stress = min(10, max(1, round(self.rng.gauss(11 - mood, 1.5))))
+                    moment = datetime.combine(day, time(self.rng.randrange(7, 23), self.rng.randrange(60)))
+                    yield MoodLog(
+                        user_id=user_id, mood=mood, stress=stress,
+                        sleep=f"{sleep_hours:g}", sleep_hours=sleep_hours,
+                        notes=self._sentence() if self.rng.random() < 0.3 else None,
+                        timestamp=timezone.make_aware(moment),
+                    )
+
+        self._insert(MoodLog, logs(), 'mood logs')
+
+    def create_messages(self, user_ids, followers):
+        following = {}
+        for author_id, follower_ids in followers.items():
+            for follower_id in follower_ids:
+                following.setdefault(follower_id, []).append(author_id)
+
+        pairs = set()
+        for user_id in user_ids:
+            for _ in range(self._count(self.conversations_mean, cap=len(user_ids) - 1)):
+                pool = following.get(user_id) if self.rng.random() < 0.8 else None
+                partner_id = self.rng.choice(pool or user_ids)
+                if partner_id != user_id:
+                    pairs.add(participant_pair(user_id, partner_id))
+
+        threads = []
+        for low_id, high_id in sorted(pairs):
+            count = max(1, self._count(self.messages_mean))
+            moment = self._moment()
+            thread = []
+            for _ in range(count):
+                sender_id, receiver_id = (low_id, high_id) if self.rng.random() < 0.5 else (high_id, low_id)
+                moment = min(self.end, moment + timedelta(minutes=self.rng.randrange(1, 600)))
+                thread.append(Message(
+                    sender_id=sender_id, receiver_id=receiver_id, content=self._sentence(), timestamp=moment,
+                    conversation_key=conversation_key(sender_id, receiver_id),
+                ))
+            threads.append(((low_id, high_id), thread))
+
+        # Threads are inserted in order, so ids rise with time inside each thread (read watermarks rely on it)
+        self._insert(Message, (message for _, thread in threads for message in thread), 'messages', keep=True)
+        self._insert(Conversation, (self._summarize(pair, thread) for pair, thread in threads), 'conversations')
+
+    @staticmethod
+    def _summarize(pair, thread):
+        """Each side has read up to the last message it sent; anything newer from the partner is unread."""
+        low_id, high_id = pair
+        last = thread[-1]
+        summary = Conversation(
+            user_low_id=low_id, user_high_id=high_id, last_message_id=last.id,
+            last_message_preview=last.content[:120], last_activity=last.timestamp,
+        )
+        for message in thread:
+            if message.sender_id == low_id:
+                summary.last_read_low, summary.unread_high = message.id, summary.unread_high + 1
+                summary.unread_low = 0
+            else:
+                summary.last_read_high, summary.unread_low = message.id, summary.unread_low + 1
+                summary.unread_high = 0
+        return summary
+
+    def rebuild_derived(self, user_ids):
+        """Bulk inserts send no signals, so recompute what the receivers would have maintained."""
+        follow_counts.reconcile_counts()
+        mood_rollups.rebuild_rollups(user_ids=list(user_ids))
+        streaks.rebuild_streaks(user_ids=list(user_ids))
+        suggestions.rebuild_suggestions()
+        search.create_search_index(connections[router.db_for_write(User)])
+        transaction.on_commit(autocomplete.index.invalidate)
+
+    # -------------------------------
+    # Entry point
+    # -------------------------------
+    def run(self):
+        with transaction.atomic():
+            user_ids = self.create_users()
+            followers = self.create_follows(user_ids)
+            self.create_posts(user_ids, followers)
+            self.create_mood_logs(user_ids)
+            self.create_messages(user_ids, followers)
+            self.log("rebuilding counters, rollups, streaks, suggestions and search index")
+            self.rebuild_derived(user_ids)
+        return self.counts
+
+
+def delete_dataset(prefix):
+    """
+    Remove the accounts the generator created with `prefix` (recorded in
+    SyntheticAccount, so real users are never matched) and everything they own.
+    The large tables go first, with plain DELETEs: the ORM cascade would run the
+    per-row Follow and Message receivers for each of possibly millions of rows.
+    The users themselves are then deleted through the ORM, whose cascade covers
+    any other table pointing at them (admin log, tokens). Shared derived data
+    (counters, suggestions, search index) is rebuilt afterwards. Returns rows deleted.
+    """
+    owned_by = f"IN (SELECT user_id FROM {SyntheticAccount._meta.db_table} WHERE prefix = %s)"
+    # Children before parents; Conversation before the Message it points at
+    tables = [
+        (TimelineEntry, ('owner', 'author')),
+        (FollowSuggestion, ('user', 'candidate')),
+        (Conversation, ('user_low', 'user_high')),
+        (Message, ('sender', 'receiver')),
+        (Follow, ('follower', 'following')),
+        (MoodDailyRollup, ('user',)),
+        (LoggingStreak, ('user',)),
+        (MoodLog, ('user',)),
+        (AccountabilityPosts, ('user',)),
+        (UserProfile, ('user',)),
+    ]
+
+    connection = connections[router.db_for_write(User)]
+    deleted = 0
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            for model, fields in tables:
+                where = ' OR '.join(f"{model._meta.get_field(field).column} {owned_by}" for field in fields)
+                cursor.execute(f"DELETE FROM {model._meta.db_table} WHERE {where}", [prefix] * len(fields))
+                deleted += cursor.rowcount
+        deleted += User.objects.using(connection.alias).filter(synthetic_account__prefix=prefix).delete()[0]
+
+        follow_counts.reconcile_counts()
+        suggestions.rebuild_suggestions()
+        search.drop_search_index(connection)
+        search.create_search_index(connection)
+        transaction.on_commit(autocomplete.index.invalidate, using=connection.alias)
+    return deleted
@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra import accounts, passwords
+from reflectra.accounts import create_account
+from reflectra.models import UserProfile
+from reflectra.search import search_users
+
+User = get_user_model()
+
+
+class ProvisioningTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice, _ = create_account("alice", "alice@example.com", "Pass1234!")
+
+    def test_register_writes_user_and_profile_once(self):
+        with self.assertNumQueries(7):  # 2 duplicate checks, savepoint, user + search index + profile inserts, release
+            resp = self.client.post(
+                reverse("register_user"), {"username": "carol", "email": "carol@example.com", "password": "StrongPass!9"}, format="json"
+            )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(UserProfile.objects.filter(user__username="carol").count(), 1)
+
+    def test_saving_user_leaves_profile_alone(self):
+        self.alice.refresh_from_db()
+        self.alice.profile  # loaded, as it would be for an authenticated request
+        self.alice.first_name = "Alice"
+        with self.assertNumQueries(1):
+            self.alice.save(update_fields=["first_name"])
+
+    def test_update_user_info_writes_only_changes(self):
+        self.client.force_authenticate(user=User.objects.select_related("profile").get(pk=self.alice.pk))
+        payload = {"name": "alice", "email": "alice@example.com", "bio": "", "mood": ""}
+        with self.assertNumQueries(2):  # savepoint + release; nothing changed
+            resp = self.client.put(reverse("update_user_info"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_bulk_provisioning(self):
+        staff = User.objects.create_user(username="staff", email="staff@example.com", password="Pass1234!", is_staff=True)
+        self.client.force_authenticate(user=staff)
+        rows = [{"username": f"partner{i}", "email": f"p{i}@org.example", "bio": "onboarded"} for i in range(50)]
+
+        resp = self.client.post(reverse("provision_users"), {"users": rows}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["created"], 50)
+        self.assertEqual(UserProfile.objects.filter(bio="onboarded").count(), 50)
+        self.assertFalse(User.objects.get(username="partner7").has_usable_password())
+        self.assertEqual([row["username"] for row in search_users("partner7")], ["partner7"])
+
+    def test_bulk_provisioning_is_all_or_nothing_and_staff_only(self):
+        rows = [{"username": "new1", "email": "n1@org.example"}, {"username": "alice", "email": "x@org.example"}]
+        self.client.force_authenticate(user=self.alice)
+        self.assertEqual(self.client.post(reverse("provision_users"), rows, format="json").status_code, status.HTTP_403_FORBIDDEN)
+
+        self.alice.is_staff = True
+        self.alice.save()
+        resp = self.client.post(reverse("provision_users"), rows, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["row"] for error in resp.data["details"]], [1])
+        self.assertFalse(User.objects.filter(username="new1").exists())
+
+    def test_bulk_provisioning_caps_rows_with_passwords(self):
+        self.alice.is_staff = True
+        self.alice.save()
+        self.client.force_authenticate(user=self.alice)
+        rows = [
+            {"username": f"pw{i}", "email": f"pw{i}@org.example", "password": "Secret123!"}
+            for i in range(accounts.MAX_BULK_PASSWORDS + 1)
+        ]
+        with mock.patch.object(passwords, "make_passwords") as make_passwords:
+            resp = self.client.post(reverse("provision_users"), rows, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        make_passwords.assert_not_called()
+        self.assertFalse(User.objects.filter(username="pw0").exists())
+
+    def test_bulk_provisioning_reports_invalid_rows(self):
+        self.alice.is_staff = True
+        self.alice.save()
+        self.client.force_authenticate(user=self.alice)
+        rows = [
+            {"username": "ok", "email": "ok@org.example"},
+            {"username": ["x"], "email": 1},
+            {"username": "ALICE@example.com", "email": "Alice@Example.com"},
+            {"username": "has space", "email": "s@org.example"},
+            {"username": "u" * 151, "email": "long@org.example"},
+            {"username": "bademail", "email": "not-an-email"},
+            {"username": "badmood", "email": "m@org.example", "mood_preference": "ecstatic"},
+            {"username": "badpass", "email": "pw@org.example", "password": 1234},
+        ]
+        resp = self.client.post(reverse("provision_users"), rows, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["row"] for error in resp.data["details"]], [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(resp.data["details"][1]["error"], "username or email already registered")
+        self.assertFalse(User.objects.filter(username="ok").exists())
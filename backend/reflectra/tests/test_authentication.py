@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from reflectra.authentication import user_cache
+from reflectra.models import Follow, UserProfile
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        UserProfile.objects.get_or_create(user=self.alice)
+        token = RefreshToken.for_user(self.alice).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_warm_user_costs_no_queries(self):
+        with self.assertNumQueries(1):  # user and profile in one join
+            self.assertEqual(self.client.get(reverse("get_me")).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse("get_me"))
+        self.assertEqual(resp.data["username"], "alice")
+
+    def test_profile_and_follow_writes_invalidate(self):
+        self.client.get(reverse("userinfo"))
+        profile = UserProfile.objects.get(user=self.alice)
+        profile.bio = "hello"
+        profile.save()
+        self.assertEqual(self.client.get(reverse("userinfo")).data["bio"], "hello")
+
+        bob = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234!")
+        Follow.objects.create(follower=bob, following=self.alice)
+        self.assertEqual(self.client.get(reverse("get_me")).data["follower_count"], 1)
+
+    def test_deactivated_user_is_rejected_despite_cache(self):
+        self.client.get(reverse("get_me"))
+        self.alice.is_active = False
+        self.alice.save()
+        resp = self.client.get(reverse("get_me"))
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,70 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.autocomplete import UsernameIndex, index
+
+User = get_user_model()
+
+
+class UsernameIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = UsernameIndex()
+        self.index.load([(1, "alice"), (2, "Alfred"), (3, "bob"), (4, "alina")])
+
+    def test_prefix_is_case_insensitive_and_sorted(self):
+        self.assertEqual(self.index.complete("AL"), [(2, "Alfred"), (1, "alice"), (4, "alina")])
+        self.assertEqual(self.index.complete("ali", limit=1), [(1, "alice")])
+        self.assertEqual(self.index.complete("z"), [])
+
+    def test_incremental_rename_and_remove(self):
+        self.index.add(3, "albert")  # bob renamed
+        self.assertEqual(self.index.complete("b"), [])
+        self.assertEqual(self.index.complete("alb"), [(3, "albert")])
+
+        self.index.remove(1)
+        self.assertEqual(self.index.complete("ali"), [(4, "alina")])
+
+    def test_concurrent_lookups_on_a_stale_index_reload_once(self):
+        self.index.invalidate()
+        users = mock.MagicMock()
+
+        def slow_rows(**kwargs):
+            time.sleep(0.05)  # long enough for every thread to find the index stale
+            return iter([(1, "alice"), (4, "alina")])
+
+        users.objects.filter.return_value.values_list.return_value.iterator.side_effect = slow_rows
+        results = []
+        with mock.patch("reflectra.autocomplete.User", users):
+            threads = [threading.Thread(target=lambda: results.append(self.index.complete("ali"))) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(users.objects.filter.call_count, 1)
+        self.assertEqual(results, [[(1, "alice"), (4, "alina")]] * 8)
+
+
+class AutocompleteEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+        index.load(User.objects.values_list("id", "username"))
+        self.addCleanup(index.invalidate)
+
+    def test_new_users_are_searchable_without_a_query(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username="alicia", email="alicia@example.com", password="Pass1234!")
+
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse("autocomplete_users"), {"q": "ali"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["username"] for row in resp.data], ["alice", "alicia"])
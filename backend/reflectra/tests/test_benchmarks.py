@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from reflectra import benchmarks
+from reflectra.benchmarks import Budget, Endpoint
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_every_route_is_benchmarked_or_skipped(self):
+        self.assertEqual(benchmarks.uncovered_routes(), [])
+        self.assertEqual(
+            benchmarks.uncovered_routes([Endpoint("inbox", "get", Budget(1, 1, 1))])[:2],
+            ["autocomplete_users", "delete_post"],
+        )
+
+    def test_budget_reports_each_exceeded_limit(self):
+        budget = Budget(queries=2, ms=50, size=100)
+        self.assertEqual(budget.violations({"queries": 2, "ms_median": 10.0, "bytes": 100}), [])
+        self.assertEqual(
+            budget.violations({"queries": 5, "ms_median": 80.0, "bytes": 100}),
+            ["queries 5 > 2", "ms 80.0 > 50"],
+        )
+
+    def test_suite_runs_every_endpoint_within_query_budget(self):
+        report = benchmarks.run_suite(sizes=[30], repeat=1, generator_options={"follows_mean": 5, "mood_days": 10})
+        results = report["sizes"][0]["endpoints"]
+        self.assertEqual(len(results), len(benchmarks.ENDPOINTS))
+        for result in results:
+            with self.subTest(endpoint=result["endpoint"]):
+                self.assertLess(result["status"], 400)
+                self.assertLessEqual(result["queries"], result["budget"]["queries"])
+        self.assertEqual(report["skipped"], benchmarks.SKIPPED)
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.models import Conversation, Message
+
+User = get_user_model()
+
+
+class ConversationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.bob = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234!")
+        self.carol = User.objects.create_user(username="carol", email="carol@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def test_one_conversation_per_pair_tracks_latest_message(self):
+        Message.objects.create(sender=self.alice, receiver=self.bob, content="hi bob")
+        latest = Message.objects.create(sender=self.bob, receiver=self.alice, content="hi alice")
+
+        conversation = Conversation.objects.get()
+        self.assertEqual(conversation.last_message, latest)
+        self.assertEqual(conversation.last_message_preview, "hi alice")
+        self.assertEqual(conversation.unread_for(self.alice.id), 1)
+        self.assertEqual(conversation.unread_for(self.bob.id), 1)
+
+    def test_messages_carry_canonical_conversation_key(self):
+        to_bob = Message.objects.create(sender=self.alice, receiver=self.bob, content="a")
+        to_alice = Message.objects.create(sender=self.bob, receiver=self.alice, content="b")
+        self.assertEqual(to_bob.conversation_key, to_alice.conversation_key)
+
+    def test_history_excludes_each_users_notes_to_self(self):
+        Message.objects.create(sender=self.alice, receiver=self.alice, content="note to self")
+        Message.objects.create(sender=self.bob, receiver=self.bob, content="bob's note")
+        Message.objects.create(sender=self.alice, receiver=self.bob, content="hello")
+
+        resp = self.client.get(reverse("get_conversation", args=["bob"]))
+        self.assertEqual([m["content"] for m in resp.data], ["hello"])
+
+    def test_inbox_orders_by_activity_with_unread_counts(self):
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="from bob")
+        Message.objects.create(sender=self.carol, receiver=self.alice, content="from carol 1")
+        Message.objects.create(sender=self.carol, receiver=self.alice, content="from carol 2")
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(reverse("inbox"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["content"] for item in resp.data], ["from carol 2", "from bob"])
+        self.assertEqual([item["unread_count"] for item in resp.data], [2, 1])
+
+    def test_reading_a_thread_clears_its_unread_count(self):
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="ping")
+
+        self.client.get(reverse("get_conversation", args=["bob"]))
+
+        resp = self.client.get(reverse("inbox"))
+        self.assertEqual(resp.data[0]["unread_count"], 0)
+        self.assertTrue(resp.data[0]["is_read"])
+
+    def test_marking_read_is_one_update_and_later_messages_stay_unread(self):
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="one")
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="two")
+
+        self.client.get(reverse("get_conversation", args=["bob"]))
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="three")
+
+        # bob's view: alice has read "one" and "two" but not "three"
+        self.client.force_authenticate(user=self.bob)
+        resp = self.client.get(reverse("get_conversation", args=["alice"]))
+        self.assertEqual([m["is_read"] for m in resp.data], [True, True, False])
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TransactionTestCase
+
+from config.cache import cache_config
+from config.database import BASE_DIR, database_config, sqlite_tuning
+from reflectra.accounts import create_account
+from reflectra.benchmarks import ConcurrencyRun
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    def test_sqlite_paths_are_anchored_at_the_backend(self):
+        self.assertEqual(database_config("sqlite:///db.sqlite3")["NAME"], BASE_DIR / "db.sqlite3")
+        self.assertEqual(database_config("sqlite:////var/lib/reflectra.sqlite3")["NAME"], "/var/lib/reflectra.sqlite3")
+
+    def test_persistent_connections_with_health_checks(self):
+        config = database_config("postgresql://u:p@db:5432/reflectra", conn_max_age=60, health_checks=True)
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual((config["CONN_MAX_AGE"], config["CONN_HEALTH_CHECKS"]), (60, True))
+        self.assertNotIn("pool", config.get("OPTIONS", {}))
+
+    def test_postgres_pool_replaces_persistent_connections(self):
+        config = database_config("postgresql://u:p@db:5432/reflectra", conn_max_age=60, pool_max_size=8, pool_min_size=2)
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertEqual(config["OPTIONS"]["pool"], {"min_size": 2, "max_size": 8, "timeout": 10})
+
+    def test_cache_urls(self):
+        self.assertEqual(cache_config()["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertEqual(cache_config("redis://cache:6379/1")["LOCATION"], "redis://cache:6379/1")
+        self.assertEqual(cache_config("memcached://cache:11211")["LOCATION"], "cache:11211")
+        self.assertEqual(cache_config("file:///var/tmp/reflectra")["LOCATION"], "/var/tmp/reflectra")
+        with self.assertRaises(ValueError):
+            cache_config("mongodb://cache")
+
+    def test_pool_is_ignored_for_sqlite(self):
+        self.assertNotIn("OPTIONS", database_config("sqlite:///db.sqlite3", pool_max_size=8))
+
+    def test_sqlite_tuning_applies_only_to_sqlite(self):
+        tuned = database_config("sqlite:///db.sqlite3", sqlite_options=sqlite_tuning(busy_timeout=7))
+        self.assertEqual((tuned["OPTIONS"]["timeout"], tuned["OPTIONS"]["transaction_mode"]), (7, "IMMEDIATE"))
+        self.assertNotIn("OPTIONS", database_config("postgresql://u:p@db/reflectra", sqlite_options=sqlite_tuning()))
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    def test_pragmas_are_set_on_each_new_connection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {
+                **connection.settings_dict,
+                "NAME": os.path.join(directory, "tuned.sqlite3"),
+                "OPTIONS": sqlite_tuning(mmap_size=1 << 20, cache_size_kb=2048),
+            }
+            tuned = DatabaseWrapper(settings_dict, alias="tuned")
+            try:
+                with tuned.cursor() as cursor:
+                    pragmas = {
+                        name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                        for name in ("journal_mode", "synchronous", "mmap_size", "cache_size")
+                    }
+            finally:
+                tuned.close()
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "mmap_size": 1 << 20, "cache_size": -2048})
+
+
+class ConcurrencyRunTests(TransactionTestCase):
+    # One worker: the in-memory test database locks whole tables between threads,
+    # which is why the command runs on a file
+    def test_worker_sends_reads_and_writes_through_wsgi(self):
+        actor, _ = create_account("worker", "worker@example.com", "Pass1234!")
+        result = ConcurrencyRun([actor], duration=0.5, write_share=0.5).run()
+        self.assertEqual(result["workers"], 1)
+        self.assertGreater(result["read"]["requests"] + result["write"]["requests"], 0)
+        self.assertEqual(result["errors"], {})
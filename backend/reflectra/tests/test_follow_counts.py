@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from reflectra.accounts import create_account
+from reflectra.models import Follow, UserProfile
+
+User = get_user_model()
+
+
+class FollowCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice, _ = create_account("alice", "alice@example.com", "Pass1234!")
+        self.bob, _ = create_account("bob", "bob@example.com", "Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def counts(self, user):
+        profile = UserProfile.objects.get(user=user)
+        return profile.follower_count, profile.following_count
+
+    def test_follow_and_unfollow_adjust_both_sides(self):
+        self.client.post(reverse("follow_user", args=[self.bob.id]), {}, format="json")
+        self.assertEqual(self.counts(self.alice), (0, 1))
+        self.assertEqual(self.counts(self.bob), (1, 0))
+
+        # Repeat follow is a no-op
+        self.client.post(reverse("follow_user", args=[self.bob.id]), {}, format="json")
+        self.assertEqual(self.counts(self.bob), (1, 0))
+
+        self.client.delete(reverse("unfollow_user", args=[self.bob.id]))
+        self.assertEqual(self.counts(self.alice), (0, 0))
+        self.assertEqual(self.counts(self.bob), (0, 0))
+
+    def test_counts_exposed_on_userinfo_and_me(self):
+        Follow.objects.create(follower=self.bob, following=self.alice)
+        self.alice.refresh_from_db()
+
+        info = self.client.get(reverse("userinfo")).data
+        me = self.client.get(reverse("get_me")).data
+        self.assertEqual((info["follower_count"], info["following_count"]), (1, 0))
+        self.assertEqual((me["follower_count"], me["following_count"]), (1, 0))
+
+    def test_reconcile_command_repairs_drift(self):
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        UserProfile.objects.filter(user=self.bob).update(follower_count=7)
+
+        out = StringIO()
+        call_command("reconcile_follow_counts", stdout=out)
+        self.assertIn("fixed 1 profile(s)", out.getvalue())
+        self.assertEqual(self.counts(self.bob), (1, 0))
+
+    def test_users_created_without_a_profile_get_one_with_true_counts(self):
+        # createsuperuser, the admin and scripts create users outside accounts.py
+        carol = User.objects.create_user(username="carol", email="carol@example.com", password="Pass1234!")
+        dave = User.objects.create_user(username="dave", email="dave@example.com", password="Pass1234!")
+        Follow.objects.create(follower=self.alice, following=carol)
+        Follow.objects.create(follower=carol, following=self.bob)
+        self.assertEqual(self.counts(carol), (1, 1))
+
+        Follow.objects.create(follower=self.alice, following=dave)
+        UserProfile.objects.filter(user=dave).delete()
+        out = StringIO()
+        call_command("reconcile_follow_counts", stdout=out)
+        self.assertIn("created 1 missing profile(s)", out.getvalue())
+        self.assertEqual(self.counts(dave), (1, 0))
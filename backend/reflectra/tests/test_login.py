@@ -0,0 +1,71 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra import passwords
+from reflectra.throttling import LoginAccountThrottle, LoginIPThrottle
+
+User = get_user_model()
+
+
+class LoginPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("login_user")
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+
+    def login(self, username, password="Pass1234!"):
+        return self.client.post(self.url, {"username": username, "password": password}, format="json")
+
+    def test_email_login_resolves_user_in_one_query(self):
+        with self.assertNumQueries(1):
+            resp = self.login("alice@example.com")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["user"], "alice")
+
+    def test_unknown_and_inactive_users_are_rejected(self):
+        self.assertEqual(self.login("nobody").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.alice.is_active = False
+        self.alice.save()
+        self.assertEqual(self.login("alice").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_per_account_window_counts_failures_only(self):
+        with mock.patch.object(LoginAccountThrottle, "rate", "2/min", create=True):
+            self.assertEqual(self.login("alice").status_code, status.HTTP_200_OK)
+            self.assertEqual(self.login("alice").status_code, status.HTTP_200_OK)
+            self.login("alice", "wrong")
+            self.login("ALICE", "wrong")
+            resp = self.login("alice")
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_per_ip_window_rejects_before_hashing(self):
+        with mock.patch.object(LoginIPThrottle, "rate", "2/min", create=True):
+            self.login("alice")
+            self.login("alice")
+            with mock.patch.object(passwords, "check_password") as check:
+                resp = self.login("alice")
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        check.assert_not_called()
+
+    def test_per_ip_window_ignores_spoofed_forwarded_for(self):
+        with mock.patch.object(LoginIPThrottle, "rate", "2/min", create=True):
+            for address in ("203.0.113.1", "203.0.113.2", "203.0.113.3"):
+                resp = self.client.post(
+                    self.url, {"username": "alice", "password": "Pass1234!"}, format="json", HTTP_X_FORWARDED_FOR=address
+                )
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_full_hashing_budget_answers_503(self):
+        with mock.patch.object(passwords, "_slots", threading.BoundedSemaphore(1)):
+            passwords._slots.acquire()
+            resp = self.login("alice")
+            passwords._slots.release()
+        self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(resp["Retry-After"], "1")
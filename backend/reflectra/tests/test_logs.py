@@ -0,0 +1,68 @@
+import io
+import json
+import logging
+import queue
+
+from django.test import SimpleTestCase
+
+from reflectra.logs import JsonFormatter, NonBlockingQueueHandler, SamplingFilter, queue_handler
+
+
+def make_record(msg="user logged in", args=(), level=logging.INFO, **extra):
+    record = logging.LogRecord("reflectra.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class JsonFormatterTests(SimpleTestCase):
+    def test_renders_message_and_extra_fields(self):
+        line = json.loads(JsonFormatter().format(make_record("%d result(s)", (3,), event="user.search", user_id=7)))
+        self.assertEqual(line["message"], "3 result(s)")
+        self.assertEqual(line["level"], "INFO")
+        self.assertEqual((line["event"], line["user_id"]), ("user.search", 7))
+        self.assertNotIn("args", line)
+
+
+class SamplingFilterTests(SimpleTestCase):
+    def test_drops_only_sampled_records(self):
+        never = SamplingFilter(rate=0)
+        self.assertFalse(never.filter(make_record(sampled=True)))
+        self.assertTrue(never.filter(make_record()))
+        self.assertTrue(SamplingFilter(rate=1).filter(make_record(sampled=True)))
+
+
+class NonBlockingQueueHandlerTests(SimpleTestCase):
+    def test_full_queue_drops_and_reports_count(self):
+        log_queue = queue.Queue(maxsize=1)
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))  # would block a stock handler with a bounded put
+        self.assertEqual(handler.dropped, 1)
+
+        log_queue.get_nowait()
+        handler.handle(make_record("third"))
+        self.assertEqual(log_queue.get_nowait().dropped, 1)
+
+    def test_formatting_is_left_to_the_listener(self):
+        log_queue = queue.Queue()
+        NonBlockingQueueHandler(log_queue).handle(make_record("%s logged in", ("alice",)))
+        queued = log_queue.get_nowait()
+        self.assertEqual((queued.msg, queued.args), ("%s logged in", ("alice",)))
+
+    def test_listener_writes_json_lines(self):
+        stream = io.StringIO()
+        handler = queue_handler(maxsize=10, stream=stream)
+        try:
+            logger = logging.getLogger("reflectra.tests.logs")
+            logger.addHandler(handler)
+            logger.propagate = False
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("failed", extra={"event": "test.failed"})
+        finally:
+            logger.removeHandler(handler)
+            handler.listener.stop()
+        line = json.loads(stream.getvalue())
+        self.assertEqual((line["event"], line["level"]), ("test.failed", "ERROR"))
+        self.assertIn("ValueError: boom", line["exc"])
@@ -4,7 +4,7 @@ from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from reflectra.models import Message
+from reflectra.models import Conversation, Message
 
 User = get_user_model()
 
@@ -29,11 +29,11 @@ class MessagesViewsTests(TestCase):
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_get_conversation_marks_read_and_returns_history(self):
-        # Create messages (some unread for alice)
+        # Create messages (B1/B2 are unread for alice until she opens the thread)
         Message.objects.create(sender=self.alice, receiver=self.bob, content="A1")
-        Message.objects.create(sender=self.bob, receiver=self.alice, content="B1", is_read=False)
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="B1")
         Message.objects.create(sender=self.alice, receiver=self.bob, content="A2")
-        Message.objects.create(sender=self.bob, receiver=self.alice, content="B2", is_read=False)
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="B2")
 
         url = reverse("get_conversation", args=["bob"])
         resp = self.client.get(url)
@@ -42,8 +42,10 @@ class MessagesViewsTests(TestCase):
         texts = [m["content"] for m in resp.data]
         self.assertEqual(texts, ["A1", "B1", "A2", "B2"])
 
-        # After fetch, messages from bob -> alice should be marked read
-        self.assertFalse(Message.objects.filter(sender=self.bob, receiver=self.alice, is_read=False).exists())
+        # After fetch, messages from bob -> alice should be marked read (via alice's watermark)
+        from_bob = [m for m in resp.data if m["sender_username"] == "bob"]
+        self.assertTrue(all(m["is_read"] for m in from_bob))
+        self.assertEqual(Conversation.objects.get().unread_for(self.alice.id), 0)
 
     def test_inbox_returns_latest_per_partner(self):
         # Conversations with bob and a second user carol
@@ -0,0 +1,54 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.test.client import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from reflectra.accounts import create_account
+from reflectra.middleware import QueryRecorder
+
+User = get_user_model()
+
+
+class RequestTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user, _ = create_account("timer", "timer@example.com", "Pass1234!")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @override_settings(REFLECTRA_REQUEST_TIMING_SAMPLE_RATE=1.0, REFLECTRA_REQUEST_TIMING_SLOWEST=2)
+    def test_sampled_request_gets_header_and_log_line(self):
+        with self.assertLogs("reflectra.requests", level="INFO") as logs:
+            resp = self.client.get(reverse("get_following"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertRegex(resp["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+        record = logs.records[0]
+        self.assertEqual(record.event, "request.timing")
+        self.assertEqual(record.route, "api/following/")
+        self.assertEqual(record.status, 200)
+        self.assertGreaterEqual(record.queries, 1)
+        self.assertLessEqual(len(record.slowest), 2)
+        self.assertIn("reflectra_follow", record.slowest[0]["sql"])
+
+    @override_settings(REFLECTRA_REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_request_is_untouched(self):
+        resp = self.client.get(reverse("get_following"))
+        self.assertNotIn("Server-Timing", resp)
+
+    @override_settings(REFLECTRA_REQUEST_TIMING_SAMPLE_RATE=1.0)
+    def test_async_view_is_timed(self):
+        with self.assertLogs("reflectra.requests", level="INFO"):
+            resp = asyncio.run(AsyncClient().get(reverse("event_stream")))
+        self.assertEqual(resp.status_code, 401)
+        self.assertIn('desc="0 queries"', resp["Server-Timing"])
+
+    def test_recorder_keeps_the_slowest_statements(self):
+        recorder = QueryRecorder(keep=2)
+        connection = type("Connection", (), {"alias": "default"})()
+        for sql in ("SELECT 1", "SELECT 2", "SELECT 3"):
+            recorder(lambda *args: None, sql, (), False, {"connection": connection})
+        self.assertEqual(recorder.count, 3)
+        self.assertEqual(len(recorder.slowest_statements()), 2)
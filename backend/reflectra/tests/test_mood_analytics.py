@@ -0,0 +1,85 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.models import MoodDailyRollup, MoodLog
+from reflectra.mood_rollups import rebuild_rollups, sleep_stats
+from reflectra.sleep import parse_sleep_hours
+
+User = get_user_model()
+
+
+class MoodAnalyticsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def log_at(self, when, mood, stress):
+        log = MoodLog.objects.create(user=self.alice, mood=mood, stress=stress)
+        MoodLog.objects.filter(pk=log.pk).update(timestamp=when)
+
+    def test_create_updates_daily_rollup(self):
+        url = reverse("moodlogs")
+        self.client.post(url, {"mood": 4, "stress": 7}, format="json")
+        self.client.post(url, {"mood": 8, "stress": 3}, format="json")
+
+        rollup = MoodDailyRollup.objects.get(user=self.alice)
+        self.assertEqual(
+            (rollup.count, rollup.mood_sum, rollup.mood_min, rollup.mood_max, rollup.stress_min, rollup.stress_max),
+            (2, 12, 4, 8, 3, 7),
+        )
+
+        resp = self.client.get(reverse("mood_analytics"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        [today] = resp.data["series"]
+        self.assertEqual((today["count"], today["mood_avg"], today["stress_avg"]), (2, 6.0, 5.0))
+
+    def test_monthly_buckets_from_rebuilt_rollups(self):
+        self.log_at(datetime(2025, 1, 5, 9, tzinfo=dt_timezone.utc), mood=2, stress=9)
+        self.log_at(datetime(2025, 1, 20, 9, tzinfo=dt_timezone.utc), mood=6, stress=5)
+        self.log_at(datetime(2025, 2, 1, 9, tzinfo=dt_timezone.utc), mood=9, stress=1)
+        self.assertEqual(rebuild_rollups(user_ids=[self.alice.id]), 3)
+
+        resp = self.client.get(reverse("mood_analytics"), {"bucket": "month", "start": "2025-01-01", "end": "2025-02-28"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        series = [(str(row["period"]), row["count"], row["mood_avg"], row["mood_min"], row["mood_max"]) for row in resp.data["series"]]
+        self.assertEqual(series, [("2025-01-01", 2, 4.0, 2, 6), ("2025-02-01", 1, 9.0, 9, 9)])
+
+    def test_rejects_bad_range(self):
+        resp = self.client.get(reverse("mood_analytics"), {"start": "2025-03-01", "end": "2025-01-01"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.get(reverse("mood_analytics"), {"bucket": "year"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_malformed_dates(self):
+        for params in ({"end": "garbage"}, {"start": "garbage"}, {"end": "2025-02-30"}):
+            resp = self.client.get(reverse("mood_analytics"), params)
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_sleep_stats_are_database_aggregates(self):
+        for mood, stress, sleep in ((3, 8, "5h"), (6, 5, "7"), (9, 2, "9:00"), (5, 5, "okay")):
+            MoodLog.objects.create(user=self.alice, mood=mood, stress=stress, sleep=sleep, sleep_hours=parse_sleep_hours(sleep))
+
+        resp = self.client.get(reverse("mood_analytics"))
+        sleep = resp.data["sleep"]
+        self.assertEqual((sleep["count"], sleep["sleep_avg"], sleep["sleep_min"], sleep["sleep_max"]), (3, 7.0, 5.0, 9.0))
+        self.assertEqual(sleep["sleep_mood_corr"], 1.0)
+        self.assertEqual(sleep["sleep_stress_corr"], -1.0)
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_sleep_stats_range_follows_local_days(self):
+        for hour, sleep in ((4, 5.0), (5, 6.0), (23, 7.0)):  # UTC; New York is UTC-5 in January
+            log = MoodLog.objects.create(user=self.alice, mood=5, stress=5, sleep=f"{sleep:g}", sleep_hours=sleep)
+            MoodLog.objects.filter(pk=log.pk).update(timestamp=datetime(2025, 1, 10, hour, tzinfo=dt_timezone.utc))
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = sleep_stats(self.alice, date(2025, 1, 10), date(2025, 1, 10))
+        self.assertEqual((stats["count"], stats["sleep_min"], stats["sleep_max"]), (2, 6.0, 7.0))
+        self.assertNotIn("django_datetime_cast_date", queries[0]["sql"])
@@ -0,0 +1,73 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.models import MoodDailyRollup, MoodLog
+
+User = get_user_model()
+
+
+class MoodImportExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def upload(self, body, content_type="application/x-ndjson"):
+        return self.client.generic("POST", reverse("mood_import"), body.encode(), content_type=content_type)
+
+    def test_ndjson_import_keeps_timestamps_and_rebuilds_rollups(self):
+        lines = [
+            {"mood": 4, "stress": 6, "timestamp": "2024-03-01T09:00:00Z"},
+            {"mood": 8, "stress": 2, "sleep": "7h", "timestamp": "2024-03-01T21:00:00Z"},
+            {"mood": 5, "stress": 5, "notes": "no timestamp"},
+        ]
+        resp = self.upload("\n".join(json.dumps(line) for line in lines) + "\n")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["created"], 3)
+
+        self.assertEqual(MoodLog.objects.filter(user=self.alice, timestamp__year=2024).count(), 2)
+        march_first = MoodDailyRollup.objects.get(user=self.alice, day="2024-03-01")
+        self.assertEqual((march_first.count, march_first.mood_sum), (2, 12))
+
+    def test_csv_import(self):
+        body = "mood,stress,sleep,notes,timestamp\n3,7,,rough day,2024-01-02T08:00:00Z\n6,4,8h,,\n"
+        resp = self.upload(body, content_type="text/csv")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["created"], 2)
+        self.assertEqual(MoodLog.objects.get(notes="rough day").timestamp.year, 2024)
+
+    def test_invalid_line_rolls_back_whole_import(self):
+        body = '{"mood": 4, "stress": 6}\nnot json\n{"stress": 2}\n'
+        resp = self.upload(body)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["line"] for error in resp.data["details"]], [2, 3])
+        self.assertFalse(MoodLog.objects.exists())
+
+    def test_export_streams_ndjson_and_csv(self):
+        MoodLog.objects.create(user=self.alice, mood=4, stress=6, notes="first")
+        MoodLog.objects.create(user=self.alice, mood=7, stress=3)
+
+        resp = self.client.get(reverse("mood_export"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        rows = [json.loads(line) for line in b"".join(resp.streaming_content).decode().splitlines()]
+        self.assertEqual([row["mood"] for row in rows], [4, 7])
+
+        resp = self.client.get(reverse("mood_export"), {"type": "csv"})
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "mood,stress,sleep,notes,timestamp")
+        self.assertEqual(len(lines), 3)
+
+    def test_export_round_trips_through_import(self):
+        MoodLog.objects.create(user=self.alice, mood=4, stress=6, notes="first")
+        exported = b"".join(self.client.get(reverse("mood_export")).streaming_content).decode()
+
+        bob = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=bob)
+        self.assertEqual(self.upload(exported).data["created"], 1)
+        self.assertEqual(MoodLog.objects.get(user=bob).notes, "first")
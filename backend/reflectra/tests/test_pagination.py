@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.models import AccountabilityPosts, Follow, Message, MoodLog
+
+User = get_user_model()
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.bob = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def walk(self, url, limit):
+        """Follow X-Next-Cursor until exhausted, returning every page."""
+        pages, cursor = [], None
+        while True:
+            params = {"limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            resp = self.client.get(url, params)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            pages.append(resp.data)
+            cursor = resp.get("X-Next-Cursor")
+            if not cursor:
+                return pages
+
+    def test_feed_pages_cover_every_post_once(self):
+        for i in range(5):
+            AccountabilityPosts.objects.create(user=self.alice, content_text=f"post {i}")
+
+        pages = self.walk(reverse("list_create_posts"), limit=2)
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+        texts = [row["content_text"] for page in pages for row in page]
+        self.assertEqual(texts, [f"post {i}" for i in reversed(range(5))])
+
+    def test_moodlogs_paginate_newest_first(self):
+        for mood in range(1, 4):
+            MoodLog.objects.create(user=self.alice, mood=mood, stress=5)
+
+        pages = self.walk(reverse("moodlogs"), limit=2)
+        moods = [row["mood"] for page in pages for row in page]
+        self.assertEqual(moods, [3, 2, 1])
+
+    def test_conversation_pages_back_in_time(self):
+        for i in range(3):
+            Message.objects.create(sender=self.alice, receiver=self.bob, content=f"m{i}")
+
+        pages = self.walk(reverse("get_conversation", args=["bob"]), limit=2)
+        self.assertEqual([[m["content"] for m in page] for page in pages], [["m1", "m2"], ["m0"]])
+
+    def test_followers_and_users_are_paginated(self):
+        carol = User.objects.create_user(username="carol", email="carol@example.com", password="Pass1234!")
+        Follow.objects.create(follower=self.bob, following=self.alice)
+        Follow.objects.create(follower=carol, following=self.alice)
+
+        followers = self.walk(reverse("get_followers", args=[self.alice.id]), limit=1)
+        self.assertEqual([row["username"] for page in followers for row in page], ["carol", "bob"])
+
+        users = self.walk(reverse("find_users"), limit=2)
+        self.assertEqual([row["username"] for page in users for row in page], ["alice", "bob", "carol"])
+
+    def test_invalid_cursor_is_rejected(self):
+        resp = self.client.get(reverse("list_create_posts"), {"cursor": "not-a-cursor"})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
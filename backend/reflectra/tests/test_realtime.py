@@ -0,0 +1,84 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.client import AsyncClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reflectra.models import AccountabilityPosts, Follow, Message
+from reflectra.realtime import InMemoryBroadcastBackend, format_sse
+
+User = get_user_model()
+
+
+class InMemoryBroadcastBackendTests(SimpleTestCase):
+    def test_publish_reaches_only_that_users_subscribers(self):
+        backend = InMemoryBroadcastBackend()
+
+        async def scenario():
+            alice_sub = backend.subscribe(1)
+            bob_sub = backend.subscribe(2)
+            backend.publish(1, {"type": "message.created", "data": {"id": 7}})
+            event = await alice_sub.get(timeout=1)
+            self.assertEqual(event["data"], {"id": 7})
+            self.assertTrue(bob_sub.queue.empty())
+            backend.unsubscribe(alice_sub)
+            backend.unsubscribe(bob_sub)
+
+        asyncio.run(scenario())
+
+    def test_format_sse(self):
+        frame = format_sse({"type": "post.created", "data": {"id": 1}})
+        self.assertEqual(frame, 'event: post.created\ndata: {"id": 1}\n\n')
+
+
+class PublishOnWriteTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.bob = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234!")
+        self.backend = InMemoryBroadcastBackend()
+        patcher = mock.patch("reflectra.realtime.get_backend", return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def published_to(self):
+        return {call.args[0]: call.args[1]["type"] for call in self.publish.call_args_list}
+
+    def test_message_is_pushed_to_both_participants_after_commit(self):
+        with mock.patch.object(self.backend, "publish") as self.publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                Message.objects.create(sender=self.alice, receiver=self.bob, content="hi")
+        self.assertEqual(self.published_to(), {self.alice.id: "message.created", self.bob.id: "message.created"})
+
+    def test_post_is_pushed_to_author_and_followers(self):
+        Follow.objects.create(follower=self.bob, following=self.alice)
+        with mock.patch.object(self.backend, "publish") as self.publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                AccountabilityPosts.objects.create(user=self.alice, content_text="hello")
+        self.assertEqual(self.published_to(), {self.alice.id: "post.created", self.bob.id: "post.created"})
+
+
+class EventStreamViewTests(TransactionTestCase):
+    def test_rejects_missing_token(self):
+        resp = asyncio.run(AsyncClient().get(reverse("event_stream")))
+        self.assertEqual(resp.status_code, 401)
+
+    def test_streams_events_for_token_user(self):
+        alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        token = str(AccessToken.for_user(alice))
+        backend = InMemoryBroadcastBackend()
+
+        async def scenario():
+            resp = await AsyncClient().get(reverse("event_stream"), {"token": token})
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp["Content-Type"], "text/event-stream")
+            stream = resp.streaming_content
+            self.assertEqual(await anext(stream), b": connected\n\n")
+            backend.publish(alice.id, {"type": "post.created", "data": {"id": 3}})
+            self.assertEqual(await anext(stream), b'event: post.created\ndata: {"id": 3}\n\n')
+            await stream.aclose()
+
+        with mock.patch("reflectra.views_realtime.get_backend", return_value=backend):
+            asyncio.run(scenario())
@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from config.cache import cache_config
+from reflectra import conversations, routers
+from reflectra.accounts import create_account
+from reflectra.models import AccountabilityPosts, Conversation, Message
+from reflectra.routers import ReplicaRouter
+
+User = get_user_model()
+
+
+@override_settings(REFLECTRA_READ_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_use_the_replica_only_inside_marked_views(self):
+        self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+        token = routers._replica.set("replica")
+        try:
+            self.assertEqual(self.router.db_for_read(User), "replica")
+        finally:
+            routers._replica.reset(token)
+
+    def test_a_write_sends_the_rest_of_the_request_to_the_primary(self):
+        writes_token, replica_token = routers._writes.set([False]), routers._replica.set("replica")
+        try:
+            self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+        finally:
+            routers._replica.reset(replica_token)
+            routers._writes.reset(writes_token)
+
+    def test_instances_loaded_from_a_replica_are_written_to_the_primary(self):
+        user = User(username="r")
+        user._state.db = "replica"
+        self.assertEqual(self.router.db_for_write(User, instance=user), DEFAULT_DB_ALIAS)
+
+    def test_replicas_need_a_shared_cache(self):
+        with override_settings(CACHES={"default": cache_config()}):
+            self.assertEqual([error.id for error in routers.check_sticky_cache()], ["reflectra.E001"])
+        with override_settings(CACHES={"default": cache_config("redis://cache:6379/0")}):
+            self.assertEqual(routers.check_sticky_cache(), [])
+        with override_settings(REFLECTRA_READ_REPLICAS=[]):
+            self.assertEqual(routers.check_sticky_cache(), [])
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """Primary = the test database, replica = a second SQLite file holding a snapshot of it."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Registered after the runner's database checks and setup; the file is refilled per test
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.replica_path = os.path.join(cls.directory.name, "replica.sqlite3")
+        connections.settings["replica"] = {**connections[DEFAULT_DB_ALIAS].settings_dict, "NAME": cls.replica_path}
+        cls.databases = {*cls.databases, "replica"}
+
+    @classmethod
+    def tearDownClass(cls):
+        connections["replica"].close()
+        del connections["replica"]
+        del connections.settings["replica"]
+        cls.databases = {DEFAULT_DB_ALIAS}
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.alice, _ = create_account("alice", "alice@example.com", "Pass1234!")
+        self.bob, _ = create_account("bob", "bob@example.com", "Pass1234!")
+        AccountabilityPosts.objects.create(user=self.alice, content_text="replicated")
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="replicated")
+        self.replicate()
+
+        # Written after the snapshot: the replica is "lagging" behind this one
+        AccountabilityPosts.objects.create(user=self.alice, content_text="not yet replicated")
+        self.settings_override = override_settings(REFLECTRA_READ_REPLICAS=["replica"])
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def replicate(self):
+        """Copy the primary into the replica file, as replication catching up would."""
+        connections["replica"].close()
+        connections[DEFAULT_DB_ALIAS].ensure_connection()
+        with sqlite3.connect(self.replica_path) as replica:
+            connections[DEFAULT_DB_ALIAS].connection.backup(replica)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def feed(self, client):
+        return [post["content_text"] for post in client.get(reverse("list_create_posts")).data]
+
+    def test_reads_come_from_the_replica(self):
+        self.assertEqual(self.feed(self.client_for(self.alice)), ["replicated"])
+
+    def test_writer_reads_their_own_writes_from_the_primary(self):
+        alice = self.client_for(self.alice)
+        resp = alice.post(reverse("list_create_posts"), {"content_text": "fresh"}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.feed(alice), ["fresh", "not yet replicated", "replicated"])
+        self.assertTrue(AccountabilityPosts.objects.using(DEFAULT_DB_ALIAS).filter(content_text="fresh").exists())
+        self.assertFalse(AccountabilityPosts.objects.using("replica").filter(content_text="fresh").exists())
+
+        # Stickiness is per user: bob has not written, so he still reads the replica
+        self.assertEqual(self.client_for(self.bob).get(reverse("inbox")).status_code, 200)
+        self.assertFalse(routers.is_sticky(self.bob.id))
+
+    @override_settings(REFLECTRA_REPLICA_STICKY_SECONDS=0)
+    def test_stickiness_expires(self):
+        alice = self.client_for(self.alice)
+        alice.post(reverse("list_create_posts"), {"content_text": "fresh"}, format="json")
+        self.assertEqual(self.feed(alice), ["replicated"])
+
+    def test_transactions_read_from_the_primary(self):
+        token = routers._replica.set("replica")
+        try:
+            with transaction.atomic():
+                self.assertEqual(AccountabilityPosts.objects.count(), 2)
+            self.assertEqual(AccountabilityPosts.objects.count(), 1)
+        finally:
+            routers._replica.reset(token)
+
+    def test_reading_a_thread_never_marks_unreplicated_messages_read(self):
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="not yet replicated")
+        resp = self.client_for(self.alice).get(reverse("get_conversation", args=["bob"]))
+        self.assertEqual([message["content"] for message in resp.data], ["replicated", "not yet replicated"])
+
+        # Even called where reads go to the lagging replica, the watermark comes from the primary
+        Message.objects.create(sender=self.bob, receiver=self.alice, content="newest")
+        token = routers._replica.set("replica")
+        try:
+            conversation = conversations.mark_read(self.alice.id, self.bob.id)
+        finally:
+            routers._replica.reset(token)
+        newest = Message.objects.using(DEFAULT_DB_ALIAS).latest("id")
+        self.assertEqual(conversation.read_watermarks()[self.alice.id], newest.id)
+        self.assertEqual(Conversation.objects.using(DEFAULT_DB_ALIAS).get().unread_for(self.alice.id), 0)
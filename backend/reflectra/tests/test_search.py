@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.search import search_users
+
+User = get_user_model()
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.sam = User.objects.create_user(username="sam", email="sam@example.com", password="Pass1234!")
+        self.samantha = User.objects.create_user(username="samantha", email="s.a@example.com", password="Pass1234!")
+        self.osama = User.objects.create_user(username="osama", email="o@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.sam)
+
+    def test_exact_then_prefix_then_substring(self):
+        names = [row["username"] for row in search_users("sam")]
+        self.assertEqual(names, ["sam", "samantha", "osama"])
+
+    def test_matches_email_and_caps_results(self):
+        self.assertEqual([row["username"] for row in search_users("o@ex")], ["osama"])
+        self.assertEqual(len(search_users("example", limit=2)), 2)
+
+    def test_short_queries_match_username_and_email_prefixes_in_any_case(self):
+        User.objects.create_user(username="Alice", email="alice@example.com", password="Pass1234!")
+        User.objects.create_user(username="zoe", email="Al.zoe@example.com", password="Pass1234!")
+        self.assertEqual([row["username"] for row in search_users("al")], ["Alice", "zoe"])
+        self.assertEqual([row["username"] for row in search_users("OS")], ["osama"])
+        self.assertEqual([row["username"] for row in search_users("s")], ["sam", "samantha"])
+
+    def test_index_follows_renames_and_deletes(self):
+        self.osama.username = "zed"
+        self.osama.save()
+        self.assertEqual([row["username"] for row in search_users("zed")], ["zed"])
+
+        self.osama.delete()
+        self.assertEqual(search_users("zed"), [])
+
+    def test_endpoint_is_a_single_query(self):
+        search_users("warm")  # first use per connection checks the index table exists
+        with self.assertNumQueries(1):
+            resp = self.client.get(reverse("find_users"), {"q": "sam"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        for key in ("id", "username", "email", "bio"):
+            self.assertIn(key, resp.data[0])
@@ -0,0 +1,70 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.models import LoggingStreak, MoodLog
+from reflectra.streaks import advance, rebuild_streaks, record_log, summarize
+
+User = get_user_model()
+
+
+class LoggingStreakTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def test_advance_counts_consecutive_days_and_resets_on_gap(self):
+        streak = LoggingStreak(user=self.alice)
+        for day in (date(2025, 3, 3), date(2025, 3, 4), date(2025, 3, 4), date(2025, 3, 5), date(2025, 3, 8)):
+            advance(streak, day)
+        self.assertEqual((streak.current_streak, streak.longest_streak), (1, 3))
+        self.assertEqual((streak.week_start, streak.days_this_week), (date(2025, 3, 3), 4))
+        self.assertFalse(advance(streak, date(2025, 3, 1)))
+
+    def test_new_log_updates_streak_without_scanning_history(self):
+        for day in range(1, 30):
+            MoodLog.objects.create(user=self.alice, mood=5, stress=5, timestamp=datetime(2025, 1, day, tzinfo=dt_timezone.utc))
+        rebuild_streaks([self.alice.id])
+
+        log = MoodLog.objects.create(user=self.alice, mood=5, stress=5, timestamp=datetime(2025, 1, 30, 12, tzinfo=dt_timezone.utc))
+        with self.assertNumQueries(4):  # savepoint, locked read, update, release
+            record_log(log)
+        self.assertEqual(LoggingStreak.objects.get(user=self.alice).current_streak, 30)
+
+    def test_create_through_api_starts_streak(self):
+        self.client.post(reverse("moodlogs"), {"mood": 5, "stress": 5}, format="json")
+        resp = self.client.get(reverse("mood_streak"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual((resp.data["current_streak"], resp.data["days_this_week"]), (1, 1))
+
+    def test_streak_lapses_on_read_after_a_missed_day(self):
+        streak = LoggingStreak(user=self.alice, current_streak=4, longest_streak=4, last_log_day=date(2025, 3, 5),
+                               week_start=date(2025, 3, 3), days_this_week=3)
+        self.assertEqual(summarize(streak, today=date(2025, 3, 6))["current_streak"], 4)
+        self.assertEqual(summarize(streak, today=date(2025, 3, 7))["current_streak"], 0)
+        self.assertEqual(summarize(streak, today=date(2025, 3, 10))["days_this_week"], 0)
+
+    def test_rebuild_keeps_goal(self):
+        LoggingStreak.objects.create(user=self.alice, weekly_goal=3, current_streak=99)
+        for day in (1, 2, 3, 10):
+            log = MoodLog.objects.create(user=self.alice, mood=5, stress=5)
+            MoodLog.objects.filter(pk=log.pk).update(timestamp=datetime(2025, 3, day, 12, tzinfo=dt_timezone.utc))
+
+        self.assertEqual(rebuild_streaks([self.alice.id]), 1)
+        streak = LoggingStreak.objects.get(user=self.alice)
+        self.assertEqual((streak.current_streak, streak.longest_streak, streak.weekly_goal), (1, 3, 3))
+        self.assertEqual(streak.last_log_day, date(2025, 3, 10))
+
+    def test_set_weekly_goal(self):
+        resp = self.client.patch(reverse("mood_streak"), {"weekly_goal": 3}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["weekly_goal"], 3)
+        for goal in (9, 3.7, True, "3.5", None, "²", "٣"):
+            resp = self.client.patch(reverse("mood_streak"), {"weekly_goal": goal}, format="json")
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST, goal)
+        self.assertEqual(LoggingStreak.objects.get(user=self.alice).weekly_goal, 3)
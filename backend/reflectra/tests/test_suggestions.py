@@ -0,0 +1,107 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from reflectra.models import Follow, FollowSuggestion
+from reflectra import suggestions
+from reflectra.suggestions import FollowGraph
+
+User = get_user_model()
+
+
+class FollowGraphTests(SimpleTestCase):
+    def test_scores_second_degree_by_mutual_count(self):
+        # 1 follows 2 and 3; both follow 4; 3 also follows 5 and 1
+        graph = FollowGraph([(1, 2), (1, 3), (2, 4), (3, 1), (3, 4), (3, 5)])
+        ranked = [(graph.user_ids[c], score) for c, score in graph.candidates_for(graph.index_of[1])]
+        self.assertEqual(ranked, [(4, 2), (5, 1)])
+
+
+class SuggestionMaintenanceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice, self.bob, self.carol, self.dave = (
+            User.objects.create_user(username=name, email=f"{name}@example.com", password="Pass1234!")
+            for name in ("alice", "bob", "carol", "dave")
+        )
+        self.client.force_authenticate(user=self.alice)
+
+    def suggested(self, user):
+        return dict(FollowSuggestion.objects.filter(user=user).values_list("candidate__username", "score"))
+
+    def test_incremental_updates_match_batch_build(self):
+        Follow.objects.create(follower=self.bob, following=self.dave)
+        Follow.objects.create(follower=self.carol, following=self.dave)
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        Follow.objects.create(follower=self.alice, following=self.carol)
+        self.assertEqual(self.suggested(self.alice), {"dave": 2})
+
+        Follow.objects.filter(follower=self.alice, following=self.carol).delete()
+        self.assertEqual(self.suggested(self.alice), {"dave": 1})
+
+        incremental = set(FollowSuggestion.objects.values_list("user_id", "candidate_id", "score"))
+        call_command("build_follow_suggestions", stdout=StringIO())
+        self.assertEqual(set(FollowSuggestion.objects.values_list("user_id", "candidate_id", "score")), incremental)
+
+    @mock.patch.object(suggestions, "TOP_N", 3)
+    def test_incremental_updates_keep_top_n_per_user(self):
+        others = [User.objects.create_user(username=f"u{i}", email=f"u{i}@example.com") for i in range(6)]
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        Follow.objects.create(follower=self.alice, following=self.carol)
+        for i, other in enumerate(others):
+            Follow.objects.create(follower=self.bob, following=other)
+            if i < 2:
+                Follow.objects.create(follower=self.carol, following=other)
+            self.assertLessEqual(FollowSuggestion.objects.filter(user=self.alice).count(), 3)
+        self.assertEqual(self.suggested(self.alice), {"u0": 2, "u1": 2, "u2": 1})
+
+        # Following many accounts at once: every one of them brings candidates along
+        for other in others:
+            Follow.objects.create(follower=other, following=self.dave)
+            Follow.objects.create(follower=self.dave, following=other)
+        Follow.objects.create(follower=self.carol, following=self.dave)
+        self.assertLessEqual(FollowSuggestion.objects.filter(user=self.alice).count(), 3)
+        self.assertLessEqual(max(
+            FollowSuggestion.objects.filter(user=user).count() for user in User.objects.all()
+        ), 3)
+
+    @mock.patch.object(suggestions, "TOP_N", 2)
+    def test_trimmed_candidates_come_back_with_rebuild_scores(self):
+        others = [User.objects.create_user(username=f"u{i}", email=f"u{i}@example.com") for i in range(4)]
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        for other in others:
+            Follow.objects.create(follower=self.bob, following=other)
+        self.assertEqual(self.suggested(self.alice), {"u0": 1, "u1": 1})
+
+        # u3 was trimmed away; carol follows it, then alice follows carol: its true score is 2, not 1
+        Follow.objects.create(follower=self.carol, following=others[3])
+        Follow.objects.create(follower=self.alice, following=self.carol)
+        self.assertEqual(self.suggested(self.alice), {"u3": 2, "u0": 1})
+
+        incremental = set(FollowSuggestion.objects.values_list("user_id", "candidate_id", "score"))
+        suggestions.rebuild_suggestions(top_n=2)
+        self.assertEqual(set(FollowSuggestion.objects.values_list("user_id", "candidate_id", "score")), incremental)
+
+    def test_following_a_suggestion_removes_it(self):
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        Follow.objects.create(follower=self.bob, following=self.dave)
+        self.assertIn("dave", self.suggested(self.alice))
+
+        self.client.post(reverse("follow_user", args=[self.dave.id]), {}, format="json")
+        self.assertNotIn("dave", self.suggested(self.alice))
+
+    def test_endpoint_serves_ranked_suggestions(self):
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        Follow.objects.create(follower=self.bob, following=self.carol)
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(reverse("get_suggestions"))
+        self.assertEqual(
+            [(row["username"], row["mutual_count"]) for row in resp.data["suggestions"]],
+            [("carol", 1)],
+        )
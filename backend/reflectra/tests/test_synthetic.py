@@ -0,0 +1,56 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from reflectra.models import AccountabilityPosts, Conversation, Follow, Message, MoodLog, TimelineEntry, UserProfile
+from reflectra.synthetic import DatasetGenerator, delete_dataset
+
+User = get_user_model()
+
+END = datetime(2025, 6, 1, tzinfo=dt_timezone.utc)
+
+
+class DatasetGeneratorTests(TestCase):
+    def generate(self, prefix, seed=7):
+        return DatasetGenerator(users=40, seed=seed, prefix=prefix, follows_mean=6, posts_mean=2,
+                                mood_days=10, conversations_mean=1, messages_mean=4, end=END).run()
+
+    def test_same_seed_same_dataset(self):
+        first = self.generate("a")
+        moods_a = list(MoodLog.objects.filter(user__username__startswith="a").order_by("id").values_list("mood", "timestamp"))
+        second = self.generate("b")
+        moods_b = list(MoodLog.objects.filter(user__username__startswith="b").order_by("id").values_list("mood", "timestamp"))
+        self.assertEqual(first, second)
+        self.assertEqual(moods_a, moods_b)
+        self.assertNotEqual(self.generate("c", seed=8), first)
+
+    def test_derived_data_matches_raw_rows(self):
+        counts = self.generate("s")
+        self.assertEqual(UserProfile.objects.count(), counts["users"])
+        self.assertEqual(sum(UserProfile.objects.values_list("follower_count", flat=True)), Follow.objects.count())
+        self.assertEqual(TimelineEntry.objects.count(), AccountabilityPosts.objects.count() + sum(
+            Follow.objects.filter(following_id=author_id).count()
+            for author_id in AccountabilityPosts.objects.values_list("user_id", flat=True)
+        ))
+        conversation = Conversation.objects.select_related("last_message").first()
+        self.assertEqual(conversation.last_message.timestamp, conversation.last_activity)
+
+    def test_delete_dataset_removes_only_generated_accounts(self):
+        keeper = User.objects.create_user(username="keeper", email="keeper@example.org", password="Pass1234!")
+        # Looks exactly like a generated account but was not created by the generator
+        lookalike = User.objects.create_user(username="s0000099", email="s0000099@example.com", password="Pass1234!")
+        self.generate("s")
+        LogEntry.objects.log_actions(User.objects.get(username="s0000001").pk, [keeper], ADDITION)
+        delete_dataset("s")
+        self.assertEqual(sorted(User.objects.values_list("username", flat=True)), ["keeper", "s0000099"])
+        self.assertFalse(Message.objects.exists())
+        self.assertFalse(LogEntry.objects.exists())
+        self.assertTrue(User.objects.filter(pk=keeper.pk).exists())
+        self.assertTrue(User.objects.filter(pk=lookalike.pk).exists())
+
+    def test_delete_dataset_ignores_unknown_or_partial_prefixes(self):
+        self.generate("synth")
+        self.assertEqual(delete_dataset("s"), 0)
+        self.assertEqual(User.objects.count(), 40)
@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from reflectra.models import AccountabilityPosts, Follow, TimelineEntry
+
+User = get_user_model()
+
+
+class TimelineTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.bob = User.objects.create_user(username="bob", email="bob@example.com", password="Pass1234!")
+        self.carol = User.objects.create_user(username="carol", email="carol@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def test_new_post_fans_out_to_author_and_followers(self):
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        post = AccountabilityPosts.objects.create(user=self.bob, content_text="Bob post")
+
+        owners = set(TimelineEntry.objects.filter(post=post).values_list("owner_id", flat=True))
+        self.assertSetEqual(owners, {self.alice.id, self.bob.id})
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        AccountabilityPosts.objects.create(user=self.bob, content_text="before follow")
+
+        self.client.post(reverse("follow_user", args=[self.bob.id]), {}, format="json")
+        self.assertTrue(TimelineEntry.objects.filter(owner=self.alice, author=self.bob).exists())
+
+        self.client.delete(reverse("unfollow_user", args=[self.bob.id]))
+        self.assertFalse(TimelineEntry.objects.filter(owner=self.alice, author=self.bob).exists())
+
+    def test_deleted_post_leaves_every_timeline(self):
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        post = AccountabilityPosts.objects.create(user=self.bob, content_text="gone soon")
+
+        self.client.force_authenticate(user=self.bob)
+        resp = self.client.delete(reverse("delete_post", args=[post.id]))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertFalse(TimelineEntry.objects.filter(post_id=post.id).exists())
+
+    def test_feed_query_count_does_not_grow_with_following(self):
+        url = reverse("list_create_posts")
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        AccountabilityPosts.objects.create(user=self.bob, content_text="one")
+
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        Follow.objects.create(follower=self.alice, following=self.carol)
+        AccountabilityPosts.objects.create(user=self.carol, content_text="two")
+        AccountabilityPosts.objects.create(user=self.alice, content_text="three")
+
+        with self.assertNumQueries(1):
+            resp = self.client.get(url)
+        self.assertEqual([p["content_text"] for p in resp.data], ["three", "two", "one"])
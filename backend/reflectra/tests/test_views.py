@@ -153,3 +153,36 @@ class SocialViewsTests(TestCase):
         sample = following[0]
         for key in ("id", "username", "email", "bio", "mood_preference"):
             self.assertIn(key, sample)
+
+
+class FollowListQueryCountTests(TestCase):
+    """get_followers / get_following must not issue a query per row."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user(username="alice", email="alice@example.com", password="Pass1234!")
+        self.client.force_authenticate(user=self.alice)
+
+    def add_edges(self, count, start):
+        for i in range(start, start + count):
+            other = User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="x")
+            Follow.objects.create(follower=other, following=self.alice)
+            Follow.objects.create(follower=self.alice, following=other)
+
+    def test_query_count_is_constant(self):
+        followers_url = reverse("get_followers", args=[self.alice.id])
+        following_url = reverse("get_following")
+
+        self.add_edges(2, start=0)
+        with self.assertNumQueries(2):  # target user + one page
+            self.client.get(followers_url)
+        with self.assertNumQueries(1):
+            self.client.get(following_url)
+
+        self.add_edges(8, start=2)
+        with self.assertNumQueries(2):
+            resp = self.client.get(followers_url)
+        self.assertEqual(len(resp.data), 10)
+        with self.assertNumQueries(1):
+            resp = self.client.get(following_url)
+        self.assertEqual(len(resp.data["following"]), 10)
@@ -41,3 +41,14 @@ class WellnessViewsTests(TestCase):
         # Accept 200 or 201 depending on serializer create
         self.assertIn(resp.status_code, (status.HTTP_200_OK, status.HTTP_201_CREATED))
         self.assertTrue(MoodLog.objects.filter(user=self.alice, mood="calm").exists())
+
+    def test_sleep_accepts_hours_or_legacy_text(self):
+        url = reverse("moodlogs")
+        for sleep, hours in ((7.5, 7.5), ("7h30m", 7.5), ("6:45", 6.75), ("great", None)):
+            resp = self.client.post(url, {"mood": 5, "stress": 5, "sleep": sleep}, format="json")
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(resp.data["sleep_hours"], hours)
+
+        resp = self.client.post(url, {"mood": 5, "stress": 5, "sleep": "30h"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("sleep", resp.data)
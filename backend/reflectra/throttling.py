@@ -0,0 +1,55 @@
+# ===========================================
+# File: reflectra/throttling.py
+# Description: Sliding-window login throttles (per client IP, per account), checked before any hashing
+# ===========================================
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginIPThrottle(SimpleRateThrottle):
+    """Every login attempt from one client address (REMOTE_ADDR unless REST_FRAMEWORK["NUM_PROXIES"] says otherwise)."""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginAccountThrottle(SimpleRateThrottle):
+    """
+    Failed logins against one username or email. The window is checked on
+    every attempt but only grows through `record_failure`, so a user who keeps
+    getting their password right is never locked out.
+    """
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        login = request.data.get('username')
+        if not isinstance(login, str) or not login.strip():
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': login.strip().lower()}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.history = self.cache.get(self.key, [])
+        self.now = self.timer()
+        while self.history and self.history[-1] <= self.now - self.duration:
+            self.history.pop()
+        if len(self.history) >= self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    @classmethod
+    def record_failure(cls, request, view=None):
+        throttle = cls()
+        key = throttle.get_cache_key(request, view)
+        if key is None or throttle.rate is None:
+            return
+        now = throttle.timer()
+        history = [stamp for stamp in throttle.cache.get(key, []) if stamp > now - throttle.duration]
+        history.insert(0, now)
+        throttle.cache.set(key, history, throttle.duration)
@@ -0,0 +1,86 @@
+# ===========================================
+# File: reflectra/timeline.py
+# Description: Fan-out-on-write maintenance of the per-user activity feed (TimelineEntry)
+# ===========================================
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import AccountabilityPosts, Follow, TimelineEntry
+from .realtime import publish_event
+
+# How many of an account's most recent posts are copied into a new follower's feed
+BACKFILL_LIMIT = 200
+
+# Rows per INSERT when fanning a post out to a large follower list
+FAN_OUT_BATCH_SIZE = 1000
+
+
+# -------------------------------
+# New post → author + every follower
+# -------------------------------
+def fan_out_post(post):
+    """Push a freshly created post into its author's and each follower's timeline."""
+    owner_ids = [post.user_id]
+    owner_ids.extend(
+        Follow.objects.filter(following_id=post.user_id).values_list('follower_id', flat=True)
+    )
+
+    entries = [
+        TimelineEntry(owner_id=owner_id, post_id=post.id, author_id=post.user_id, timestamp=post.timestamp)
+        for owner_id in owner_ids
+    ]
+    TimelineEntry.objects.bulk_create(entries, batch_size=FAN_OUT_BATCH_SIZE, ignore_conflicts=True)
+    return owner_ids
+
+
+# -------------------------------
+# Follow → copy the author's recent posts in
+# -------------------------------
+def backfill_author(follower_id, author_id, limit=BACKFILL_LIMIT):
+    """Copy an author's most recent posts into a new follower's timeline."""
+    recent_posts = (
+        AccountabilityPosts.objects.filter(user_id=author_id)
+        .order_by('-timestamp', '-id')
+        .values_list('id', 'timestamp')[:limit]
+    )
+
+    entries = [
+        TimelineEntry(owner_id=follower_id, post_id=post_id, author_id=author_id, timestamp=timestamp)
+        for post_id, timestamp in recent_posts
+    ]
+    TimelineEntry.objects.bulk_create(entries, batch_size=FAN_OUT_BATCH_SIZE, ignore_conflicts=True)
+
+
+# -------------------------------
+# Unfollow → drop the author's posts
+# -------------------------------
+def prune_author(follower_id, author_id):
+    """Remove every post by `author_id` from a former follower's timeline."""
+    TimelineEntry.objects.filter(owner_id=follower_id, author_id=author_id).delete()
+
+
+# -------------------------------
+# Signal wiring (connected from ReflectraConfig.ready)
+# -------------------------------
+@receiver(post_save, sender=AccountabilityPosts)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    if created:
+        owner_ids = fan_out_post(instance)
+        publish_event(owner_ids, 'post.created', {
+            'id': instance.id,
+            'user_id': instance.user_id,
+            'username': instance.user.username,
+            'content_text': instance.content_text,
+            'timestamp': instance.timestamp,
+        })
+
+
+@receiver(post_save, sender=Follow)
+def backfill_on_follow(sender, instance, created, **kwargs):
+    if created:
+        backfill_author(instance.follower_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def prune_on_unfollow(sender, instance, **kwargs):
+    prune_author(instance.follower_id, instance.following_id)
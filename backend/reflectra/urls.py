@@ -4,12 +4,13 @@
 # ===========================================
 
 from django.urls import path
-from . import views, views_auth, views_posts, views_wellness, views_messages
+from . import views, views_auth, views_posts, views_wellness, views_messages, views_realtime
 
 urlpatterns = [
     # ✅ User registration & login
     path('register/', views_auth.register_user, name='register_user'),
     path('login/', views_auth.login_user, name='login_user'),
+    path('provision/', views_auth.provision_users, name='provision_users'),
 
     # ✅ Account management
     path('userinfo/', views_auth.get_user_info, name='userinfo'),
@@ -19,9 +20,11 @@ urlpatterns = [
 
     # ✅ Follow system & search
     path('find_users/', views.list_users, name='find_users'),
+    path('autocomplete/', views.autocomplete_users, name='autocomplete_users'),
     path('follow/<int:user_id>/', views.follow_user, name='follow_user'),
     path('unfollow/<int:user_id>/', views.unfollow_user, name='unfollow_user'),
     path('followers/<int:user_id>/', views.get_followers, name='get_followers'),
+    path('suggestions/', views.get_suggestions, name='get_suggestions'),
 
     # ✅ Activity Feed
     path('me/', views_auth.get_me, name='get_me'),
@@ -30,9 +33,16 @@ urlpatterns = [
 
     # ✅ Wellness / Mood Logs
     path('moodlogs/', views_wellness.MoodLogListCreateView.as_view(), name='moodlogs'),
+    path('moodlogs/analytics/', views_wellness.MoodAnalyticsView.as_view(), name='mood_analytics'),
+    path('moodlogs/streak/', views_wellness.MoodStreakView.as_view(), name='mood_streak'),
+    path('moodlogs/import/', views_wellness.MoodLogImportView.as_view(), name='mood_import'),
+    path('moodlogs/export/', views_wellness.MoodLogExportView.as_view(), name='mood_export'),
 
     # ✅ Messaging
     path('messages/send/', views_messages.send_message, name='send_message'),
     path('messages/<str:username>/', views_messages.get_conversation, name='get_conversation'),
     path('inbox/', views_messages.inbox, name='inbox'),
+
+    # ✅ Real-time push (Server-Sent Events, needs the ASGI server)
+    path('events/', views_realtime.event_stream, name='event_stream'),
 ]
\ No newline at end of file
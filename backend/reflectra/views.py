@@ -8,7 +8,11 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from .models import Follow, UserProfile
+from django.db import transaction
+from .models import Follow, FollowSuggestion, UserProfile
+from .pagination import KeysetPagination
+from .routers import replica_reads
+from . import autocomplete, search, suggestions
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,25 +22,56 @@ logger = logging.getLogger(__name__)
 # -------------------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_users(request):
     query = request.query_params.get('q', '').strip().lower()
-    users = User.objects.all()
 
+    # With a query: ranked, capped results from the search index (see search.py)
     if query:
-        users = users.filter(username__icontains=query) | users.filter(email__icontains=query)
+        try:
+            limit = int(request.query_params.get('limit', search.DEFAULT_LIMIT))
+        except ValueError:
+            limit = search.DEFAULT_LIMIT
+        result = search.search_users(query, limit=limit)
+        logger.info("user search", extra={'event': 'user.search', 'user_id': request.user.id, 'results': len(result), 'sampled': True})
+        return Response(result, status=status.HTTP_200_OK)
+
+    # Without one: browse everyone, a keyset page at a time
+    users = User.objects.select_related('profile')
+    paginator = KeysetPagination(ordering=('id',))
+    page = paginator.paginate_queryset(users, request)
 
     result = []
-    for user in users:
+    for user in page:
         profile = getattr(user, 'profile', None)
         result.append({
             'id': user.id,
             'username': user.username,
             'email': user.email,
-            'bio': getattr(profile, 'bio', '') if profile else ''
+            'bio': getattr(profile, 'bio', '') if profile else '',
+            'follower_count': getattr(profile, 'follower_count', 0) if profile else 0,
         })
 
-    logger.info(f"👥 User list fetched by {request.user.username}")
-    return Response(result, status=status.HTTP_200_OK)
+    logger.info("user list fetched", extra={'event': 'user.list', 'user_id': request.user.id, 'sampled': True})
+    return paginator.get_paginated_response(result)
+
+
+# -------------------------------
+# Username Autocomplete (typeahead)
+# -------------------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def autocomplete_users(request):
+    prefix = request.query_params.get('q', '')
+    try:
+        limit = int(request.query_params.get('limit', autocomplete.DEFAULT_LIMIT))
+    except ValueError:
+        limit = autocomplete.DEFAULT_LIMIT
+    limit = max(1, min(limit, autocomplete.MAX_LIMIT))
+
+    # Served from the in-process index; no database query once it is loaded
+    matches = autocomplete.index.complete(prefix, limit=limit)
+    return Response([{'id': user_id, 'username': username} for user_id, username in matches])
 
 
 # -------------------------------
@@ -50,11 +85,13 @@ def follow_user(request, user_id):
         if request.user == target_user:
             return Response({'error': 'You cannot follow yourself.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        follow, created = Follow.objects.get_or_create(follower=request.user, following=target_user)
+        # Backfilling the follower's timeline runs in the Follow post_save receiver (timeline.py)
+        with transaction.atomic():
+            follow, created = Follow.objects.get_or_create(follower=request.user, following=target_user)
         if not created:
             return Response({'message': 'Already following this user.'}, status=status.HTTP_200_OK)
 
-        logger.info(f"➕ {request.user.username} (ID {request.user.id}) followed {target_user.username} (ID {target_user.id})")
+        logger.info("user followed", extra={'event': 'follow.created', 'user_id': request.user.id, 'target_id': target_user.id})
         return Response({'message': 'Followed successfully.'}, status=status.HTTP_201_CREATED)
 
     except User.DoesNotExist:
@@ -73,8 +110,9 @@ def unfollow_user(request, user_id):
         if not follow:
             return Response({'error': 'You are not following this user.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        follow.delete()
-        logger.info(f"❌ {request.user.username} (ID {request.user.id}) unfollowed {target_user.username} (ID {target_user.id})")
+        with transaction.atomic():
+            follow.delete()  # post_delete receiver prunes the author's posts from our timeline
+        logger.info("user unfollowed", extra={'event': 'follow.deleted', 'user_id': request.user.id, 'target_id': target_user.id})
         return Response({'message': 'Unfollowed successfully.'}, status=status.HTTP_200_OK)
 
     except User.DoesNotExist:
@@ -88,16 +126,28 @@ def unfollow_user(request, user_id):
 @permission_classes([IsAuthenticated])
 def get_followers(request, user_id):
     try:
-        target_user = User.objects.get(id=user_id)
-        followers = Follow.objects.filter(following=target_user)
-
-        result = [{'username': f.follower.username, 'id': f.follower.id} for f in followers]
-        logger.info(f"👀 Followers list fetched for {target_user.username} (ID {target_user.id})")
-        return Response(result, status=status.HTTP_200_OK)
-
+        target_user = User.objects.only('id', 'username').get(id=user_id)
     except User.DoesNotExist:
         return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
 
+    # One query per page: follower columns and profile are joined into a flat projection
+    followers = Follow.objects.filter(following_id=target_user.id).values(
+        'id', 'created_at', 'follower_id', 'follower__username', 'follower__profile__bio',
+    )
+    paginator = KeysetPagination(ordering=('-created_at', '-id'))
+    page = paginator.paginate_queryset(followers, request)
+
+    result = [
+        {
+            'id': f['follower_id'],
+            'username': f['follower__username'],
+            'bio': f['follower__profile__bio'] or '',
+        }
+        for f in page
+    ]
+    logger.info("followers fetched", extra={'event': 'follow.followers', 'user_id': request.user.id, 'target_id': target_user.id, 'sampled': True})
+    return paginator.get_paginated_response(result)
+
 
 # ===========================================
 # GET FOLLOWING (who the current user follows)
@@ -106,19 +156,53 @@ def get_followers(request, user_id):
 @permission_classes([IsAuthenticated])
 def get_following(request):
     user = request.user
-    following_qs = Follow.objects.filter(follower=user).select_related('following')
-    following_data = []
-
-    for f in following_qs:
-        # ✅ Safely handle missing UserProfile objects
-        profile = getattr(f.following, 'profile', None)
-        following_data.append({
-            "id": f.following.id,
-            "username": f.following.username,
-            "email": f.following.email,
-            "bio": getattr(profile, 'bio', '') if profile else '',
-            "mood_preference": getattr(profile, 'mood_preference', '') if profile else '',
-        })
+    following_qs = Follow.objects.filter(follower=user).values(
+        'id', 'created_at', 'following_id', 'following__username', 'following__email',
+        'following__profile__bio', 'following__profile__mood_preference',
+    )
+    paginator = KeysetPagination(ordering=('-created_at', '-id'))
+    page = paginator.paginate_queryset(following_qs, request)
+
+    # ✅ Missing UserProfile rows come back as NULLs from the LEFT JOIN
+    following_data = [
+        {
+            "id": f['following_id'],
+            "username": f['following__username'],
+            "email": f['following__email'],
+            "bio": f['following__profile__bio'] or '',
+            "mood_preference": f['following__profile__mood_preference'] or '',
+        }
+        for f in page
+    ]
+
+    logger.info("following fetched", extra={'event': 'follow.following', 'user_id': user.id, 'sampled': True})
+    return paginator.get_paginated_response({"following": following_data})
+
 
-    logger.info(f"➡️ Following list fetched for {user.username} (ID {user.id})")
-    return Response({"following": following_data}, status=status.HTTP_200_OK)
\ No newline at end of file
+# ===========================================
+# FOLLOW SUGGESTIONS ("people you may know")
+# ===========================================
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_suggestions(request):
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        limit = 10
+    limit = max(1, min(limit, suggestions.TOP_N))
+
+    # Precomputed by suggestions.py: a single keyed range read, no graph traversal
+    rows = FollowSuggestion.objects.filter(user=request.user).order_by('-score', 'candidate_id').values(
+        'candidate_id', 'candidate__username', 'candidate__profile__bio', 'score'
+    )[:limit]
+
+    result = [
+        {
+            'id': row['candidate_id'],
+            'username': row['candidate__username'],
+            'bio': row['candidate__profile__bio'] or '',
+            'mutual_count': row['score'],
+        }
+        for row in rows
+    ]
+    return Response({'suggestions': result}, status=status.HTTP_200_OK)
@@ -3,15 +3,17 @@
 # Description: Authentication, profile, and follow info
 # ===========================================
 
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from django.contrib.auth import authenticate
+from django.db import transaction
 from rest_framework_simplejwt.tokens import RefreshToken
 import logging
-from .models import UserProfile, Follow
+from .models import Follow
+from .throttling import LoginAccountThrottle, LoginIPThrottle
+from . import accounts, passwords
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -35,21 +37,38 @@ def register_user(request):
     if User.objects.filter(email=email).exists():
         return Response({'error': 'Email already registered'}, status=status.HTTP_400_BAD_REQUEST)
 
-    user = User.objects.create_user(username=username, email=email, password=password)
-    UserProfile.objects.create(user=user)
+    user, _ = accounts.create_account(username, email, password)
 
-    log_message = f"✅ User registered | user_id={user.id}, username={username}, email={email}"
-    logger.info(log_message)
-    print(log_message)
+    logger.info("user registered", extra={'event': 'user.registered', 'user_id': user.id, 'username': username})
 
     return Response({'message': f'User \"{username}\" created successfully'}, status=status.HTTP_201_CREATED)
 
 
+# -------------------------------
+# BULK PROVISIONING (partner onboarding, staff only)
+# -------------------------------
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def provision_users(request):
+    rows = request.data.get('users') if isinstance(request.data, dict) else request.data
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+        return Response({'error': 'Send a non-empty list of {username, email, password?, bio?, mood_preference?} objects.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        users = accounts.provision_accounts(rows)
+    except accounts.ProvisioningError as exc:
+        return Response({'error': 'Nothing was created.', 'details': exc.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    logger.info("users provisioned", extra={'event': 'user.provisioned', 'by': request.user.id, 'count': len(users)})
+    return Response({'created': len(users)}, status=status.HTTP_201_CREATED)
+
+
 # -------------------------------
 # LOGIN USER (Username OR Email)
 # -------------------------------
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginAccountThrottle])
 def login_user(request):
     login_input = request.data.get('username')
     password = request.data.get('password')
@@ -57,24 +76,24 @@ def login_user(request):
     if not all([login_input, password]):
         return Response({'error': 'Both username/email and password are required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        if '@' in login_input:
-            user_obj = User.objects.get(email=login_input)
-            username = user_obj.username
-        else:
-            username = login_input
-    except User.DoesNotExist:
-        return Response({'error': 'Invalid username/email or password'}, status=status.HTTP_401_UNAUTHORIZED)
+    # One query whichever identifier was given
+    lookup = {'email': login_input} if '@' in login_input else {'username': login_input}
+    user = User.objects.filter(**lookup).order_by('id').first()
 
-    user = authenticate(username=username, password=password)
-    if not user:
+    try:
+        password_ok = passwords.check_password(user, password)
+    except passwords.HashingBusy:
+        response = Response({'error': 'Too many sign-ins in progress. Please try again.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Retry-After'] = '1'
+        return response
+
+    if not password_ok or not user.is_active:
+        LoginAccountThrottle.record_failure(request)
         return Response({'error': 'Invalid username/email or password'}, status=status.HTTP_401_UNAUTHORIZED)
 
     refresh = RefreshToken.for_user(user)
 
-    log_message = f"🔐 User logged in | user_id={user.id}, username={user.username}, email={user.email}"
-    logger.info(log_message)
-    print(log_message)
+    logger.info("user logged in", extra={'event': 'user.login', 'user_id': user.id, 'sampled': True})
 
     return Response({
         'access': str(refresh.access_token),
@@ -92,16 +111,16 @@ def get_user_info(request):
     user = request.user
     profile = getattr(user, 'profile', None)
 
-    log_message = f"📄 User info fetched | user_id={user.id}, username={user.username}, email={user.email}"
-    logger.info(log_message)
-    print(log_message)
+    logger.info("user info fetched", extra={'event': 'user.info', 'user_id': user.id, 'sampled': True})
 
     return Response({
         'user_id': user.id,
         'username': user.username,
         'email': user.email,
         'bio': getattr(profile, 'bio', ''),
-        'mood_preference': getattr(profile, 'mood_preference', '')
+        'mood_preference': getattr(profile, 'mood_preference', ''),
+        'follower_count': getattr(profile, 'follower_count', 0),
+        'following_count': getattr(profile, 'following_count', 0),
     })
 
 
@@ -112,7 +131,6 @@ def get_user_info(request):
 @permission_classes([IsAuthenticated])
 def update_user_info(request):
     user = request.user
-    profile = getattr(user, 'profile', None)
 
     new_name = request.data.get('name')
     new_email = request.data.get('email')
@@ -122,29 +140,18 @@ def update_user_info(request):
     if not new_name or not new_email:
         return Response({'error': 'Name and email are required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    old_name = user.username
-    old_email = user.email
-
-    user.username = new_name
-    user.email = new_email
-    user.save()
-
-    if profile:
-        profile.bio = new_bio
-        profile.mood_preference = new_mood
-        profile.save()
-    else:
-        UserProfile.objects.create(user=user, bio=new_bio, mood_preference=new_mood)
-
-    log_message = (
-        f"📝 User profile updated | user_id={user.id}\n"
-        f"   - Username: '{old_name}' → '{new_name}'\n"
-        f"   - Email: '{old_email}' → '{new_email}'\n"
-        f"   - Bio: '{new_bio}'\n"
-        f"   - Mood: '{new_mood}'"
-    )
-    logger.info(log_message)
-    print(log_message)
+    with transaction.atomic():
+        user_changes = [field for field, value in (('username', new_name), ('email', new_email)) if getattr(user, field) != value]
+        if user_changes:
+            user.username = new_name
+            user.email = new_email
+            user.save(update_fields=user_changes)
+        profile_changes = accounts.update_profile(user, bio=new_bio, mood_preference=new_mood)
+
+    # Field names only: profile text and addresses stay out of the logs
+    logger.info("user profile updated", extra={
+        'event': 'user.updated', 'user_id': user.id, 'fields': user_changes + profile_changes,
+    })
 
     return Response({'message': 'Profile updated successfully.'}, status=status.HTTP_200_OK)
 
@@ -156,8 +163,6 @@ def update_user_info(request):
 @permission_classes([IsAuthenticated])
 def delete_user_account(request):
     user = request.user
-    username = user.username
-    email = user.email
     user_id = user.id
 
     try:
@@ -165,12 +170,10 @@ def delete_user_account(request):
         if profile:
             profile.delete()
         user.delete()
-        log_message = f"🗑️ User account deleted | user_id={user_id}, username={username}, email={email}"
-        logger.info(log_message)
-        print(log_message)
+        logger.info("user account deleted", extra={'event': 'user.deleted', 'user_id': user_id})
         return Response({'message': 'Account deleted successfully.'}, status=status.HTTP_200_OK)
-    except Exception as e:
-        logger.error(f"❌ Failed to delete account | user_id={user_id}, username={username} | Error: {e}")
+    except Exception:
+        logger.exception("account deletion failed", extra={'event': 'user.delete_failed', 'user_id': user_id})
         return Response({'error': 'Failed to delete account.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
@@ -181,10 +184,13 @@ def delete_user_account(request):
 @permission_classes([IsAuthenticated])
 def get_me(request):
     user = request.user
+    profile = getattr(user, 'profile', None)
     return Response({
         'id': user.id,
         'username': user.username,
-        'email': user.email
+        'email': user.email,
+        'follower_count': getattr(profile, 'follower_count', 0),
+        'following_count': getattr(profile, 'following_count', 0),
     })
 
 
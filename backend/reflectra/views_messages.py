@@ -8,8 +8,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from .models import Message
+from django.db import transaction
+from django.db.models import Q
+from .models import Conversation, Message, conversation_key
 from .serializers import MessageSerializer
+from .pagination import KeysetPagination
+from .routers import replica_reads
+from . import conversations
 
 
 @api_view(['POST'])
@@ -33,51 +38,64 @@ def send_message(request):
     except User.DoesNotExist:
         return Response({'error': 'Receiver not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    # Create message
-    message = Message.objects.create(sender=sender, receiver=receiver, content=content)
+    # Create message (the Conversation summary is updated by the post_save receiver in the same transaction)
+    with transaction.atomic():
+        message = Message.objects.create(sender=sender, receiver=receiver, content=content)
     return Response(MessageSerializer(message).data, status=status.HTTP_201_CREATED)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_conversation(request, username):
-    """Fetch all messages between logged-in user and another user."""
+    """
+    Fetch messages between logged-in user and another user, newest page first (?cursor= pages back in time).
+    Served from the primary, not a replica: reading marks the thread read, and that must not
+    count messages as seen that a lagging replica would have left out of the page.
+    """
     user = request.user
     try:
         other_user = User.objects.get(username=username)
     except User.DoesNotExist:
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    # Get messages between both users
+    # Get messages between both users: one range scan on (conversation_key, timestamp, id)
     messages = Message.objects.filter(
-        sender__in=[user, other_user],
-        receiver__in=[user, other_user]
-    ).order_by('timestamp')
+        conversation_key=conversation_key(user.id, other_user.id)
+    ).select_related('sender', 'receiver')
+    paginator = KeysetPagination(ordering=('-timestamp', '-id'))
+    page = paginator.paginate_queryset(messages, request)
+    page.reverse()  # display oldest → newest within the page
 
-    # Mark messages sent TO the current user as read
-    Message.objects.filter(sender=other_user, receiver=user, is_read=False).update(is_read=True)
+    # Mark the thread read by advancing the user's watermark (no per-message writes)
+    conversation = conversations.mark_read(user.id, other_user.id)
+    watermarks = conversation.read_watermarks() if conversation else {}
 
-    serializer = MessageSerializer(messages, many=True)
-    return Response(serializer.data)
+    serializer = MessageSerializer(page, many=True, context={'read_watermarks': watermarks})
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def inbox(request):
-    """Fetch the latest message from each conversation."""
+    """Fetch the latest message from each conversation, most recently active first."""
     user = request.user
-    conversations = {}
 
-    # Get all messages involving the user, ordered by latest first
-    all_messages = Message.objects.filter(sender=user).union(
-        Message.objects.filter(receiver=user)
-    ).order_by('-timestamp')
-
-    # Keep only the latest message per conversation
-    for msg in all_messages:
-        partner = msg.receiver if msg.sender == user else msg.sender
-        if partner.username not in conversations:
-            conversations[partner.username] = msg
-
-    serializer = MessageSerializer(conversations.values(), many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    # One indexed query over the user's Conversation rows; the last message and
+    # both participants are joined in rather than loaded per row.
+    summaries = Conversation.objects.filter(
+        Q(user_low=user) | Q(user_high=user)
+    ).select_related('last_message__sender', 'last_message__receiver')
+    paginator = KeysetPagination(ordering=('-last_activity', '-id'))
+    page = paginator.paginate_queryset(summaries, request)
+
+    result = []
+    for conversation in page:
+        if conversation.last_message is None:
+            continue
+        item = MessageSerializer(
+            conversation.last_message, context={'read_watermarks': conversation.read_watermarks()}
+        ).data
+        item['unread_count'] = conversation.unread_for(user.id)
+        result.append(item)
+    return paginator.get_paginated_response(result)
@@ -6,14 +6,17 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.contrib.auth.models import User
-from .models import AccountabilityPosts, Follow
+from django.db import transaction
+from .models import AccountabilityPosts, TimelineEntry
+from .pagination import KeysetPagination
+from .routers import replica_reads
 
 # ===========================================
 # LIST + CREATE POSTS
 # ===========================================
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_create_posts(request):
     user = request.user
 
@@ -25,11 +28,14 @@ def list_create_posts(request):
         if not content_text:
             return Response({'error': 'Post content cannot be empty.'}, status=400)
 
-        post = AccountabilityPosts.objects.create(
-            user=user,
-            content_text=content_text,
-            visibility='public'
-        )
+        # Fan-out to followers' timelines happens in the post_save receiver (timeline.py),
+        # inside the same transaction as the post itself.
+        with transaction.atomic():
+            post = AccountabilityPosts.objects.create(
+                user=user,
+                content_text=content_text,
+                visibility='public'
+            )
 
         return Response({
             'id': post.id,
@@ -42,25 +48,26 @@ def list_create_posts(request):
     # -------------------------------
     # GET → Fetch posts (self + followed users)
     # -------------------------------
-    following_ids = Follow.objects.filter(follower=user).values_list('following_id', flat=True)
-    visible_users = list(following_ids) + [user.id]
-
-    posts = AccountabilityPosts.objects.filter(
-        user__id__in=visible_users
-    ).order_by('-timestamp')
+    # The timeline is materialized on write, so this is one range scan over
+    # the owner's entries no matter how many accounts they follow.
+    entries = TimelineEntry.objects.filter(owner=user).values(
+        'post_id', 'author_id', 'author__username', 'post__content_text', 'timestamp'
+    )
+    paginator = KeysetPagination(ordering=('-timestamp', '-post_id'))
+    page = paginator.paginate_queryset(entries, request)
 
     serialized = [
         {
-            'id': p.id,
-            'user_id': p.user.id,
-            'username': p.user.username,
-            'content_text': p.content_text,
-            'timestamp': p.timestamp
+            'id': e['post_id'],
+            'user_id': e['author_id'],
+            'username': e['author__username'],
+            'content_text': e['post__content_text'],
+            'timestamp': e['timestamp']
         }
-        for p in posts
+        for e in page
     ]
 
-    return Response(serialized)
+    return paginator.get_paginated_response(serialized)
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
@@ -68,7 +75,7 @@ def delete_post(request, post_id):
     user = request.user
     try:
         post = AccountabilityPosts.objects.get(id=post_id, user=user)
-        post.delete()
+        post.delete()  # cascades to every TimelineEntry the post was fanned out to
         return Response({'message': 'Post deleted successfully.'})
     except AccountabilityPosts.DoesNotExist:
         return Response({'error': 'Post not found or unauthorized.'}, status=404)
\ No newline at end of file
@@ -0,0 +1,72 @@
+# ===========================================
+# File: reflectra/views_realtime.py
+# Description: Server-Sent Events stream of new messages and feed posts (served under ASGI)
+# ===========================================
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .authentication import CachedJWTAuthentication
+from .realtime import format_sse, get_backend
+
+# Seconds between keep-alive comments so proxies don't close an idle stream
+HEARTBEAT_INTERVAL = 15
+
+
+def _authenticate(request):
+    """
+    Resolve the user from the usual `Authorization: Bearer` header, or from
+    `?token=` because browsers' EventSource cannot set request headers.
+    """
+    auth = CachedJWTAuthentication()
+    raw_token = None
+    header = auth.get_header(request)
+    if header is not None:
+        raw_token = auth.get_raw_token(header)
+    if raw_token is None:
+        raw_token = request.GET.get('token')
+    if not raw_token:
+        return None
+
+    try:
+        validated = auth.get_validated_token(raw_token)
+        return auth.get_user(validated)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def _stream(user_id):
+    backend = get_backend()
+    subscription = backend.subscribe(user_id)
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        backend.unsubscribe(subscription)
+
+
+# -------------------------------
+# EVENT STREAM
+# -------------------------------
+async def event_stream(request):
+    """Stream `message.created` and `post.created` events addressed to the logged-in user."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed.'}, status=405)
+
+    user = await sync_to_async(_authenticate)(request)
+    if user is None or not user.is_active:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+    response = StreamingHttpResponse(_stream(user.id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # disable proxy buffering (nginx)
+    return response
@@ -3,19 +3,136 @@
 # Description: Handles mood & wellness tracking (logs)
 # ===========================================
 
-from rest_framework import generics, permissions
-from .models import MoodLog
+from datetime import timedelta
+
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .models import LoggingStreak, MoodLog
 from .serializers import MoodLogSerializer
+from .pagination import KeysetPagination
+from .routers import replica_reads
+from . import mood_io, mood_rollups, streaks
 
 # -------------------------------
 # List & Create Mood Logs
 # -------------------------------
+@method_decorator(replica_reads, name='get')
 class MoodLogListCreateView(generics.ListCreateAPIView):
     serializer_class = MoodLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering = ('-timestamp', '-id')
 
     def get_queryset(self):
-        return MoodLog.objects.filter(user=self.request.user).order_by('-timestamp')
+        return MoodLog.objects.filter(user=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        with transaction.atomic():
+            log = serializer.save(user=self.request.user)
+            mood_rollups.record_log(log)
+            streaks.record_log(log)
+
+
+# -------------------------------
+# Mood Analytics (served from daily rollups)
+# -------------------------------
+class MoodAnalyticsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    default_range_days = 90
+
+    def get(self, request):
+        bucket = request.query_params.get('bucket', 'day')
+        if bucket not in mood_rollups.BUCKETS:
+            return Response({'error': 'bucket must be one of: day, week, month.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        today = timezone.localdate()
+        start_param = request.query_params.get('start')
+        end_param = request.query_params.get('end')
+        try:
+            end = parse_date(end_param) if end_param else today
+            start = parse_date(start_param) if start_param else end - timedelta(days=self.default_range_days - 1)
+        except (TypeError, ValueError):
+            # parse_date returns None for malformed input (TypeError on `None - timedelta`)
+            # and raises ValueError for well-formed but impossible dates
+            start = end = None
+        if start is None or end is None or start > end:
+            return Response({'error': 'start/end must be YYYY-MM-DD dates with start <= end.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'bucket': bucket,
+            'start': start,
+            'end': end,
+            'series': mood_rollups.summarize(request.user, start, end, bucket),
+            'sleep': mood_rollups.sleep_stats(request.user, start, end),
+        })
+
+# -------------------------------
+# Logging Streak & Weekly Goal
+# -------------------------------
+class MoodStreakView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_streak(self, user):
+        # Users who never logged have no row yet; report zeros without writing one
+        return LoggingStreak.objects.filter(user=user).first() or LoggingStreak(user=user)
+
+    def get(self, request):
+        return Response(streaks.summarize(self.get_streak(request.user)))
+
+    def patch(self, request):
+        goal = request.data.get('weekly_goal')
+        # JSON integers only: int() would truncate 3.7 and turn true into 1
+        if isinstance(goal, str) and goal.strip().isascii() and goal.strip().isdecimal():
+            goal = int(goal)  # form-encoded bodies carry every value as a string
+        if type(goal) is not int or not streaks.MIN_WEEKLY_GOAL <= goal <= streaks.MAX_WEEKLY_GOAL:
+            return Response({'error': 'weekly_goal must be a whole number of days from 1 to 7.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        streak = self.get_streak(request.user)
+        streak.weekly_goal = goal
+        streak.save()
+        return Response(streaks.summarize(streak))
+
+
+# -------------------------------
+# Bulk Import (NDJSON / CSV request body, streamed)
+# -------------------------------
+class MoodLogImportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        fmt = 'csv' if 'csv' in (request.content_type or '') else 'ndjson'
+        try:
+            created = mood_io.import_logs(request.user, mood_io.read_rows(request.stream, fmt))
+        except mood_io.MoodImportError as exc:
+            return Response({'error': 'Import failed; nothing was saved.', 'details': exc.errors}, status=status.HTTP_400_BAD_REQUEST)
+        except UnicodeDecodeError:
+            return Response({'error': 'Upload must be UTF-8 NDJSON or CSV.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if created:
+            mood_rollups.rebuild_rollups([request.user.id])
+            streaks.rebuild_streaks([request.user.id])
+        return Response({'created': created}, status=status.HTTP_201_CREATED)
+
+
+# -------------------------------
+# Bulk Export (streamed, never held in memory)
+# -------------------------------
+class MoodLogExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        # `format` is reserved by DRF for content negotiation
+        fmt = request.query_params.get('type', 'ndjson')
+        if fmt not in mood_io.FORMATS:
+            return Response({'error': 'type must be one of: ndjson, csv.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = mood_io.export_csv(request.user) if fmt == 'csv' else mood_io.export_ndjson(request.user)
+        response = StreamingHttpResponse(rows, content_type=mood_io.CONTENT_TYPES[fmt])
+        response['Content-Disposition'] = f'attachment; filename="moodlogs.{fmt}"'
+        return response
@@ -19,6 +19,12 @@ export default function Dashboard() {
   const [stress, setStress] = useState("");
   const [notes, setNotes] = useState("");
   const [submitted, setSubmitted] = useState(false);
+  const [streak, setStreak] = useState<{
+    current_streak: number;
+    longest_streak: number;
+    weekly_goal: number;
+    days_this_week: number;
+  } | null>(null);
 
   const navigate = useNavigate();
   const BASE_URL =
@@ -54,6 +60,24 @@ export default function Dashboard() {
     fetchUserInfo();
   }, [navigate]);
 
+  // ✅ Fetch logging streak & weekly goal (precomputed server-side)
+  const fetchStreak = async () => {
+    try {
+      const token = localStorage.getItem("accessToken");
+      if (!token) return;
+      const response = await axios.get(`${BASE_URL}/api/moodlogs/streak/`, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+      setStreak(response.data);
+    } catch (err) {
+      console.error("Error fetching streak:", err);
+    }
+  };
+
+  useEffect(() => {
+    fetchStreak();
+  }, []);
+
   // ✅ Handle quiz submission and log to backend
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -76,6 +100,7 @@ export default function Dashboard() {
       console.log("✅ Quiz submitted successfully:", response.data);
       setSubmitted(true);
       setShowQuiz(false);
+      fetchStreak();
     } catch (err) {
       console.error("Error submitting quiz:", err);
       alert("There was an error submitting your check-in. Please try again.");
@@ -142,6 +167,13 @@ export default function Dashboard() {
               👋 Welcome, {userInfo.username}!
             </h1>
 
+            {streak && (
+              <p style={{ color: "#94a3b8", textAlign: "center", marginBottom: "20px" }}>
+                🔥 {streak.current_streak}-day streak (best {streak.longest_streak}) · 🎯{" "}
+                {streak.days_this_week}/{streak.weekly_goal} check-ins this week
+              </p>
+            )}
+
             {!showQuiz && !submitted && (
               <button
                 onClick={() => setShowQuiz(true)}